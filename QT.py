@@ -22,12 +22,11 @@ Related projects:
 from PyQt5 import QtWidgets, uic
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt
-import pickle
 import sys
 from os import listdir
-from wam.game import GameManager
-import pygame
 from time import time
+from wam.condition_set import (Condition_Set_Error, load_condition_set,
+                               save_condition_set, validate)
 
 
 class QT_Basic(QtWidgets.QMainWindow):
@@ -92,7 +91,7 @@ class QT_Config(QT_Basic):
         QT_Basic.__init__(self, 'ui\\QT_Config.ui', *args, **kwargs)
         # Import the QT designer UI and name the window
         self.setWindowTitle('BDM Whack-A-Mole')
-        self.file_config_loc = 'config\\Default.pkl'
+        self.file_config_loc = 'config\\Default.json'
         self.save_dict = {}
 
         # Connect the buttons and tabs to the relevant functions
@@ -137,9 +136,11 @@ class QT_Config(QT_Basic):
             self.populate_main_game(self.master_dict['main_game'])
         except IOError:
             print('File not found, make sure to use the format c:\\path\\..')
+        except Condition_Set_Error as error:
+            self.window.error_textbox.setText(str(error))
 
     def set_config_dict(self):
-        self.master_dict = pickle.load(open(self.file_config_loc, 'rb'))
+        self.master_dict = load_condition_set(self.file_config_loc)
 
     def populate_conditions_meta(self, cond_meta_dict):
         # Screen Setup
@@ -231,6 +232,9 @@ class QT_Config(QT_Basic):
 
     @property
     def save_check(self):
+        errors = validate(self.save_dict)
+        if errors:
+            return False, '\n'.join(errors)
         return True, 'No Errors'
 
     def save_button_clicked(self):
@@ -248,12 +252,11 @@ class QT_Config(QT_Basic):
     def save(self):
         file_path = (self.save_folder_path.text() + '\\' +
                      self.window.cond_set_name.text() +
-                     '.pkl')
-        with open(file_path, 'wb') as f:
-            pickle.dump(self.save_dict, f)
-            self.window.error_textbox.setText('File - ' +
-                                              file_path +
-                                              ' Saved Succesfully')
+                     '.json')
+        save_condition_set(self.save_dict, file_path)
+        self.window.error_textbox.setText('File - ' +
+                                          file_path +
+                                          ' Saved Succesfully')
 
     def fill_condition_meta_dict(self):
         tmp = {'cond_set_name': (self.window.cond_set_name.text()),
@@ -556,12 +559,18 @@ class QT_GUI(QT_Basic):
         self.launch_game()
 
     def launch_game(self):
+        # the game (pygame, scipy etc.) is only imported once launched, so
+        # the wizard opens without paying for it
+        import pygame
+        from wam.game import GameManager
+        from wam.startup import WARM_START_LOC
         pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
         pygame.init()
         usr_timestamp = (str(self.window.username_textbox.text()) + '_' +
                          str(time()))
         # Run the main loop
-        my_game = GameManager(usr_timestamp)
+        my_game = GameManager(usr_timestamp=usr_timestamp,
+                              warm_start=WARM_START_LOC)
         my_game.play_game()
         # Exit the game if the main loop ends
         pygame.quit()
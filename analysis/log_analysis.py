@@ -4,117 +4,37 @@ Created on Sat May 15 17:08:29 2021
 
 @author: Mike
 """
-import pandas as pd
 import matplotlib.pyplot as plt
 
 import os
 from os import listdir
 from os.path import isfile, join
 
-mypath = os.getcwd()
-onlyfiles = [f for f in listdir(mypath) if isfile(join(mypath, f))]
-
-files = [i for i in onlyfiles if '.log' in i]
-
-
-skill_luck_rat = 'demo'
-skill_luck_rat, score, skill_luck_rating, mole_x, mole_y, rel_x,rel_y = None, None,None,None,None,None,None
-
-columns = ['file', 'time', 'mole_up_time', 'time_step', 'step','luck_skill', 'score', 'skill_luck_rating', 'molexy',
-                             'mole_x', 'mole_y', 'rel_x', 'rel_y', 'hit/miss']
-
-
-results = []
-
-for file in files:
-    f = open(file)
-    line = f.readline()
-    print(file)
-    i=0
-    j=0
-    while line:
-        time = line[11:23]
-        i+=1
-        if 'Event(11-Score' in line:
-             tmp_line = line.split("score_inc': ")
-             score = tmp_line[1][0]
-             tmp_line = line.split("skill/luck':")
-             true_score = tmp_line[1][0]
-        elif "Event(10-MoleUp)" in line:
-             mole_up_time = line[11:23]
-        elif "_vs_luck_rating': " in line:
-             tmp_line = line.split("_vs_luck_rating': ")
-             skill_luck_rating = tmp_line[1][0:6]
-             try:
-                 skill_luck_rating = skill_luck_rating.split(',')[0]
-             except:
-                 pass
-        elif "9-Hit Attempt {'result': [False," in line:
-             j +=1
-             tmp_line = line.split("'pos': (")
-             mole_x = tmp_line[1].split(", ")[0]
-             mole_y = tmp_line[1].split(", ")[1].split(')')[0]
-             tmp_line = line.split("'relative_loc': (")
-             rel_x = tmp_line[1].split(", ")[0]
-             rel_y = tmp_line[1].split(", ")[1].split(')')[0]        
-             results += [[file, time, mole_up_time, i,j, skill_luck_rat, 0, skill_luck_rating, 
-                          str(mole_x) + '_' + str(mole_y), mole_x, mole_y, rel_x,rel_y, 'miss']]
-        elif "9-Hit Attempt {'result': [True," in line:
-             j +=1
-             tmp_line = line.split("'pos': (")
-             mole_x = tmp_line[1].split(", ")[0]
-             mole_y = tmp_line[1].split(", ")[1].split(')')[0]
-             tmp_line = line.split("'relative_loc': (")
-             rel_x = tmp_line[1].split(", ")[0]
-             rel_y = tmp_line[1].split(", ")[1].split(')')[0]        
-             results += [[file, time, mole_up_time, i,j, skill_luck_rat, score, skill_luck_rating, 
-                          str(mole_x) + '_' + str(mole_y), mole_x, mole_y, rel_x,rel_y, 'hit']]
-        elif "12-Skill_Luck_Ratio" in line:
-             tmp_line = line.split("12-Skill_Luck_Ratio {'New': ")
-             skill_luck_rat = tmp_line[1][0:4]
-        line = f.readline()
-    f.close()   
-
-df = pd.DataFrame(results, columns = columns)
-
-
-for col in columns[1:]:
-    try:
-        df[col] = df[col].astype(float)
-    except:
-        None
-
-df['distance'] = df['rel_x']**2 + df['rel_y']**2
-df['distance'] = df['distance']**0.5
-
-
-df = df[df['step'] >30]
-
-# calculate the mean rating, score, z score etc.
-
-from scipy.stats import zscore
-
-df['skill_luck_rating_Zscore'] = df['skill_luck_rating'] 
-df['skill_luck_rating_Zscore_hitmiss'] = df['skill_luck_rating'] 
-df['skill_luck_rating_minmax'] = df['skill_luck_rating'] 
-df['skill_luck_rating_minmax_hitmiss'] = df['skill_luck_rating'] 
-
-df['skill_luck_rating_Zscore'] = df.groupby(['file']).skill_luck_rating_Zscore.transform(lambda x : zscore(x,ddof=1))    
-df['skill_luck_rating_Zscore_hitmiss'] = df.groupby(['file', 'hit/miss']).skill_luck_rating_Zscore_hitmiss.transform(lambda x : zscore(x,ddof=1))    
-df['skill_luck_rating_minmax'] = df.groupby(['file']).skill_luck_rating_minmax.transform(lambda x: (x-min(x))/(max(x)-min(x)))   
-df['skill_luck_rating_minmax_hitmiss'] = df.groupby(['file', 'hit/miss']).skill_luck_rating_minmax_hitmiss.transform(lambda x: (x-min(x))/(max(x)-min(x)))   
-
-df['distance_Zscore'] = df['distance'] 
-df['distance_Zscore_hitmiss'] = df['distance']
-df['distance_minmax'] = df['distance'] 
-df['distance_minmax_hitmiss'] = df['distance'] 
-
-df['distance_Zscore'] = df.groupby(['file']).distance_Zscore.transform(lambda x : zscore(x,ddof=1))    
-df['distance_Zscore_hitmiss'] = df.groupby(['file', 'hit/miss']).distance_Zscore_hitmiss.transform(lambda x : zscore(x,ddof=1))
-df['distance_minmax'] = df.groupby(['file']).distance_minmax.transform(lambda x: (x-min(x))/(max(x)-min(x)))   
-df['distance_minmax_hitmiss'] = df.groupby(['file', 'hit/miss']).distance_minmax_hitmiss.transform(lambda x: (x-min(x))/(max(x)-min(x)))   
-
-df.to_csv('results_v3.csv')
+from log_cache import parse_logs_cached
+from normalise import normalise
+
+if __name__ == "__main__":
+    mypath = os.getcwd()
+    onlyfiles = [f for f in listdir(mypath) if isfile(join(mypath, f))]
+
+    files = [i for i in onlyfiles if '.log' in i]
+
+    # parses the new/changed logs in parallel (one process per file), with
+    # the rest loaded from the cache
+    df = parse_logs_cached(files)
+
+    df['distance'] = df['rel_x']**2 + df['rel_y']**2
+    df['distance'] = df['distance']**0.5
+
+
+    df = df[df['step'] >30]
+
+    # calculate the z score and min max normalised rating and distance, per
+    # participant and per participant hit/miss
+    df = normalise(df, ['skill_luck_rating', 'distance'],
+                   {'': ['file'], '_hitmiss': ['file', 'hit/miss']})
+
+    df.to_csv('results_v3.csv')
 
 
 # plt.title('Relative Hit Locations')
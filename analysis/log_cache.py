@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+log_cache
+====
+
+Incremental, on-disk cache of the parsed log files, so only new or changed
+participant logs are parsed and the dataset is assembled from the cached
+per-file pieces
+
+Each file's hit attempt rows are pickled (uncast, so the 'demo' luck_skill
+values survive, which Parquet/Feather cannot mix with floats) under a key of
+the file path, size and modification time (or the file contents, with
+use_hash), with an index.json mapping each log to its current cache file.
+The entries of logs that have since been deleted are removed
+
+Attributes:
+    na
+
+Todo:
+    * na
+
+@author: Mike
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from log_parser import COLUMNS, cast_numeric, parse_log
+
+
+def file_key(file_loc, use_hash=False):
+    '''
+    Creates the cache key for a log file
+
+    Parameters
+    ----------
+    file_loc: string (file location)
+        the WAM_Events .log file
+    use_hash: Bool
+        whether to key on the file contents (sha1) rather than the size and
+        modification time
+
+    Returns
+    -------
+    key: string
+        the hex digest key
+    '''
+    key = hashlib.sha1(os.path.abspath(file_loc).encode())
+    if use_hash:
+        with open(file_loc, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                key.update(chunk)
+    else:
+        stat = os.stat(file_loc)
+        key.update((str(stat.st_size) + '|' +
+                    str(stat.st_mtime_ns)).encode())
+    return key.hexdigest()
+
+
+def parse_logs_cached(file_locs, cache_dir='log_cache', max_workers=None,
+                      use_hash=False):
+    '''
+    Parses the log files via the cache, parsing (in parallel) only the files
+    that are new or have changed since they were cached
+
+    Parameters
+    ----------
+    file_locs: list
+        the WAM_Events .log files
+    cache_dir: string (folder location)
+        the cache folder (created if missing)
+    max_workers: int/None
+        the number of processes for parsing (None for one per core)
+    use_hash: Bool
+        whether to key on the file contents rather than size/mtime
+
+    Returns
+    -------
+    df: pd.DataFrame
+        the hit attempt rows for all the files (as per parse_logs)
+    '''
+    os.makedirs(cache_dir, exist_ok=True)
+    index_loc = os.path.join(cache_dir, 'index.json')
+    try:
+        with open(index_loc) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    _prune(cache_dir, index)
+
+    keys = {file_loc: file_key(file_loc, use_hash) for file_loc in file_locs}
+    stale = [file_loc for file_loc in file_locs if
+             index.get(os.path.abspath(file_loc)) != keys[file_loc] or
+             not os.path.isfile(_cache_loc(cache_dir, keys[file_loc]))]
+
+    # parses (and caches) the new/changed files
+    if max_workers == 1 or len(stale) < 2:
+        stale_rows = map(parse_log, stale)
+        _store(cache_dir, index, keys, stale, stale_rows)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            _store(cache_dir, index, keys, stale,
+                   executor.map(parse_log, stale))
+    with open(index_loc, 'w') as f:
+        json.dump(index, f, indent=1)
+
+    frames = [pd.read_pickle(_cache_loc(cache_dir, keys[file_loc])) for
+              file_loc in file_locs]
+    if not frames:
+        return cast_numeric(pd.DataFrame(columns=COLUMNS))
+    return cast_numeric(pd.concat(frames, ignore_index=True))
+
+
+def _cache_loc(cache_dir, key):
+    return os.path.join(cache_dir, key + '.pkl')
+
+
+def _prune(cache_dir, index):
+    '''
+    Removes the cache files and index entries of the logs that no longer
+    exist
+    '''
+    for abs_loc in [loc for loc in index if not os.path.isfile(loc)]:
+        try:
+            os.remove(_cache_loc(cache_dir, index.pop(abs_loc)))
+        except OSError:
+            pass
+
+
+def _store(cache_dir, index, keys, file_locs, file_rows):
+    '''
+    Pickles the parsed rows for each file, replacing any previous cache file
+    and updating the index
+    '''
+    for file_loc, rows in zip(file_locs, file_rows):
+        abs_loc = os.path.abspath(file_loc)
+        old_key = index.get(abs_loc)
+        if old_key is not None and old_key != keys[file_loc]:
+            try:
+                os.remove(_cache_loc(cache_dir, old_key))
+            except OSError:
+                pass
+        pd.DataFrame(rows, columns=COLUMNS).to_pickle(
+            _cache_loc(cache_dir, keys[file_loc]))
+        index[abs_loc] = keys[file_loc]
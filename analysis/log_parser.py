@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+log_parser
+====
+
+Reusable parser for the WAM_Events .log files, streaming the typed game
+events out of each file and parsing many participant logs in parallel (one
+file per process) before concatenating the hit attempt rows into a single
+DataFrame
+
+Attributes:
+    COLUMNS: list
+        the columns of the parsed hit attempt rows
+
+Todo:
+    * na
+
+@author: Mike
+"""
+
+from ast import literal_eval
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import pandas as pd
+
+COLUMNS = ['file', 'time', 'mole_up_time', 'time_step', 'step',
+           'luck_skill', 'score', 'skill_luck_rating', 'molexy',
+           'mole_x', 'mole_y', 'rel_x', 'rel_y', 'hit/miss',
+           'rt_ms', 'emerged_rt_ms', 'latency_ms']
+
+# Marker in the log line to the event kind
+EVENT_MARKERS = (('Event(11-Score', 'score'),
+                 ('Event(10-MoleUp)', 'mole_up'),
+                 ('Event(7-Rate', 'rate'),
+                 ('Event(9-Hit Attempt', 'hit_attempt'),
+                 ('Event(12-Skill_Luck_Ratio', 'skill_luck_ratio'),
+                 ('Event(13-Near Miss', 'near_miss'))
+
+Log_Event = namedtuple('Log_Event', ['line', 'time', 'kind', 'fields'])
+
+
+def iter_events(file_loc):
+    '''
+    Streams the typed game events from a log file, one line at a time
+
+    Parameters
+    ----------
+    file_loc: string (file location)
+        the WAM_Events .log file
+
+    Returns
+    -------
+    events: generator
+        Log_Event(line, time, kind, fields) for each game event, where line
+        is the line number, time the 'HH:MM:SS,mmm' log time and fields the
+        event's dictionary (e.g. {'score_inc': 4, 'score': 10, ...})
+    '''
+    with open(file_loc) as f:
+        for line_num, line in enumerate(f, 1):
+            for marker, kind in EVENT_MARKERS:
+                if marker in line:
+                    payload = line[line.index('{', line.index(marker)):
+                                   line.rindex('}') + 1]
+                    try:
+                        fields = literal_eval(payload)
+                    except (ValueError, SyntaxError):
+                        print('Unparseable event in ' + file_loc +
+                              ' line ' + str(line_num))
+                        break
+                    yield Log_Event(line_num, line[11:23], kind, fields)
+                    break
+
+
+def parse_log(file_loc):
+    '''
+    Parses the hit attempt rows (see COLUMNS) from a log file, carrying the
+    latest score, rating and skill/luck ratio forward onto each attempt
+
+    Parameters
+    ----------
+    file_loc: string (file location)
+        the WAM_Events .log file
+
+    Returns
+    -------
+    rows: list
+        a list (per hit attempt) of the COLUMNS values
+    '''
+    file = os.path.basename(file_loc)
+    skill_luck_rat = 'demo'
+    score, skill_luck_rating, mole_up_time = None, None, None
+    step = 0
+    rows = []
+    for event in iter_events(file_loc):
+        fields = event.fields
+        if event.kind == 'score':
+            score = fields['score_inc']
+        elif event.kind == 'mole_up':
+            mole_up_time = event.time
+        elif event.kind == 'rate':
+            if 'skill_vs_luck_rating' in fields:
+                skill_luck_rating = fields['skill_vs_luck_rating']
+        elif event.kind == 'skill_luck_ratio':
+            skill_luck_rat = fields['New']
+        elif event.kind == 'hit_attempt':
+            step += 1
+            mole_x, mole_y = fields['pos']
+            rel_x, rel_y = fields['relative_loc']
+            hit = fields['result'][0]
+            rows.append([file, event.time, mole_up_time, event.line, step,
+                         skill_luck_rat, score if hit else 0,
+                         skill_luck_rating,
+                         str(mole_x) + '_' + str(mole_y), mole_x, mole_y,
+                         rel_x, rel_y, 'hit' if hit else 'miss',
+                         fields.get('rt_ms'), fields.get('emerged_rt_ms'),
+                         fields.get('latency_ms')])
+    return rows
+
+
+def parse_logs(file_locs, max_workers=None):
+    '''
+    Parses many log files in parallel, one file per process, concatenating
+    the hit attempt rows (in file order)
+
+    Parameters
+    ----------
+    file_locs: list
+        the WAM_Events .log files
+    max_workers: int/None
+        the number of processes (None for one per core, 1 to parse in
+        process)
+
+    Returns
+    -------
+    df: pd.DataFrame
+        the hit attempt rows for all the files
+    '''
+    if max_workers == 1 or len(file_locs) < 2:
+        file_rows = map(parse_log, file_locs)
+        return rows_to_frame(file_rows)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return rows_to_frame(executor.map(parse_log, file_locs))
+
+
+def rows_to_frame(file_rows):
+    '''
+    Concatenates the rows from each file into a DataFrame, with the numeric
+    columns cast to float
+
+    Parameters
+    ----------
+    file_rows: iterable
+        the rows (per parse_log) for each file
+
+    Returns
+    -------
+    df: pd.DataFrame
+        the hit attempt rows
+    '''
+    rows = [row for rows in file_rows for row in rows]
+    return cast_numeric(pd.DataFrame(rows, columns=COLUMNS))
+
+
+def cast_numeric(df):
+    '''
+    Casts the (wholly) numeric columns of the hit attempt rows to float,
+    bar the file and molexy keys (python reads '95_43' as the number 9543)
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        the hit attempt rows
+
+    Returns
+    -------
+    df: pd.DataFrame
+        the hit attempt rows, with the numeric columns as float
+    '''
+    for col in COLUMNS:
+        if col in ('file', 'molexy'):
+            continue
+        try:
+            df[col] = df[col].astype(float)
+        except (ValueError, TypeError):
+            pass
+    return df
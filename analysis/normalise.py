@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+normalise
+====
+
+Vectorised per-participant (or any other grouping) normalisation of the
+analysis columns, computing the group mean/std/min/max once per grouping via
+groupby().agg and broadcasting them back to the rows with array arithmetic
+(rather than a python lambda per group)
+
+Attributes:
+    na
+
+Todo:
+    * na
+
+@author: Mike
+"""
+
+import numpy as np
+
+
+def group_stats(df, columns, group_keys):
+    '''
+    Computes the group mean, std (ddof=1), min and max of the columns, and
+    each row's group
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        the data
+    columns: list
+        the columns to summarise
+    group_keys: list
+        the columns to group by
+
+    Returns
+    -------
+    stats: pd.DataFrame
+        one row per group, with (column, stat) columns
+    codes: np.array
+        the row number in stats of each row's group
+    '''
+    grouped = df.groupby(group_keys, sort=False, dropna=False)[columns]
+    stats = grouped.agg(['mean', 'std', 'min', 'max'])
+    codes = grouped.ngroup().to_numpy()
+    return stats, codes
+
+
+def normalise(df, columns, groupings, methods=('Zscore', 'minmax')):
+    '''
+    Adds the z score and/or min max normalised columns for each grouping,
+    named <column>_<method><suffix>, e.g. distance_Zscore_hitmiss
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        the data (the columns are added in place)
+    columns: list
+        the columns to normalise
+    groupings: dict
+        the column suffix to the group keys, e.g. {'': ['file'],
+        '_hitmiss': ['file', 'hit/miss']}
+    methods: tuple
+        'Zscore' ((x - mean) / std, ddof=1) and/or 'minmax'
+        ((x - min) / (max - min))
+
+    Returns
+    -------
+    df: pd.DataFrame
+        the data with the normalised columns
+    '''
+    broadcast = {}
+    for suffix, group_keys in groupings.items():
+        stats, codes = group_stats(df, columns, group_keys)
+        broadcast[suffix] = {(col, stat): stats[(col, stat)].to_numpy()[codes]
+                             for col in columns for
+                             stat in ('mean', 'std', 'min', 'max')}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for col in columns:
+            x = df[col].to_numpy(dtype=float)
+            for method in methods:
+                for suffix, col_stats in broadcast.items():
+                    if method == 'Zscore':
+                        norm = ((x - col_stats[(col, 'mean')]) /
+                                col_stats[(col, 'std')])
+                    elif method == 'minmax':
+                        norm = ((x - col_stats[(col, 'min')]) /
+                                (col_stats[(col, 'max')] -
+                                 col_stats[(col, 'min')]))
+                    else:
+                        raise ValueError('Unknown normalisation ' + method)
+                    df[col + '_' + method + suffix] = norm
+    return df
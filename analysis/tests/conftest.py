@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+conftest
+====
+
+Puts the analysis scripts on the path, as they import each other as top
+level modules (i.e. as run from the analysis folder), and provides the
+fixture log files
+
+Attributes:
+    LOG_A: string
+        the first fixture log (a demo stage then a skill/luck stage)
+    LOG_B: string
+        the second fixture log (no score, rating or ratio of its own)
+
+Todo:
+    * na
+
+@author: miketaylor
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+_PREFIX = '2021-03-01 10:00:0'
+
+LOG_A = '\n'.join([
+    _PREFIX + "1,000 - WAM_Events_a - INFO - <Event(10-MoleUp) "
+    "{'loc': (95,43)})>",
+    _PREFIX + "1,250 - WAM_Events_a - INFO - <Event(11-Score "
+    "{'score_inc': 10, 'score': 10, 'skill/luck':1,'true_score':10})>",
+    _PREFIX + "1,300 - WAM_Events_a - INFO - <Event(9-Hit Attempt "
+    "{'result': [True, True, True], 'pos': (95, 43), 'distance': 3.0, "
+    "'relative_loc': (3.0, 0.0), 'window': None, 'rt_ms': 300.0, "
+    "'emerged_rt_ms': None, 'latency_ms': 0.5})>",
+    _PREFIX + "2,000 - WAM_Events_a - INFO - <Event(7-Rate "
+    "{'skill_vs_luck_rating': 0.625, 'hit_confidence': 0.25})>",
+    _PREFIX + "3,000 - WAM_Events_a - INFO - <Event(12-Skill_Luck_Ratio "
+    "{'New': 0.5 })>",
+    _PREFIX + "4,000 - WAM_Events_a - INFO - <Event(10-MoleUp) "
+    "{'loc': (295,143)})>",
+    _PREFIX + "4,400 - WAM_Events_a - INFO - <Event(9-Hit Attempt "
+    "{'result': [False, False, False], 'pos': (295, 143), "
+    "'distance': 80.5, 'relative_loc': (-80.5, 0.0), 'window': None})>",
+    _PREFIX + "5,000 - WAM_Events_a - INFO - <Event(8-Pause "
+    "{'reason': 2x2 })>"]) + '\n'
+
+LOG_B = '\n'.join([
+    _PREFIX + "1,000 - WAM_Events_b - INFO - <Event(10-MoleUp) "
+    "{'loc': (95,43)})>",
+    _PREFIX + "1,500 - WAM_Events_b - INFO - <Event(9-Hit Attempt "
+    "{'result': [True, True, True], 'pos': (95, 43), 'distance': 1.5, "
+    "'relative_loc': (0.0, 1.5), 'window': None})>"]) + '\n'
+
+
+@pytest.fixture
+def log_files(tmp_path):
+    '''
+    Writes the fixture logs, returning their locations (in order)
+    '''
+    file_locs = []
+    for name, text in (('WAM_Events_a.log', LOG_A),
+                       ('WAM_Events_b.log', LOG_B)):
+        file_loc = tmp_path / name
+        file_loc.write_text(text)
+        file_locs.append(str(file_loc))
+    return file_locs
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+test_log_cache module
+============
+
+This module contains the pytest functions for the log_cache module of the
+analysis scripts for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import json
+import os
+
+import pandas as pd
+
+import log_cache
+import log_parser
+from conftest import LOG_B
+
+
+def cached(file_locs, cache_dir, monkeypatch, **kwargs):
+    '''
+    Parses via the cache, returning the frame and the files parsed afresh
+    '''
+    parsed = []
+
+    def parse_log(file_loc):
+        parsed.append(os.path.basename(file_loc))
+        return log_parser.parse_log(file_loc)
+
+    monkeypatch.setattr(log_cache, 'parse_log', parse_log)
+    df = log_cache.parse_logs_cached(file_locs, cache_dir, max_workers=1,
+                                     **kwargs)
+    return df, parsed
+
+
+def cache_files(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if
+                  name.endswith('.pkl'))
+
+
+def test_miss_then_hit(log_files, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    df, parsed = cached(log_files, cache_dir, monkeypatch)
+    assert parsed == ['WAM_Events_a.log', 'WAM_Events_b.log']
+    assert len(cache_files(cache_dir)) == 2
+    df_hit, parsed = cached(log_files, cache_dir, monkeypatch)
+    assert parsed == []
+    pd.testing.assert_frame_equal(df, df_hit)
+
+
+def test_matches_parse_logs(log_files, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    direct = log_parser.parse_logs(log_files, max_workers=1)
+    for max_workers in (2, 2):  # a cold then a warm cache
+        pd.testing.assert_frame_equal(
+            log_cache.parse_logs_cached(log_files, cache_dir,
+                                        max_workers=max_workers), direct)
+    empty = log_cache.parse_logs_cached([], cache_dir)
+    assert len(empty) == 0 and list(empty.columns) == log_parser.COLUMNS
+
+
+def test_invalidation(log_files, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    cached(log_files, cache_dir, monkeypatch)
+    with open(log_files[1], 'a') as f:  # size (and mtime) change
+        f.write(LOG_B)
+    df, parsed = cached(log_files, cache_dir, monkeypatch)
+    assert parsed == ['WAM_Events_b.log']
+    assert (df['file'] == 'WAM_Events_b.log').sum() == 2
+    stat = os.stat(log_files[0])  # mtime only change
+    os.utime(log_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    _, parsed = cached(log_files, cache_dir, monkeypatch)
+    assert parsed == ['WAM_Events_a.log']
+    assert len(cache_files(cache_dir)) == 2
+
+
+def test_use_hash(log_files, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    cached(log_files, cache_dir, monkeypatch, use_hash=True)
+    stat = os.stat(log_files[0])
+    os.utime(log_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    _, parsed = cached(log_files, cache_dir, monkeypatch, use_hash=True)
+    assert parsed == []
+
+
+def test_deleted_log(log_files, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / 'cache')
+    cached(log_files, cache_dir, monkeypatch)
+    os.remove(log_files[1])
+    df, parsed = cached(log_files[:1], cache_dir, monkeypatch)
+    assert parsed == []
+    assert df['file'].unique().tolist() == ['WAM_Events_a.log']
+    assert len(cache_files(cache_dir)) == 1
+    with open(os.path.join(cache_dir, 'index.json')) as f:
+        assert list(json.load(f)) == [os.path.abspath(log_files[0])]
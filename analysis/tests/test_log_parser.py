@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+test_log_parser module
+============
+
+This module contains the pytest functions for the log_parser module of the
+analysis scripts for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import pandas as pd
+
+import log_parser
+
+
+def test_iter_events(log_files):
+    events = list(log_parser.iter_events(log_files[0]))
+    assert [event.kind for event in events] == ['mole_up', 'score',
+                                                'hit_attempt', 'rate',
+                                                'skill_luck_ratio',
+                                                'mole_up', 'hit_attempt']
+    assert events[1].line == 2 and events[1].time == '10:00:01,250'
+    assert events[1].fields['score_inc'] == 10
+    assert events[2].fields['relative_loc'] == (3.0, 0.0)
+
+
+def test_iter_events_unparseable(tmp_path, capsys):
+    file_loc = tmp_path / 'WAM_Events_bad.log'
+    file_loc.write_text("2021-03-01 10:00:01,000 - x - INFO - "
+                        "<Event(11-Score {'score_inc': oops})>\n")
+    assert list(log_parser.iter_events(str(file_loc))) == []
+    assert 'line 1' in capsys.readouterr().out
+
+
+def test_parse_log(log_files):
+    rows = log_parser.parse_log(log_files[0])
+    assert rows == [
+        ['WAM_Events_a.log', '10:00:01,300', '10:00:01,000', 3, 1, 'demo',
+         10, None, '95_43', 95, 43, 3.0, 0.0, 'hit', 300.0, None, 0.5],
+        ['WAM_Events_a.log', '10:00:04,400', '10:00:04,000', 7, 2, 0.5, 0,
+         0.625, '295_143', 295, 143, -80.5, 0.0, 'miss', None, None, None]]
+
+
+def test_parse_log_state_per_file(log_files):
+    rows = log_parser.parse_log(log_files[1])
+    assert len(rows) == 1
+    luck_skill, score, rating = rows[0][5:8]
+    assert (luck_skill, score, rating) == ('demo', None, None)
+
+
+def test_parse_logs(log_files):
+    serial = log_parser.parse_logs(log_files, max_workers=1)
+    pooled = log_parser.parse_logs(log_files, max_workers=2)
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert list(serial.columns) == log_parser.COLUMNS
+    assert serial['file'].tolist() == ['WAM_Events_a.log'] * 2 + [
+        'WAM_Events_b.log']
+    assert serial['score'].dtype == float
+    assert serial['luck_skill'].tolist() == ['demo', 0.5, 'demo']
+
+
+def test_cast_numeric(log_files):
+    df = pd.DataFrame(log_parser.parse_log(log_files[0]),
+                      columns=log_parser.COLUMNS)
+    df = log_parser.cast_numeric(df)
+    assert df['mole_x'].dtype == float and df['rt_ms'].dtype == float
+    assert df['luck_skill'].tolist() == ['demo', 0.5]
+    assert df['molexy'].tolist() == ['95_43', '295_143']
+
+
+def test_rows_to_frame_empty():
+    df = log_parser.rows_to_frame([[], []])
+    assert len(df) == 0
+    assert list(df.columns) == log_parser.COLUMNS
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+test_normalise module
+============
+
+This module contains the pytest functions for the normalise module of the
+analysis scripts for the pygame Whack a Mole game, checking the vectorised
+normalisation against the groupby transforms it replaced
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import zscore
+
+from normalise import normalise
+
+GROUPINGS = {'': ['file'], '_hitmiss': ['file', 'hit/miss']}
+
+
+def minmax(x):
+    return (x - min(x)) / (max(x) - min(x))
+
+
+def sample_frame():
+    rng = np.random.default_rng(0)
+    n = 60
+    return pd.DataFrame({'file': rng.choice(['a.log', 'b.log', 'c.log'], n),
+                         'hit/miss': rng.choice(['hit', 'miss'], n),
+                         'distance': rng.uniform(0, 80, n),
+                         'skill_luck_rating': rng.uniform(0, 1, n)})
+
+
+@pytest.mark.parametrize('suffix', GROUPINGS)
+def test_matches_transform(suffix):
+    df = normalise(sample_frame(), ['distance', 'skill_luck_rating'],
+                   GROUPINGS)
+    grouped = df.groupby(GROUPINGS[suffix])
+    for col in ('distance', 'skill_luck_rating'):
+        np.testing.assert_allclose(
+            df[col + '_Zscore' + suffix],
+            grouped[col].transform(lambda x: zscore(x, ddof=1)))
+        np.testing.assert_allclose(df[col + '_minmax' + suffix],
+                                   grouped[col].transform(minmax))
+
+
+def test_degenerate_groups():
+    df = pd.DataFrame({'file': ['a', 'b', 'b'],
+                       'distance': [1.0, 2.0, 2.0]})
+    df = normalise(df, ['distance'], {'': ['file']})
+    assert df['distance_Zscore'].isna().all()  # single row, zero std
+    assert df['distance_minmax'].isna().all()
+
+
+def test_nan_in_group():
+    df = sample_frame()
+    df.loc[df.index[df['file'] == 'a.log'][0], 'distance'] = np.nan
+    df = normalise(df, ['distance'], {'': ['file']})
+    in_a = df['file'] == 'a.log'
+    a = df.loc[in_a, 'distance']
+    # NaNs are skipped within the group (rather than blanking it)
+    np.testing.assert_allclose(df.loc[in_a, 'distance_Zscore'],
+                               zscore(a, ddof=1, nan_policy='omit'))
+    np.testing.assert_allclose(df.loc[in_a, 'distance_minmax'],
+                               (a - a.min()) / (a.max() - a.min()))
+    assert df.loc[in_a, 'distance_Zscore'].isna().sum() == 1
+    np.testing.assert_allclose(
+        df.loc[~in_a, 'distance_Zscore'],
+        df[~in_a].groupby('file')['distance'].transform(
+            lambda x: zscore(x, ddof=1)))
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        normalise(sample_frame(), ['distance'], {'': ['file']},
+                  methods=('rank',))
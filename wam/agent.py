@@ -3,50 +3,247 @@
 agent module
 ============
 
-This module contains the agent base and child classe for the pygame
- Whack a Mole game
+This module contains the agent base and child classes for the pygame
+Whack a Mole game, i.e. the players that drive the game without pygame
+input, so load/regression tests and pilot simulations run unattended
+
+All agents are called via the same API (see Agent), which replaces the
+check_mouse_event/check_key_event/check_events_rate hooks planned for the
+stub: an agent passed to the GameManager has a strike planned (plan_strike)
+as each mole pops, which the game injects as a mouse click through its own
+event path (so check_mouse_event/check_pool_mouse_event judge it as they
+would the player's), while the key presses are not modelled (the intro is
+skipped and the pauses continue at once) bar the 2x2 ratings (rate). This
+holds for play_game and play_pool_game, displayed or headless, and for the
+Simulator's virtual clock sessions
 
 Attributes:
-    handled within the individual agent classes
+    RT_DISTS: tuple
+        the reaction time distributions of the Synthetic_Agent
+    RATING_POLICIES: tuple
+        the 2x2 rating policies of the Synthetic_Agent
 
 Todo:
-    * takes game situation (if artifical)
-    retrieves user actions 
-    
-    one human agent
-    multiple artifical agents
-    
-    create an agent (with the agent type dictating the agent type)
-    
-    All agents called via same API
-        check_mouse_event
-        get_agent_mouse_pos
-        check_key_event
-        check_events_rate
+    * a human agent wrapping the pygame input
 
 Related projects:
     Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
     which is under MIT license
-    
+
 @author: DZLR3
 """
 
 import numpy as np
 
+RT_DISTS = ('fixed', 'normal', 'lognormal', 'exgauss')
+RATING_POLICIES = ('outcome', 'random', 'fixed')
+
 
 class Agent:
     """
-    tbc
+    The agent API, a player that strikes at the moles dead centre after a
+    fixed reaction time and rates every strike in the middle of the first 2x2
+    rating bar (the headless game continues the other pauses at once)
 
     Attributes
     ----------
-    tbc: dt
-        blurb
+    rng: np.random.Generator
+        the random stream of the agent (set per session via reset)
+    n_strikes: int
+        the strikes planned in the session
+    mouse_pos: tuple
+        the agent's cursor position (its last strike)
 
     Methods
     -------
-    name(arg)
-        desc
+    reset(rng)
+        starts a new session
+    plan_strike(hole_centre)
+        returns the (delay, xy) of the strike for a newly popped mole
+    get_agent_mouse_pos()
+        the agent's cursor position
+    rate(game)
+        the xy of the agent's 2x2 rating click
     """
-    def __init__(self):
-        pass
+    def __init__(self, reaction_time=0.7, rng=None):
+        self.reaction_time = reaction_time
+        self.reset(rng)
+
+    def reset(self, rng=None):
+        '''
+        Starts a new session
+
+        Parameters
+        ----------
+        rng: np.random.Generator/None
+            the random stream (None for the global numpy random state)
+        '''
+        if rng is None:
+            rng = np.random
+        self.rng = rng
+        self.n_strikes = 0
+        self.mouse_pos = (0, 0)
+
+    def plan_strike(self, hole_centre):
+        '''
+        Plans the strike for a newly popped mole
+
+        Parameters
+        ----------
+        hole_centre: 2 float tuple
+            the xy coordinates of the centre of the hole
+
+        Returns
+        -------
+        delay: float
+            seconds after the mole pops that the strike happens
+        xy: 2 float tuple
+            the xy coordinates of the strike
+        '''
+        delay, xy = self._strike(hole_centre)
+        self.n_strikes += 1
+        self.mouse_pos = xy
+        return delay, xy
+
+    def _strike(self, hole_centre):
+        return self.reaction_time, (float(hole_centre[0]),
+                                    float(hole_centre[1]))
+
+    def get_agent_mouse_pos(self):
+        return self.mouse_pos
+
+    def rate(self, game):
+        '''
+        Rates the last strike on the 2x2 rating bars
+
+        Parameters
+        ----------
+        game: GameManager
+            the game (for the rating bar positions and the last strike)
+
+        Returns
+        -------
+        xy: 2 float tuple
+            the xy coordinates of the rating click
+        '''
+        return self._rating_pos(game, 0, 0.5)
+
+    @staticmethod
+    def _rating_pos(game, bar, value):
+        '''
+        The click position for a value (0-1 along the bar) on rating bar 0 or
+        1 (see GameManager.check_rate_in_grid)
+        '''
+        x0, y0 = game.TWO_X_TWO_LOC[2 * bar], game.TWO_X_TWO_LOC[2 * bar + 1]
+        value = min(max(value, 0.01), 0.99)
+        return (x0 + value * game.TWO_X_TWO_LEN,
+                y0 + game.TWO_X_TWO_HEIGHT / 2)
+
+
+class Synthetic_Agent(Agent):
+    """
+    Parameterised synthetic player, with gaussian aim error about the hole
+    centres, a reaction time distribution, fatigue (the aim error and
+    reaction time drifting up with the strikes made) and a 2x2 rating policy
+
+    Attributes
+    ----------
+    aim_sd: float
+        the standard deviation (pixels) of the strike about the hole centre
+    aim_bias: tuple
+        the mean (x, y) offset of the strikes (pixels)
+    rt_dist: string
+        the reaction time distribution (see RT_DISTS), 'fixed' (rt_mean),
+        'normal', 'lognormal' (with mean rt_mean and sd rt_sd) or 'exgauss'
+        (normal rt_mean, rt_sd plus an exponential tail of mean rt_tau)
+    rt_mean: float
+        the mean reaction time (seconds, the normal mean for exgauss)
+    rt_sd: float
+        the reaction time standard deviation (seconds)
+    rt_tau: float
+        the exponential tail mean of exgauss (seconds)
+    rt_min: float
+        the fastest reaction time (seconds)
+    fatigue_aim: float
+        the proportional increase in aim_sd per 100 strikes
+    fatigue_rt: float
+        the increase in reaction time per 100 strikes (seconds)
+    rating_policy: string
+        the 2x2 rating policy (see RATING_POLICIES), 'outcome' rating the
+        last strike by its closeness to the hole centre (on bar 0 for a hit,
+        else bar 1), 'random' uniformly, 'fixed' at rating_value on bar 0
+    rating_value: float
+        the rating (0-1 along the bar) of the fixed policy
+    rating_sd: float
+        the noise (0-1 scale) added to the outcome ratings
+
+    Methods
+    -------
+    as per Agent
+    """
+    def __init__(self, aim_sd=15.0, aim_bias=(0.0, 0.0), rt_dist='lognormal',
+                 rt_mean=0.7, rt_sd=0.15, rt_tau=0.1, rt_min=0.15,
+                 fatigue_aim=0.0, fatigue_rt=0.0, rating_policy='outcome',
+                 rating_value=0.5, rating_sd=0.1, rng=None):
+        if rt_dist not in RT_DISTS:
+            raise ValueError('rt_dist must be one of ' + str(RT_DISTS))
+        if rating_policy not in RATING_POLICIES:
+            raise ValueError('rating_policy must be one of ' +
+                             str(RATING_POLICIES))
+        self.aim_sd = aim_sd
+        self.aim_bias = aim_bias
+        self.rt_dist = rt_dist
+        self.rt_mean = rt_mean
+        self.rt_sd = rt_sd
+        self.rt_tau = rt_tau
+        self.rt_min = rt_min
+        self.fatigue_aim = fatigue_aim
+        self.fatigue_rt = fatigue_rt
+        self.rating_policy = rating_policy
+        self.rating_value = rating_value
+        self.rating_sd = rating_sd
+        Agent.__init__(self, rt_mean, rng)
+
+    @property
+    def fatigue(self):
+        return self.n_strikes / 100.0
+
+    def sample_rt(self):
+        '''
+        Samples a reaction time (including the fatigue drift)
+
+        Returns
+        -------
+        rt: float
+            the reaction time (seconds)
+        '''
+        if self.rt_dist == 'fixed':
+            rt = self.rt_mean
+        elif self.rt_dist == 'normal':
+            rt = self.rng.normal(self.rt_mean, self.rt_sd)
+        elif self.rt_dist == 'lognormal':
+            sigma2 = np.log1p((self.rt_sd / self.rt_mean) ** 2)
+            rt = self.rng.lognormal(np.log(self.rt_mean) - sigma2 / 2,
+                                    np.sqrt(sigma2))
+        else:
+            rt = (self.rng.normal(self.rt_mean, self.rt_sd) +
+                  self.rng.exponential(self.rt_tau))
+        return float(max(rt + self.fatigue_rt * self.fatigue, self.rt_min))
+
+    def _strike(self, hole_centre):
+        aim_sd = self.aim_sd * (1 + self.fatigue_aim * self.fatigue)
+        x = hole_centre[0] + self.aim_bias[0] + self.rng.normal(0, aim_sd)
+        y = hole_centre[1] + self.aim_bias[1] + self.rng.normal(0, aim_sd)
+        return self.sample_rt(), (float(x), float(y))
+
+    def rate(self, game):
+        if self.rating_policy == 'fixed':
+            return self._rating_pos(game, 0, self.rating_value)
+        if self.rating_policy == 'random':
+            bar = int(self.rng.uniform(0, 1) < 0.5)
+            return self._rating_pos(game, bar, self.rng.uniform(0, 1))
+        hit = bool(game.result[0]) if getattr(game, 'result', None) else False
+        closeness = 1 - getattr(game, 'distance', 0.0) / (2 * game.MOLE_RADIUS)
+        return self._rating_pos(game, 0 if hit else 1,
+                                closeness +
+                                self.rng.normal(0, self.rating_sd))
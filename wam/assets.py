@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+assets module
+============
+
+This module contains the Asset_Manager class for the pygame Whack a Mole
+game, which loads the images once at startup, converts them to the display's
+pixel format (so blits do not convert per pixel every frame), optionally
+pre-scales them, and holds them in a single registry with the load time of
+each asset, and the Score_Atlas class, which packs the score graphics into a
+single sprite sheet indexed by the (rounded) score
+
+Attributes:
+    handled within the Asset_Manager and Score_Atlas classes
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import math
+import os
+import time
+import pygame
+
+
+def surface_to_entry(surface):
+    '''
+    Flattens a surface to a picklable (RGBA bytes, size) warm start entry
+    '''
+    return (pygame.image.tostring(surface, 'RGBA'), surface.get_size())
+
+
+def surface_from_entry(entry):
+    '''
+    Rebuilds a (per pixel alpha) surface from a warm start entry
+    '''
+    return pygame.image.fromstring(entry[0], entry[1], 'RGBA')
+
+
+class Asset_Manager:
+    """
+    Registry of the converted (display format) image surfaces
+
+    Attributes
+    ----------
+    surfaces: dict
+        the surfaces, keyed by asset name
+    file_locs: dict
+        the image file location of each asset
+    load_times: dict
+        the seconds taken to load (and convert/scale) each asset
+    bundle: Warm_Start_Bundle/None
+        the warm start cache of the decoded (and scaled) images
+
+    Methods
+    -------
+    load(name, file_loc, alpha=True, scale=None)
+        loads, converts (and scales) an image into the registry
+    add(name, surface, file_loc, secs)
+        adds an already built surface to the registry
+    get(name)
+        gets an asset's surface
+    timing_report()
+        describes the load time of each asset
+    """
+    def __init__(self, bundle=None):
+        self.surfaces = {}
+        self.file_locs = {}
+        self.load_times = {}
+        self.bundle = bundle
+
+    def load(self, name, file_loc, alpha=True, scale=None):
+        '''
+        Loads an image into the registry, converted to the display format
+        (the display mode must already be set)
+
+        Parameters
+        ----------
+        name: string
+            the asset name
+        file_loc: string (file location)
+            the image file
+        alpha: Bool
+            whether to keep the per pixel transparency (convert_alpha), else
+            the image is treated as opaque (convert)
+        scale: float/tuple/None
+            the scale factor, or (width, height), to pre-scale the image to
+
+        Returns
+        -------
+        surface: pygame.Surface
+            the converted image
+        '''
+        start = time.perf_counter()
+        if self.bundle is None:
+            surface = self._decode(file_loc, scale)
+        else:
+            surface = surface_from_entry(self.bundle.fetch(
+                          'image|' + file_loc + '|' + str(scale), [file_loc],
+                          lambda: surface_to_entry(self._decode(file_loc,
+                                                                scale))))
+        if alpha:
+            surface = surface.convert_alpha()
+        else:
+            surface = surface.convert()
+        return self.add(name, surface, file_loc, time.perf_counter() - start)
+
+    @staticmethod
+    def _decode(file_loc, scale=None):
+        surface = pygame.image.load(file_loc)
+        if scale is not None:
+            if isinstance(scale, (int, float)):
+                scale = (round(surface.get_width() * scale),
+                         round(surface.get_height() * scale))
+            surface = pygame.transform.smoothscale(surface.convert_alpha(),
+                                                   scale)
+        return surface
+
+    def add(self, name, surface, file_loc, secs=0.0):
+        '''
+        Adds an already built surface (e.g. a sprite sheet) to the registry
+
+        Parameters
+        ----------
+        name: string
+            the asset name
+        surface: pygame.Surface
+            the image
+        file_loc: string
+            the source of the image (for the timing report)
+        secs: float
+            the seconds taken to build the image
+
+        Returns
+        -------
+        surface: pygame.Surface
+            the image
+        '''
+        self.surfaces[name] = surface
+        self.file_locs[name] = file_loc
+        self.load_times[name] = secs
+        return surface
+
+    def get(self, name):
+        '''
+        Gets an asset's surface
+
+        Parameters
+        ----------
+        name: string
+            the asset name
+
+        Returns
+        -------
+        surface: pygame.Surface
+            the converted image
+        '''
+        return self.surfaces[name]
+
+    def __getitem__(self, name):
+        return self.surfaces[name]
+
+    def __contains__(self, name):
+        return name in self.surfaces
+
+    def timing_report(self):
+        '''
+        Describes the load time of each asset, slowest first
+
+        Returns
+        -------
+        report: string
+            a line per asset (name, milliseconds, file location) and the total
+        '''
+        lines = [name + ': ' + format(secs * 1000, '.2f') + 'ms (' +
+                 self.file_locs[name] + ')' for name, secs in
+                 sorted(self.load_times.items(), key=lambda x: -x[1])]
+        lines.append('total: ' +
+                     format(sum(self.load_times.values()) * 1000, '.2f') +
+                     'ms')
+        return '\n'.join(lines)
+
+
+class Score_Atlas:
+    """
+    Sprite sheet of the score graphics (one frame per score from 0 to
+    max_score), looked up by the rounded score
+
+    Missing score images (e.g. for a max_score above the supplied images) are
+    drawn as a plain text badge the size of the other frames
+
+    Attributes
+    ----------
+    max_score: int
+        the highest score with its own frame (higher scores show this frame)
+    file_pattern: string
+        the score image file location, formatted with the score
+    sheet: pygame.Surface
+        the sprite sheet, frames left to right in score order
+    frames: list
+        the subsurface of the sheet for each score
+    build_secs: float
+        the seconds taken to build the sheet
+
+    Methods
+    -------
+    get_frame(score)
+        gets the frame for the score
+
+    NB with a bundle (Warm_Start_Bundle) the built sheet and frame sizes are
+    cached, so a warm start skips decoding the score images
+    """
+    def __init__(self, max_score, file_pattern="images/{}pts.png",
+                 bundle=None):
+        start = time.perf_counter()
+        self.max_score = int(math.ceil(max_score))
+        self.file_pattern = file_pattern
+        if bundle is None:
+            sheet, sizes = self._build_sheet()
+        else:
+            sources = [file_pattern.format(score) for
+                       score in range(self.max_score + 1)]
+            entry, sizes = bundle.fetch(
+                               'atlas|' + file_pattern + '|' +
+                               str(self.max_score), sources,
+                               lambda: self._build_entry())
+            sheet = surface_from_entry(entry)
+        self.sheet = sheet
+        if pygame.display.get_surface() is not None:
+            self.sheet = self.sheet.convert_alpha()
+        self.frames = []
+        x = 0
+        for size in sizes:
+            self.frames.append(self.sheet.subsurface((x, 0), size))
+            x += size[0]
+        self.build_secs = time.perf_counter() - start
+
+    def _build_sheet(self):
+        images = [self._load_image(score) for
+                  score in range(self.max_score + 1)]
+        size = max((image.get_size() for image in images if
+                    image is not None), default=(200, 100))
+        images = [self._text_badge(score, size) if image is None else image
+                  for score, image in enumerate(images)]
+        sheet = pygame.Surface((sum(image.get_width() for image in images),
+                                max(image.get_height() for image in images)),
+                               pygame.SRCALPHA)
+        sheet.fill((0, 0, 0, 0))
+        x = 0
+        for image in images:
+            sheet.blit(image, (x, 0))
+            x += image.get_width()
+        return sheet, [image.get_size() for image in images]
+
+    def _build_entry(self):
+        sheet, sizes = self._build_sheet()
+        return surface_to_entry(sheet), sizes
+
+    def _load_image(self, score):
+        file_loc = self.file_pattern.format(score)
+        if not os.path.isfile(file_loc):
+            return None
+        return pygame.image.load(file_loc)
+
+    @staticmethod
+    def _text_badge(score, size):
+        if not pygame.font.get_init():
+            pygame.font.init()
+        badge = pygame.Surface(size, pygame.SRCALPHA)
+        badge.fill((255, 255, 255, 255))
+        text = pygame.font.Font(None, size[1] // 2).render(
+                   str(score) + ' pts', True, (0, 0, 0))
+        badge.blit(text, text.get_rect(center=badge.get_rect().center))
+        return badge
+
+    def get_frame(self, score):
+        '''
+        Gets the frame for the score, rounded half up and clipped to
+        0-max_score
+
+        Parameters
+        ----------
+        score: float
+            the score
+
+        Returns
+        -------
+        frame: pygame.Surface
+            the score graphic (a subsurface of the sheet)
+        '''
+        index = math.floor(score + 0.5)
+        return self.frames[min(max(index, 0), self.max_score)]
@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+"""
+condition_set module
+============
+
+This module contains the typed, versioned condition set format for the
+pygame Whack a Mole game, replacing the pickled master dictionaries, i.e. a
+JSON file of the form
+
+    {"format": "wam-condition-set", "version": 1, "sections": {...}}
+
+whose sections (conditions_meta, main_game, scorer, hit_checker and
+margin_drifter) are validated against SCHEMA as the file is loaded, so a
+malformed set is rejected (with every problem listed) before a participant
+session starts. The parsed sets are memoised by path, size and modification
+time, so repeat loads (e.g. the simulator's sessions) parse the file once
+
+Legacy .pkl condition sets still load (and are validated), and can be
+converted with:
+    python -m wam.condition_set migrate config/Default.pkl [...]
+or checked with:
+    python -m wam.condition_set check config/Default.json [...]
+
+Attributes:
+    FORMAT_NAME: string
+        the format marker of a condition set file
+    FORMAT_VERSION: int
+        the current format version
+    SCHEMA: dict
+        the Field of each setting, by section
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import argparse
+import copy
+import json
+import os
+import pickle
+import sys
+
+FORMAT_NAME = 'wam-condition-set'
+FORMAT_VERSION = 1
+
+
+class Condition_Set_Error(ValueError):
+    """
+    Raised when a condition set is malformed
+
+    Attributes
+    ----------
+    errors: list
+        the problems found (one string each)
+    """
+    def __init__(self, file_loc, errors):
+        self.errors = errors
+        ValueError.__init__(self, str(file_loc) + ' is not a valid condition '
+                            'set:\n    ' + '\n    '.join(errors))
+
+
+class Field:
+    """
+    The type (and range/choices) of a condition set setting
+
+    Attributes
+    ----------
+    kind: string
+        'int', 'float' (ints accepted), 'bool', 'str', 'pair' (two ints) or
+        'int_list'
+    low: float/None
+        the lowest valid value
+    high: float/None
+        the highest valid value
+    choices: tuple/None
+        the valid values
+    required: Bool
+        whether the setting must be present
+
+    Methods
+    -------
+    check(value)
+        the problem with a value (None if valid)
+    """
+    def __init__(self, kind, low=None, high=None, choices=None,
+                 required=True):
+        self.kind = kind
+        self.low = low
+        self.high = high
+        self.choices = choices
+        self.required = required
+
+    def _is_kind(self, value):
+        if self.kind == 'int':
+            return isinstance(value, int) and not isinstance(value, bool)
+        if self.kind == 'float':
+            return (isinstance(value, (int, float)) and
+                    not isinstance(value, bool))
+        if self.kind == 'bool':
+            return isinstance(value, bool)
+        if self.kind == 'str':
+            return isinstance(value, str)
+        if self.kind in ('pair', 'int_list'):
+            return (isinstance(value, (list, tuple)) and
+                    (self.kind == 'int_list' or len(value) == 2) and
+                    all(isinstance(x, int) and not isinstance(x, bool) for
+                        x in value))
+        return False
+
+    def check(self, value):
+        '''
+        Checks a value against the field
+
+        Parameters
+        ----------
+        value: object
+            the setting value
+
+        Returns
+        -------
+        problem: string/None
+            the problem, None if the value is valid
+        '''
+        if not self._is_kind(value):
+            return 'expected ' + self.kind + ', got ' + repr(value)
+        if self.choices is not None and value not in self.choices:
+            return repr(value) + ' is not one of ' + repr(self.choices)
+        if self.low is not None and value < self.low:
+            return repr(value) + ' is below ' + repr(self.low)
+        if self.high is not None and value > self.high:
+            return repr(value) + ' is above ' + repr(self.high)
+        return None
+
+
+SCHEMA = {
+    'conditions_meta': {
+        'cond_set_name': Field('str'),
+        'cond_set_user': Field('str'),
+        'cond_set_notes': Field('str')},
+    'main_game': {
+        'SCREEN_WIDTH': Field('int', low=1),
+        'SCREEN_HEIGHT': Field('int', low=1),
+        'COMM_BAR_HEIGHT': Field('int', low=0),
+        'TWO_X_TWO_LEN': Field('int', low=0),
+        'TWO_X_TWO_LOC': Field('pair'),
+        'FONT_SIZE': Field('int', low=1),
+        'FPS': Field('int', low=1),
+        'MOLE_WIDTH': Field('int', low=1),
+        'MOLE_HEIGHT': Field('int', low=1),
+        'post_whack_interval': Field('float', low=0),
+        'mole_pause_interval': Field('float', low=0),
+        'animation_interval': Field('float', low=0),
+        'mole_down_interval': Field('float', low=0),
+        'STAGE_SCORE_GAP': Field('int', low=0),
+        'stages': Field('int', low=1),
+        'stage_length': Field('int', low=1),
+        'stage_type': Field('str', choices=('Standard', 'Attempts')),
+        'demo': Field('bool'),
+        'demo_len': Field('int', low=0),
+        'update_delay': Field('float', low=0),
+        'feedback_limit': Field('int', low=0),
+        'FEEDBACK': Field('bool'),
+        'stage_time_change': Field('bool'),
+        'MOLE_RADIUS': Field('float', low=0),
+        'MARGIN_START': Field('float'),
+        'n_moles': Field('int', low=1, required=False),
+        'allowed_events': Field('int_list', required=False),
+        'motion_sample_hz': Field('int', low=0, required=False)},
+    'scorer': {
+        'skill_type': Field('str', choices=('Normal', 'lin_dist_skill',
+                                            'nonlin_dist_skill')),
+        'adjust': Field('bool'),
+        'max_score': Field('float'),
+        'min_score': Field('float'),
+        'rand_type': Field('str', choices=('uniform', 'normal')),
+        'rand_mean': Field('float'),
+        'rand_sd': Field('float', low=0),
+        'skill_luck_rat': Field('float', low=0, high=1)},
+    'hit_checker': {
+        'hit_type': Field('str', choices=('Standard', 'Binomial')),
+        'diff_fact': Field('float'),
+        'luck_mean': Field('float'),
+        'luck_sd': Field('float', low=0),
+        'luck_low_bnd': Field('float'),
+        'luck_high_bnd': Field('float')},
+    'margin_drifter': {
+        'drift_type': Field('str', choices=('static', 'sin', 'linear',
+                                            'linear+sin', 'random')),
+        'gradient': Field('float'),
+        'amplitude': Field('float'),
+        'noise': Field('bool'),
+        'noise_truncated': Field('bool'),
+        'noise_mean': Field('float'),
+        'noise_sd': Field('float', low=0),
+        'noise_low_bnd': Field('float'),
+        'noise_high_bnd': Field('float'),
+        'always_pos': Field('bool'),
+        'drift_clip': Field('bool'),
+        'clip_high_bnd': Field('float'),
+        'clip_low_bnd': Field('float')}}
+
+# (section, low setting, high setting) pairs that must be ordered
+ORDERED_BOUNDS = (('scorer', 'min_score', 'max_score'),
+                  ('hit_checker', 'luck_low_bnd', 'luck_high_bnd'),
+                  ('margin_drifter', 'noise_low_bnd', 'noise_high_bnd'),
+                  ('margin_drifter', 'clip_low_bnd', 'clip_high_bnd'))
+
+_cache = {}
+
+
+def validate(master_dict):
+    '''
+    Checks a condition set (master dictionary) against the SCHEMA
+
+    Parameters
+    ----------
+    master_dict: dict
+        the settings of each section
+
+    Returns
+    -------
+    errors: list
+        the problems found (empty if valid)
+    '''
+    if not isinstance(master_dict, dict):
+        return ['expected a dictionary of sections, got ' +
+                type(master_dict).__name__]
+    errors = ['unknown section ' + repr(section) for
+              section in master_dict if section not in SCHEMA]
+    for section, fields in SCHEMA.items():
+        settings = master_dict.get(section)
+        if not isinstance(settings, dict):
+            errors.append('missing section ' + repr(section))
+            continue
+        for name in settings:
+            if name not in fields:
+                errors.append(section + '.' + name + ': unknown setting')
+        for name, field in fields.items():
+            if name not in settings:
+                if field.required:
+                    errors.append(section + '.' + name + ': missing')
+                continue
+            problem = field.check(settings[name])
+            if problem is not None:
+                errors.append(section + '.' + name + ': ' + problem)
+    if errors:
+        return errors
+    for section, low, high in ORDERED_BOUNDS:
+        if master_dict[section][low] > master_dict[section][high]:
+            errors.append(section + '.' + low + ' is above ' + section +
+                          '.' + high)
+    return errors
+
+
+def _from_file_dict(file_dict):
+    # JSON has no tuples, the pairs are restored to the in game types
+    master_dict = copy.deepcopy(file_dict)
+    for section, fields in SCHEMA.items():
+        for name, field in fields.items():
+            settings = master_dict.get(section)
+            if (field.kind == 'pair' and isinstance(settings, dict) and
+                    isinstance(settings.get(name), list)):
+                settings[name] = tuple(settings[name])
+    return master_dict
+
+
+def _read(file_loc):
+    if file_loc.endswith('.pkl'):
+        with open(file_loc, 'rb') as f:
+            return pickle.load(f), []
+    with open(file_loc, 'r') as f:
+        try:
+            data = json.load(f)
+        except ValueError as error:
+            return None, ['not valid JSON (' + str(error) + ')']
+    if not isinstance(data, dict) or data.get('format') != FORMAT_NAME:
+        return None, ['not a ' + FORMAT_NAME + ' file']
+    if data.get('version') != FORMAT_VERSION:
+        return None, ['unsupported version ' + repr(data.get('version')) +
+                      ' (expected ' + str(FORMAT_VERSION) + ')']
+    return _from_file_dict(data.get('sections')), []
+
+
+def load_condition_set(file_loc):
+    '''
+    Loads and validates a condition set, memoised by the file's path, size
+    and modification time
+
+    Parameters
+    ----------
+    file_loc: string (file location)
+        the condition set (.json, or a legacy .pkl)
+
+    Raises
+    ------
+    OSError
+        if the file cannot be read
+    Condition_Set_Error
+        if the condition set is malformed
+
+    Returns
+    -------
+    master_dict: dict
+        the settings of each section (a copy, free to be altered)
+    '''
+    stat = os.stat(file_loc)
+    key = os.path.abspath(file_loc)
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    cached = _cache.get(key)
+    if cached is None or cached[0] != stamp:
+        master_dict, errors = _read(file_loc)
+        if not errors:
+            errors = validate(master_dict)
+        if errors:
+            raise Condition_Set_Error(file_loc, errors)
+        cached = (stamp, master_dict)
+        _cache[key] = cached
+    return copy.deepcopy(cached[1])
+
+
+def save_condition_set(master_dict, file_loc):
+    '''
+    Validates and saves a condition set in the current format
+
+    Parameters
+    ----------
+    master_dict: dict
+        the settings of each section
+    file_loc: string (file location)
+        the .json file
+
+    Raises
+    ------
+    Condition_Set_Error
+        if the condition set is malformed (nothing is written)
+    '''
+    errors = validate(master_dict)
+    if errors:
+        raise Condition_Set_Error(file_loc, errors)
+    data = {'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'sections': master_dict}
+    with open(file_loc, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+
+def clear_cache():
+    '''
+    Clears the memoised condition sets
+    '''
+    _cache.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Condition set tools')
+    parser.add_argument('command', choices=('check', 'migrate'))
+    parser.add_argument('file_locs', nargs='+')
+    args = parser.parse_args(argv)
+    failed = False
+    for file_loc in args.file_locs:
+        try:
+            master_dict = load_condition_set(file_loc)
+        except (OSError, Condition_Set_Error) as error:
+            print(error)
+            failed = True
+            continue
+        if args.command == 'migrate':
+            json_loc = os.path.splitext(file_loc)[0] + '.json'
+            save_condition_set(master_dict, json_loc)
+            print(file_loc + ' -> ' + json_loc)
+        else:
+            print(file_loc + ': valid')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
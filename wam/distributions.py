@@ -5,6 +5,10 @@ main
 
 Simple distribution samples for random events in game
 
+NB scipy.stats is imported on first use of a truncated normal (see
+_truncnorm) rather than with the module, as it dominates the start up of the
+modules that merely import the samplers (see the import_report module)
+
 Attributes:
     na
 
@@ -17,14 +21,23 @@ Related projects:
 
 @author: DZLR3
 """
-import scipy.stats as stats
 import numpy as np
 
 
-def trunc_norm_sample(mean, sd, low_bnd, high_bnd):
+def _truncnorm(mean, sd, low_bnd, high_bnd):
     '''
-    Creates a single sample from a init determind truncated normal
-    distribution
+    Builds the scipy truncated normal distribution (importing scipy.stats on
+    the first call)
+    '''
+    from scipy.stats import truncnorm
+    return truncnorm((low_bnd - mean) / sd, (high_bnd - mean) / sd,
+                     loc=mean, scale=sd)
+
+
+def trunc_norm_sample(mean, sd, low_bnd, high_bnd, size=None):
+    '''
+    Creates a single sample (or an array of samples) from a init determind
+    truncated normal distribution
 
     Parameters
     ----------
@@ -36,21 +49,268 @@ def trunc_norm_sample(mean, sd, low_bnd, high_bnd):
         the low bound of the truncated sample
     high_bnd: float
         the high bound of the truncated sample
+    size: int/None
+        the number of samples, None for a single float
 
     Returns
     -------
-    x: float
-        random sample from a truncated normal distribution
+    x: float/np.array
+        random sample(s) from a truncated normal distribution
         (with mean etc. defined) at initialisation
     '''
-    X = stats.truncnorm((low_bnd - mean) / sd,
-                        (high_bnd - mean) / sd,
-                        loc=mean, scale=sd)
-    x = X.rvs(1)[0]
+    X = _truncnorm(mean, sd, low_bnd, high_bnd)
+    if size is None:
+        x = X.rvs(1)[0]
+    else:
+        x = X.rvs(size)
     return x
 
 
-def norm_sample(mean, sd):
+class Trunc_Norm_Sampler:
+    """
+    Truncated normal sampler, which builds the scipy distribution once and
+    serves draws from a pre-filled (and refilled when spent) buffer of
+    samples, so single in-game draws are simple array reads
+
+    Attributes
+    ----------
+    mean: float
+        mean for the normal distribution sample
+    sd: float
+        standard deviations
+    low_bnd: float
+        the low bound of the truncated sample
+    high_bnd: float
+        the high bound of the truncated sample
+    buffer_size: int
+        the number of samples drawn per refill of the buffer
+    rng: np.random.Generator/None
+        the random stream the samples are drawn from (None for the global
+        numpy random state)
+
+    Methods
+    -------
+    sample(size)
+        returns a single sample (size None) or an array of samples
+    refill()
+        refills the buffer of samples
+    """
+    def __init__(self, mean, sd, low_bnd, high_bnd, buffer_size=1024,
+                 rng=None):
+        self.mean = mean
+        self.sd = sd
+        self.low_bnd = low_bnd
+        self.high_bnd = high_bnd
+        self.buffer_size = buffer_size
+        self.rng = rng
+        self.dist = _truncnorm(mean, sd, low_bnd, high_bnd)
+        self.buffer = np.empty(0)
+        self.buffer_pos = 0
+
+    def refill(self):
+        '''
+        Refills the buffer of samples
+
+        Parameters
+        ----------
+        self : self
+        '''
+        self.buffer = self.dist.rvs(self.buffer_size, random_state=self.rng)
+        self.buffer_pos = 0
+
+    def sample(self, size=None):
+        '''
+        Draws from the buffer of samples
+
+        Parameters
+        ----------
+        size: int/tuple/None
+            the number (or shape) of samples, None for a single float
+
+        Returns
+        -------
+        x: float/np.array
+            random sample(s) from the truncated normal distribution
+        '''
+        if size is None:
+            if self.buffer_pos >= len(self.buffer):
+                self.refill()
+            x = float(self.buffer[self.buffer_pos])
+            self.buffer_pos += 1
+            return x
+        n = int(np.prod(size))
+        x = self.buffer[self.buffer_pos:self.buffer_pos + n]
+        self.buffer_pos += len(x)
+        if len(x) < n:
+            x = np.concatenate([x, self.dist.rvs(n - len(x),
+                                                 random_state=self.rng)])
+        return x.reshape(size)
+
+
+class Trunc_Norm_Cache:
+    """
+    Cache of Trunc_Norm_Samplers keyed by (mean, sd, low_bnd, high_bnd), all
+    drawing from one random stream. Called as per trunc_norm_sample
+
+    Attributes
+    ----------
+    rng: np.random.Generator/None
+        the random stream the samplers draw from (None for the global numpy
+        random state)
+    samplers: dict
+        the samplers created so far, keyed by their parameters
+
+    Methods
+    -------
+    get_sampler(mean, sd, low_bnd, high_bnd)
+        gets the sampler for the parameters, creating it on first use
+    clear()
+        clears the cached samplers
+    """
+    def __init__(self, rng=None):
+        self.rng = rng
+        self.samplers = {}
+
+    def __call__(self, mean, sd, low_bnd, high_bnd, size=None):
+        '''
+        Drop-in for trunc_norm_sample, drawing from the cached sampler for the
+        given parameters rather than building the distribution on every call
+
+        Parameters
+        ----------
+        mean: float
+            mean for the normal distribution sample
+        sd: float
+            standard deviations
+        low_bnd: float
+            the low bound of the truncated sample
+        high_bnd: float
+            the high bound of the truncated sample
+        size: int/tuple/None
+            the number (or shape) of samples, None for a single float
+
+        Returns
+        -------
+        x: float/np.array
+            random sample(s) from a truncated normal distribution
+        '''
+        return self.get_sampler(mean, sd, low_bnd, high_bnd).sample(size)
+
+    def get_sampler(self, mean, sd, low_bnd, high_bnd):
+        '''
+        Gets the cached Trunc_Norm_Sampler for the given parameters, creating
+        it on first use
+
+        Parameters
+        ----------
+        mean: float
+            mean for the normal distribution sample
+        sd: float
+            standard deviations
+        low_bnd: float
+            the low bound of the truncated sample
+        high_bnd: float
+            the high bound of the truncated sample
+
+        Returns
+        -------
+        sampler: Trunc_Norm_Sampler
+            the sampler for the parameters
+        '''
+        key = (mean, sd, low_bnd, high_bnd)
+        sampler = self.samplers.get(key)
+        if sampler is None:
+            sampler = Trunc_Norm_Sampler(mean, sd, low_bnd, high_bnd,
+                                         rng=self.rng)
+            self.samplers[key] = sampler
+        return sampler
+
+    def clear(self):
+        '''
+        Clears the cached samplers (e.g. after reseeding, so no stale buffered
+        draws are served)
+        '''
+        self.samplers.clear()
+
+
+# Shared cache on the global numpy random state
+_trunc_norm_cache = Trunc_Norm_Cache()
+cached_trunc_norm_sample = _trunc_norm_cache
+get_trunc_norm_sampler = _trunc_norm_cache.get_sampler
+clear_trunc_norm_samplers = _trunc_norm_cache.clear
+
+
+class Session_RNG:
+    """
+    Per-session hierarchy of independent numpy random Generators, one stream
+    per subsystem, spawned from a single SeedSequence so a session can be
+    replayed from its seed and parallel sessions get non-overlapping streams
+
+    Attributes
+    ----------
+    seed_seq: np.random.SeedSequence
+        the root seed sequence for the session
+    game: np.random.Generator
+        stream for the GameManager (mole placement, skill/luck flips)
+    hit_checker: np.random.Generator
+        stream for the Hit_Checker
+    scorer: np.random.Generator
+        stream for the Scorer
+    margin: np.random.Generator
+        stream for the margin Drifting_Val
+    agent: np.random.Generator
+        stream for any synthetic player
+
+    Methods
+    -------
+    spawn(n_children)
+        spawns independent child Session_RNGs (e.g. one per worker/session)
+    seed_dict
+        Property method, the seed and spawn key to replay the session
+    """
+    stream_names = ('game', 'hit_checker', 'scorer', 'margin', 'agent')
+
+    def __init__(self, seed=None, spawn_key=(), seed_seq=None):
+        if seed_seq is None:
+            seed_seq = np.random.SeedSequence(seed, spawn_key=spawn_key)
+        self.seed_seq = seed_seq
+        for name, child in zip(self.stream_names,
+                               seed_seq.spawn(len(self.stream_names))):
+            setattr(self, name, np.random.default_rng(child))
+
+    def spawn(self, n_children):
+        '''
+        Spawns independent child Session_RNGs
+
+        Parameters
+        ----------
+        n_children: int
+            the number of children
+
+        Returns
+        -------
+        children: list
+            list of Session_RNG
+        '''
+        return [Session_RNG(seed_seq=child) for
+                child in self.seed_seq.spawn(n_children)]
+
+    @property
+    def seed_dict(self):
+        '''
+        Property method, the seed (i.e. entropy) and spawn key that recreate
+        the session streams, i.e. Session_RNG(**seed_dict)
+
+        Returns
+        -------
+        seed_dict: dict
+            the seed and spawn_key
+        '''
+        return {'seed': self.seed_seq.entropy,
+                'spawn_key': self.seed_seq.spawn_key}
+
+
+def norm_sample(mean, sd, rng=None):
     ''' scipy.
     Creates a single sample from a init determined truncated normal
     distribution
@@ -61,6 +321,8 @@ def norm_sample(mean, sd):
         mean for the normal distribution sample
     sd: float
         standard deviations
+    rng: np.random.Generator/None
+        the random stream to draw from (None for the global random state)
 
     Returns
     -------
@@ -68,5 +330,7 @@ def norm_sample(mean, sd):
         random sample from a normal distribution (with mean etc. defined)
         at initialisation,
     '''
-    x = np.random.normal(mean, sd)
+    if rng is None:
+        rng = np.random
+    x = rng.normal(mean, sd)
     return x
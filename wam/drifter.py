@@ -20,8 +20,10 @@ Related projects:
 """
 
 import numpy as np
-from wam.distributions import trunc_norm_sample as _trunc_norm_sample
+from functools import partial
+from wam.distributions import cached_trunc_norm_sample as _trunc_norm_sample
 from wam.distributions import norm_sample as _norm_sample
+from wam.distributions import Trunc_Norm_Cache
 
 
 class Drifting_Val:
@@ -57,6 +59,9 @@ class Drifting_Val:
         the high boundary for the clipping
     clip_low_bnd: float
         the low boundary for the clipping
+    rng: np.random.Generator
+        the random stream for the random drift and noise (defaults to the
+        global numpy random state)
 
     Methods
     ----------
@@ -86,7 +91,8 @@ class Drifting_Val:
                  drift_type='static', noise=False, noise_mean=10, noise_sd=10,
                  noise_truncated=True, gradient=1, amplitude=1,
                  always_pos=True, noise_low_bnd=0, noise_high_bnd=10,
-                 drift_clip=False, clip_high_bnd=10, clip_low_bnd=0):
+                 drift_clip=False, clip_high_bnd=10, clip_low_bnd=0,
+                 rng=None):
 
         # Sets the inital value
         self.init_val = variable
@@ -94,8 +100,14 @@ class Drifting_Val:
         self.call_count = 0
 
         # External distribution functions
-        self._norm_sample = _norm_sample
-        self._trunc_norm_sample = _trunc_norm_sample
+        if rng is None:
+            self.rng = np.random
+            self._norm_sample = _norm_sample
+            self._trunc_norm_sample = _trunc_norm_sample
+        else:
+            self.rng = rng
+            self._norm_sample = partial(_norm_sample, rng=rng)
+            self._trunc_norm_sample = Trunc_Norm_Cache(rng)
 
         # Load either by input vals or config_dict (if present)
         if type(config_dict) is dict:
@@ -161,7 +173,9 @@ class Drifting_Val:
         if self.drift_type == 'static':
             pass
         else:
-            self.last_val = self.init_val + self._function + self._noise
+            # float, as the numpy drift functions return numpy scalars
+            self.last_val = float(self.init_val + self._function +
+                                  self._noise)
             self.call_count += 1
         if self.always_pos:
             if self.last_val > 0:
@@ -199,7 +213,7 @@ class Drifting_Val:
             x = (np.sin(self.call_count) * self.amplitude +
                  self.gradient * self.call_count)
         elif self.drift_type == 'random':
-            x = (np.random.random_sample() - 0.5) * 2 * self.amplitude
+            x = (self.rng.random() - 0.5) * 2 * self.amplitude
         return x
 
     @property
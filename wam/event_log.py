@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+event_log module
+============
+
+This module contains the Event_Sink class and load_events function for the
+pygame Whack a Mole game, which write/read the game events as fixed width
+binary records (alongside the text .log), so a session loads with one bulk
+read into a numpy structured array (or pd.DataFrame(events))
+
+Attributes:
+    EVENT_CODES: dict
+        event name to the event code (as per the text log, e.g. 9-Hit Attempt)
+    EVENT_DTYPE: np.dtype
+        the record layout, missing values are NaN (floats) or -1 (ints)
+    EVENT_DTYPES: dict
+        the file magic (version) to the record layout
+    HEADER_DTYPE: np.dtype
+        the file header, with the wall clock and monotonic time at creation
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import time
+import numpy as np
+
+EVENT_MAGIC = b'WAMEVT02'
+
+EVENT_CODES = {'rate': 7,
+               'pause': 8,
+               'hit_attempt': 9,
+               'mole_up': 10,
+               'score': 11,
+               'skill_luck_ratio': 12,
+               'near_miss': 13,
+               'trajectory': 14}
+
+EVENT_DTYPE_V1 = np.dtype([('code', 'u1'),
+                           ('t_ns', '<i8'),
+                           ('mole_x', '<i4'),
+                           ('mole_y', '<i4'),
+                           ('distance', '<f4'),
+                           ('rel_x', '<f4'),
+                           ('rel_y', '<f4'),
+                           ('true_hit', 'i1'),
+                           ('margin_hit', 'i1'),
+                           ('hit', 'i1'),
+                           ('score_inc', '<f4'),
+                           ('score', '<f4'),
+                           ('true_score', '<f4'),
+                           ('skill', 'i1'),
+                           ('skill_luck_rat', '<f4'),
+                           ('rate_x', '<f4'),
+                           ('rate_y', '<f4')])
+
+EVENT_DTYPE = np.dtype([('code', 'u1'),
+                        ('t_ns', '<i8'),
+                        ('mole_x', '<i4'),
+                        ('mole_y', '<i4'),
+                        ('distance', '<f4'),
+                        ('rel_x', '<f4'),
+                        ('rel_y', '<f4'),
+                        ('true_hit', 'i1'),
+                        ('margin_hit', 'i1'),
+                        ('hit', 'i1'),
+                        ('score_inc', '<f4'),
+                        ('score', '<f4'),
+                        ('true_score', '<f4'),
+                        ('skill', 'i1'),
+                        ('skill_luck_rat', '<f4'),
+                        ('rate_x', '<f4'),
+                        ('rate_y', '<f4'),
+                        ('rt_ms', '<f4'),
+                        ('emerged_rt_ms', '<f4'),
+                        ('latency_ms', '<f4')])
+
+# File magic to the record layout (older files load with their own layout)
+EVENT_DTYPES = {b'WAMEVT01': EVENT_DTYPE_V1,
+                EVENT_MAGIC: EVENT_DTYPE}
+
+HEADER_DTYPE = np.dtype([('magic', 'S8'),
+                         ('wall_ns', '<i8'),
+                         ('mono_ns', '<i8')])
+
+
+class Event_Sink:
+    """
+    Append-only writer of the binary event records, buffering records in a
+    preallocated array and writing them in batches
+
+    Attributes
+    ----------
+    file_loc: string (file location)
+        the binary event file
+    batch_size: int
+        the number of records buffered between writes
+
+    Methods
+    -------
+    write(code, **fields)
+        buffers a record (the timestamp is taken at the call)
+    flush()
+        writes the buffered records to file
+    close()
+        flushes and closes the file
+    """
+    def __init__(self, file_loc, batch_size=256):
+        self.file_loc = file_loc
+        self.batch_size = batch_size
+        self.buffer = np.empty(batch_size, dtype=EVENT_DTYPE)
+        self.buffer_pos = 0
+        self._blank = self._blank_record()
+        self.file = open(file_loc, 'ab')
+        if self.file.tell() == 0:
+            header = np.array([(EVENT_MAGIC, time.time_ns(),
+                                time.perf_counter_ns())], dtype=HEADER_DTYPE)
+            self.file.write(header.tobytes())
+
+    @staticmethod
+    def _blank_record():
+        blank = np.zeros(1, dtype=EVENT_DTYPE)[0]
+        for name in EVENT_DTYPE.names:
+            if EVENT_DTYPE[name].kind == 'f':
+                blank[name] = np.nan
+            elif name != 'code':
+                blank[name] = -1
+        return blank
+
+    def write(self, code, **fields):
+        '''
+        Buffers a record, writing the batch when the buffer is full
+
+        Parameters
+        ----------
+        code: int
+            the event code (see EVENT_CODES)
+        **fields:
+            the record values by EVENT_DTYPE name (the rest, and any None,
+            are missing)
+        '''
+        self.buffer[self.buffer_pos] = self._blank
+        record = self.buffer[self.buffer_pos]
+        record['code'] = code
+        record['t_ns'] = time.perf_counter_ns()
+        for name, value in fields.items():
+            if value is None:
+                continue
+            try:
+                record[name] = value
+            except (TypeError, ValueError):
+                print('Event record field ' + name + ' could not be stored')
+        self.buffer_pos += 1
+        if self.buffer_pos == self.batch_size:
+            self.flush()
+
+    def flush(self):
+        '''
+        Writes the buffered records to file
+        '''
+        if self.buffer_pos:
+            self.file.write(self.buffer[:self.buffer_pos].tobytes())
+            self.file.flush()
+            self.buffer_pos = 0
+
+    def close(self):
+        '''
+        Flushes and closes the file
+        '''
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+def load_events(file_loc):
+    '''
+    Loads a binary event file in one bulk read
+
+    Parameters
+    ----------
+    file_loc: string (file location)
+        the binary event file
+
+    Raises
+    ------
+    ValueError
+        if the file is not a binary event file
+
+    Returns
+    -------
+    header: np.void
+        the header record (magic, wall_ns, mono_ns), i.e. the wall clock time
+        of the session is wall_ns + (t_ns - mono_ns)
+    events: np.array
+        structured array of EVENT_DTYPE records (or the layout of the
+        file's version)
+    '''
+    header = np.fromfile(file_loc, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header[0]['magic'] not in EVENT_DTYPES:
+        raise ValueError(file_loc + ' is not a WAM binary event file')
+    events = np.fromfile(file_loc, dtype=EVENT_DTYPES[header[0]['magic']],
+                         offset=HEADER_DTYPE.itemsize)
+    return header[0], events
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+event_pipeline module
+============
+
+This module contains the Event_Pipeline class for the pygame Whack a Mole
+game, which limits the pygame event queue to the event types the game uses
+(via pygame.event.set_allowed) and coalesces the mouse motion events into a
+downsampled cursor trajectory, so the motion events are summarised per mole
+rather than each being stringified into the log
+
+Attributes:
+    DEFAULT_ALLOWED: tuple
+        the pygame event types the game reacts to (or records)
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import numpy as np
+import pygame
+
+DEFAULT_ALLOWED = (pygame.QUIT,
+                   pygame.KEYDOWN,
+                   pygame.MOUSEBUTTONDOWN,
+                   pygame.MOUSEMOTION)
+
+
+class Event_Pipeline:
+    """
+    Filters the pygame events and coalesces the mouse motion into a fixed
+    rate (t_ns, x, y) trajectory
+
+    Attributes
+    ----------
+    allowed: list
+        the pygame event types allowed onto the queue
+    sample_ns: int
+        the minimum time between trajectory samples (motion within it
+        updates the latest sample), 0 to block the motion events
+    samples: np.array
+        the (capacity, 3) trajectory buffer of t_ns, x, y
+    n_samples: int
+        the number of samples in the buffer
+    n_motion: int
+        the number of motion events coalesced into the buffer
+    recorder: Trajectory_Recorder/None
+        records every motion event at full resolution (None for none)
+
+    Methods
+    -------
+    install()
+        restricts the pygame event queue to the allowed events
+    filter(events)
+        records the motion events, returning the rest
+    take_trajectory()
+        returns (and clears) the trajectory
+    """
+    def __init__(self, allowed=DEFAULT_ALLOWED, sample_hz=30, capacity=512,
+                 recorder=None):
+        self.sample_ns = 10**9 // sample_hz if sample_hz else 0
+        self.allowed = [event_type for event_type in allowed if
+                        self.sample_ns or event_type != pygame.MOUSEMOTION]
+        self.samples = np.empty((capacity, 3), dtype=np.float64)
+        self.n_samples = 0
+        self.n_motion = 0
+        self.recorder = recorder
+
+    def install(self):
+        '''
+        Restricts the pygame event queue to the allowed events (the display
+        must be initialised)
+        '''
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.allowed)
+
+    def filter(self, events):
+        '''
+        Records the motion events into the trajectory, returning the other
+        events
+
+        Parameters
+        ----------
+        events: list
+            the pygame events, stamped with t_ns (see
+            GameManager._stamp_events)
+
+        Returns
+        -------
+        events: list
+            the events other than mouse motion
+        '''
+        passed = []
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                t_ns = getattr(event, 't_ns', 0)
+                if self.recorder is not None:
+                    self.recorder.record(t_ns, event.pos)
+                self.add_sample(t_ns, event.pos)
+            else:
+                passed.append(event)
+        return passed
+
+    def add_sample(self, t_ns, pos):
+        '''
+        Adds a cursor position to the trajectory, updating the latest sample
+        instead should it be within sample_ns of it
+
+        Parameters
+        ----------
+        t_ns: int
+            the time of the position
+        pos: tuple
+            the x, y cursor position
+        '''
+        self.n_motion += 1
+        if self.sample_ns == 0:
+            return
+        n = self.n_samples
+        if n and t_ns - self.samples[n - 1, 0] < self.sample_ns:
+            self.samples[n - 1, 1:] = pos
+            return
+        if n == len(self.samples):
+            self.samples = np.concatenate([self.samples,
+                                           np.empty_like(self.samples)])
+        self.samples[n] = (t_ns, pos[0], pos[1])
+        self.n_samples += 1
+
+    def take_trajectory(self):
+        '''
+        Returns (and clears) the trajectory
+
+        Returns
+        -------
+        samples: np.array
+            the (n, 3) t_ns, x, y samples
+        n_motion: int
+            the number of motion events coalesced into them
+        '''
+        samples = self.samples[:self.n_samples].copy()
+        n_motion = self.n_motion
+        self.n_samples = 0
+        self.n_motion = 0
+        return samples, n_motion
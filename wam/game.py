@@ -13,7 +13,6 @@ Todo:
     * fix pause between moles
     * make the game constants a config read (and write to a log)
     * sort check key event
-    * create agent class for check events etc.
     * abstract the screen functionality to make the GameManager standalone
     * sort all the doc strings
 
@@ -26,15 +25,23 @@ Related projects:
 
 
 import pygame
-import random
-import pyautogui
 from wam.sound import SoundEffect
 from wam.logger import WamLogger
 from wam.scorer import Scorer
 from wam.drifter import Drifting_Val
 from wam.hit_checker import Hit_Checker
+from wam.text import Text_Renderer
+from wam.render import Dirty_Rect_Renderer
+from wam.assets import Asset_Manager, Score_Atlas
+from wam.hole_index import Hole_Index
+from wam.mole_pool import Mole_Pool
+from wam.scheduler import Fixed_Step_Scheduler
+from wam.event_pipeline import Event_Pipeline, DEFAULT_ALLOWED
+from wam.startup import Startup_Profiler, Warm_Start_Bundle
+from wam.condition_set import load_condition_set
+import os
 import re
-import pickle
+import time
 import numpy as np
 
 
@@ -59,15 +66,60 @@ class GameManager:
     _get_pause_dict
         Property method, imports a text file and creates a dictionary for the
         text displayed under given game pause conditions
+
+    NB session_rng (a wam.distributions.Session_RNG) provides independent
+    random streams to the game, Scorer, Hit_Checker and margin Drifting_Val
+    so a session can be replayed from its seed, else the global numpy random
+    state is used
+
+    NB when headless is True no display, images or sounds are initialised and
+    the rendering calls are skipped, so the game state machine can be driven
+    by the wam.simulator module (pass a SimLogger as wam_logger to avoid
+    writing the .log files)
+
+    NB an agent (see wam.agent) plays the game in place of the mouse and
+    keyboard: each mole popped (by pop_mole or pop_pool_moles) has its strike
+    planned by agent.plan_strike, which is injected as a mouse click through
+    the same event path as the player's clicks once due (see _agent_events),
+    the intro is skipped and the pauses are resolved at once (as if "c" were
+    pressed), with agent.rate making the 2x2 ratings. The agent also
+    provides the cursor position to get_agent_mouse_pos(human=False)
+
+    NB the construction is timed phase by phase (startup, logged as
+    startup_ms, with the allocations too given trace_alloc), and with
+    warm_start (a bundle file location, e.g. wam.startup.WARM_START_LOC) the
+    decoded images/sounds and parsed configuration are cached in a
+    Warm_Start_Bundle, so a relaunch skips the decoding and parsing
     """
-    def __init__(self, file_config_loc=r"config/Default.pkl",
-                  usr_timestamp=False):
+    def __init__(self, file_config_loc=r"config/Default.json",
+                  usr_timestamp=False, headless=False, wam_logger=None,
+                  session_rng=None, warm_start=None, trace_alloc=False,
+                  agent=None):
+        self.startup = Startup_Profiler(trace_alloc)
+        if warm_start:
+            self.bundle = Warm_Start_Bundle(warm_start)
+            self.startup.lap('bundle_load')
+        else:
+            self.bundle = None
+
         # hard coded stuff to integrate properly...
         self.skill_luck_rat = 1.0
         self.skill_ratio_master = [1.0,0.0] # used to be 0.8 vs 0.2
         self.skill_flip_counter = 0
         self.skill_flip_floor = 20 #(used to be 14)
         self.demo_stage = 0
+        self.headless = headless
+        self.game_over = False
+        self.agent = agent
+        self.session_rng = session_rng
+        if session_rng is None:
+            self.rng = np.random
+            sub_rngs = {'scorer': None, 'margin': None, 'hit_checker': None}
+        else:
+            self.rng = session_rng.game
+            sub_rngs = {'scorer': session_rng.scorer,
+                        'margin': session_rng.margin,
+                        'hit_checker': session_rng.hit_checker}
         
         
         # Define file locations
@@ -78,17 +130,7 @@ class GameManager:
         self.mole_img_file_loc = "images/molex1.2.png"
         self.splash_img_file_loc = "images/Splash_Screen.png"
         self.end_img_file_loc = "images/End_Screen.png"
-        self.pts_10 = pygame.image.load("images/10pts.png")
-        self.pts_9 = pygame.image.load("images/9pts.png")
-        self.pts_8 = pygame.image.load("images/8pts.png")
-        self.pts_7 = pygame.image.load("images/7pts.png")
-        self.pts_6 = pygame.image.load("images/6pts.png")
-        self.pts_5 = pygame.image.load("images/5pts.png")
-        self.pts_4 = pygame.image.load("images/4pts.png")
-        self.pts_3 = pygame.image.load("images/3pts.png")
-        self.pts_2 = pygame.image.load("images/2pts.png")
-        self.pts_1 = pygame.image.load("images/2pts.png")
-        self.pts_0 = pygame.image.load("images/0pts.png")
+        self.pts_img_file_pattern = "images/{}pts.png"
 
         try: 
             open('config/UK.txt', 'r')
@@ -97,8 +139,11 @@ class GameManager:
             self.UK = False
 
         self.file_config_loc = file_config_loc
-         
-        master_dict = self.get_config_dict
+        self.startup.lap('setup')
+
+        master_dict = self._warm('config|' + self.file_config_loc,
+                                 [self.file_config_loc],
+                                 lambda: self.get_config_dict)
         self.CONDITION_SET = master_dict['conditions_meta']['cond_set_name']
         import_dict = master_dict['main_game']
 
@@ -153,6 +198,16 @@ class GameManager:
         self.animation_interval = import_dict['animation_interval']
         self.mole_down_interval = import_dict['mole_down_interval']
 
+        # Concurrent moles (more than one runs the mole pool game loop)
+        self.n_moles = import_dict.get('n_moles', 1)
+
+        # Events allowed onto the queue, and the cursor trajectory sample
+        # rate (motion events are logged as one trajectory per mole)
+        self.event_pipeline = Event_Pipeline(
+                                  import_dict.get('allowed_events',
+                                                  DEFAULT_ALLOWED),
+                                  import_dict.get('motion_sample_hz', 30))
+
         # Set game starting paramters
         self.score = 0
         self.score_t0 = 0
@@ -161,65 +216,179 @@ class GameManager:
         self.feedback_count = 0  # iterations since last player feedback
         self.update_count = 0  # iterations since last score update
         self.last_rate = False
-        self.intro_complete = False
+        self.intro_complete = self.headless or agent is not None
+        self.startup.lap('config')
 
         # Initialise the score adjustment functions and data
         self.scorer = Scorer(self.MOLE_RADIUS,
-                             config_dict=master_dict['scorer'])
+                             config_dict=master_dict['scorer'],
+                             rng=sub_rngs['scorer'])
         self.margin = Drifting_Val(self.MARGIN_START,
-                                   config_dict=master_dict['margin_drifter'])
+                                   config_dict=master_dict['margin_drifter'],
+                                   rng=sub_rngs['margin'])
         self.hit_checker = Hit_Checker(self.MOLE_RADIUS,
-                                       config_dict=master_dict['hit_checker'])
+                                       config_dict=master_dict['hit_checker'],
+                                       rng=sub_rngs['hit_checker'])
+        self.startup.lap('scoring')
 
         # Initialise sound effects
-        self.sound_effect = SoundEffect()
+        self.sound_effect = SoundEffect(mute=self.headless,
+                                        bundle=self.bundle)
+        self.startup.lap('sounds')
 
         # Import text information
-        self.intro_txt = open(self.intro_txt_file_loc, 'r').read().split('\n')
-        self.pause_reason_dict = self._get_pause_dict
+        self.intro_txt = self._warm(
+                             'intro|' + self.intro_txt_file_loc,
+                             [self.intro_txt_file_loc],
+                             lambda: open(self.intro_txt_file_loc,
+                                          'r').read().split('\n'))
+        self.pause_reason_dict = self._warm('pause|' +
+                                            self.pause_info_file_loc,
+                                            [self.pause_info_file_loc],
+                                            lambda: self._get_pause_dict)
+        self.startup.lap('text')
 
         # Initialize screen and inputs
         self.GAME_TITLE = 'BDM Whack A Mole'
         self.LEFT_MOUSE_BUTTON = 1
-        self.screen = pygame.display.set_mode((self.SCREEN_WIDTH,
-                                               self.SCREEN_HEIGHT +
-                                               self.COMM_BAR_HEIGHT))
-        pygame.display.set_caption(self.GAME_TITLE)
-        self.background = pygame.image.load(self.screen_img_file_loc)
-        self.splash_page = pygame.image.load(self.splash_img_file_loc)
-        self.end_page = pygame.image.load(self.end_img_file_loc)
-        self.screen.fill([255, 255, 255])
+        self.IDLE_WAIT_MS = 250  # the longest a pause/intro screen sleeps
+        if self.headless:
+            self.screen = None
+            self.background = None
+            self.splash_page = None
+            self.end_page = None
+            self.renderer = None
+            self.assets = None
+            self.score_atlas = None
+        else:
+            self.screen = pygame.display.set_mode((self.SCREEN_WIDTH,
+                                                   self.SCREEN_HEIGHT +
+                                                   self.COMM_BAR_HEIGHT))
+            pygame.display.set_caption(self.GAME_TITLE)
+            self.startup.lap('display')
+
+            # Load all the images (converted to the display format) once
+            self.assets = Asset_Manager(self.bundle)
+            self.background = self.assets.load('background',
+                                               self.screen_img_file_loc)
+            self.splash_page = self.assets.load('splash',
+                                                self.splash_img_file_loc)
+            self.end_page = self.assets.load('end', self.end_img_file_loc)
+            self.score_atlas = Score_Atlas(self.scorer.max_score,
+                                           self.pts_img_file_pattern,
+                                           self.bundle)
+            self.assets.add('score_atlas', self.score_atlas.sheet,
+                            self.pts_img_file_pattern,
+                            self.score_atlas.build_secs)
+            self.assets.load('mole_sheet', self.mole_img_file_loc)
+            self.screen.fill([255, 255, 255])
+            self.renderer = Dirty_Rect_Renderer(self.screen, self.background)
+            self.startup.lap('images')
+
+            # Load the fonts once (sizes used by write_text), the system font
+            # file being looked up once (the font discovery is slow)
+            if self.UK:
+                font_loc = self._warm('font|comicsansms', [],
+                                      lambda: pygame.font.match_font(
+                                                  "comicsansms"))
+                if font_loc is not None and os.path.isfile(font_loc):
+                    self.text_renderer = Text_Renderer(font_loc,
+                                                       sizes=(22,))
+                else:
+                    self.text_renderer = Text_Renderer("comicsansms",
+                                                       sys_font=True,
+                                                       sizes=(22,))
+            else:
+                self.text_renderer = Text_Renderer(
+                                         "fonts/YuseiMagic-Regular.ttf",
+                                         sizes=(22,))
+            self.startup.lap('fonts')
 
         # Create/Import the hole positions in background
-        self.hole_positions = self._get_hole_pos  # for the animation
+        self.hole_positions = self._warm('holes|' + self.hole_pos_file_loc,
+                                         [self.hole_pos_file_loc],
+                                         lambda: self._get_hole_pos)
         self.hole_positions_centre = self._get_hole_cent  # for the hit centre
+        self.hole_index = Hole_Index(self.hole_positions_centre)
+        self.mole_pool = Mole_Pool(len(self.hole_positions), self.n_moles,
+                                   self.post_whack_interval,
+                                   self.mole_pause_interval,
+                                   self.animation_interval)
+        self.pool_rects = [None] * self.mole_pool.capacity
+        self.startup.lap('holes')
 
         # Set up keyboard linkages
         self.event_key_dict = {'49': '1', '50': '2', '51': '3', '52': '4',
                                '53': '5', '54': '6', '55': '7', '56': '8',
                                '57': '9'}
+        # Screen regions to restore from the background on the next frame
+        self.mole_rect = None
+        self.big_score_rect = None
+
+        # Fixed step animation timing (created as play_game starts)
+        self.scheduler = None
+
+        # Monotonic timestamps (ns) of the mole up, each animation frame
+        # shown and the clicks, for the reaction times
+        self.time_ns = time.perf_counter_ns
+        self.mole_up_ns = None
+        self.frame_ns = [None] * 6
+        self.mole_index = 0
+
+        # The agent's planned strikes, (due ns, xy) in order
+        self.agent_strikes = []
+
         # Setup pause conditions
         self.pause_reason = False
         self.pause_list = [False, 'standard', '2x2', 'stage']
 
         # Initialize the mole's sprite sheet (6 different states)
-        sprite_sheet = pygame.image.load(self.mole_img_file_loc)
         self.mole = []
-#        self.mole.append(sprite_sheet.subsurface(1, 0, 90, 81))  # no mole
-        self.mole.append(sprite_sheet.subsurface(203, 0, 108, 99))
-        self.mole.append(sprite_sheet.subsurface(370, 0, 108, 99))
-        self.mole.append(sprite_sheet.subsurface(539, 0, 108, 99))
-        self.mole.append(sprite_sheet.subsurface(686, 0, 140, 99))
-        self.mole.append(sprite_sheet.subsurface(854, 0, 140, 99))
-        self.mole.append(sprite_sheet.subsurface(1020, 0, 140, 99))
+        if not self.headless:
+            sprite_sheet = self.assets.get('mole_sheet')
+#            self.mole.append(sprite_sheet.subsurface(1, 0, 90, 81))  # no mole
+            self.mole.append(sprite_sheet.subsurface(203, 0, 108, 99))
+            self.mole.append(sprite_sheet.subsurface(370, 0, 108, 99))
+            self.mole.append(sprite_sheet.subsurface(539, 0, 108, 99))
+            self.mole.append(sprite_sheet.subsurface(686, 0, 140, 99))
+            self.mole.append(sprite_sheet.subsurface(854, 0, 140, 99))
+            self.mole.append(sprite_sheet.subsurface(1020, 0, 140, 99))
+        self.startup.lap('sprites')
 
         # Sets up logging and log all the initial conditions
-        self.wam_logger = WamLogger(usr_timestamp)
+        if wam_logger is None:
+            self.wam_logger = WamLogger(usr_timestamp, async_log=True,
+                                        event_sink=True,
+                                        trajectory_sink=True)
+        else:
+            self.wam_logger = wam_logger
+        self.event_pipeline.recorder = getattr(self.wam_logger,
+                                               'trajectory_recorder', None)
+        self.startup.lap('logger')
         self.log_init_conditions()
+        self.startup.lap('log_init')
+        if self.bundle is not None:
+            self.bundle.save()
+            self.startup.lap('bundle_save')
+        self.startup.stop()
+        self.wam_logger.log_class_dict('startup_ms', self.startup.summary())
+
+    def _warm(self, name, sources, build):
+        """
+        Gets the named value from the warm start bundle (if any, and its
+        source files are unchanged), else builds it
+        """
+        if self.bundle is None:
+            return build()
+        return self.bundle.fetch(name, sources, build)
 
     @property
     def get_config_dict(self):
-        master_dict = pickle.load(open(self.file_config_loc, 'rb'))
+        """
+        The validated condition set (see wam.condition_set), raising a
+        Condition_Set_Error should it be malformed
+        """
+        master_dict = load_condition_set(self.file_config_loc)
         return master_dict
 
     def log_init_conditions(self):
@@ -232,6 +401,12 @@ class GameManager:
                                        self.hit_checker.__dict__)
         self.wam_logger.log_class_dict('scorer',
                                        self.scorer.__dict__)
+        if self.session_rng is not None:
+            self.wam_logger.log_class_dict('session_rng',
+                                           self.session_rng.seed_dict)
+        if self.assets is not None:
+            self.wam_logger.log_class_dict('asset_load_secs',
+                                           self.assets.load_times)
 
     @property
     def _get_hole_pos(self):
@@ -326,9 +501,10 @@ class GameManager:
         self : self
         '''
         self.screen.blit(self.splash_page, (0, 0))
-        pygame.display.update()
-        while self.intro_complete is False:
-            for event in pygame.event.get():
+        self.renderer.mark_all()
+        self.renderer.update()
+        while self.intro_complete is False and pygame.display.get_init():
+            for event in self._wait_events():
                 if event.type == pygame.QUIT:
                     self.wam_logger.log_end()
                     pygame.quit()
@@ -342,29 +518,30 @@ class GameManager:
                             self.wam_logger.log_end()
           
     def end(self):
+        if self.headless:
+            return
         self.screen.fill([255, 255, 255])
         self.screen.blit(self.end_page, (0, 0))
-        pygame.display.flip()
+        self.renderer.mark_all()
+        self.renderer.update()
 
     def write_text(self, string, colour=(0, 0, 0), background=None, size=22,
                    location_x=None, location_y=None):
         """
-        Writes text to the screen, defaulting to the centre
+        Writes text to the screen, defaulting to the centre (the region is
+        pushed to the display at the next _flip_display)
         """
+        if self.headless:
+            return
         if location_x is None:
             location_x = self.background.get_rect().centerx
         if location_y is None:
             location_y = self.SCREEN_HEIGHT / 2
-        if self.UK:
-            font_obj = pygame.font.SysFont("comicsansms", size)
-        else:
-            font_obj = pygame.font.Font("fonts/YuseiMagic-Regular.ttf", size)
-        text = font_obj.render(string, True, colour, background)
+        text = self.text_renderer.render(string, colour, background, size)
         text_pos = text.get_rect()
         text_pos.centerx = location_x
         text_pos.centery = location_y
-        self.screen.blit(text, text_pos)
-        pygame.display.update()
+        self.renderer.blit(text, text_pos)
 
     def check_key_event(self, event=False):
         """
@@ -378,6 +555,7 @@ class GameManager:
             self.current_event = event
             if self.current_event.type == pygame.QUIT:
                 self.loop = False
+                self._log_frame_timing()
                 self.wam_logger.log_end()
                 pygame.quit()
             if self.current_event.type == pygame.KEYDOWN:
@@ -390,8 +568,17 @@ class GameManager:
                     mods = pygame.key.get_mods()
                     if mods & pygame.KMOD_CTRL:
                         pygame.quit()
+                        self._log_frame_timing()
                         self.wam_logger.log_end()
 
+    def _log_frame_timing(self):
+        """
+        Logs the frame timing (overrun) statistics of the scheduler
+        """
+        if self.scheduler is not None:
+            self.wam_logger.log_class_dict('frame_timing',
+                                           self.scheduler.stats())
+
     def check_events_rate(self, action):  # to be deprecated
         """
         Monitors the game for player feedback provided via keys
@@ -436,18 +623,20 @@ class GameManager:
         else:
             return False
 
-    def two_by_two_rate(self):
+    def two_by_two_rate(self, events=None):
         """
         refactor check mouse event into two, i.e. mole hit check or 2x2
         then take xy coordinates, only unpause if the spot is given in the grid
         cast te confidence etc as part of the hit info into the logger
         """
-        for event in pygame.event.get():
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if (
                 event.type == pygame.MOUSEBUTTONDOWN and
                 event.button == self.LEFT_MOUSE_BUTTON
             ):
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = self._get_click_pos(event)
                 if self.check_rate_in_grid(mouse_pos):
                     self.wam_logger.log_2x2_rate(mouse_pos, self.TWO_X_TWO_LOC,
                                                  self.TWO_X_TWO_LEN)
@@ -457,76 +646,98 @@ class GameManager:
                 
 
     def pause(self):
-        while self.pause_reason:
-            if self.pause_reason in ['standard', 'stage', 'demoGen',
-                                     'demoSkill', 'demoLuck']:
-                if self.pause_reason == 'stage':
-                    if self.mole_count == self.stage_pts[-1]:
-                        self.end()
-                    else:
-                        self.write_text(
-                                self.pause_reason_dict[self.pause_reason],
-                                background=(255,255,255),
-                                location_y=650,#self.SCREEN_HEIGHT + 40,
-                                location_x=1150)#self.SCREEN_HEIGHT + 40)
-                    self.check_key_event()
-                elif self.pause_reason == 'standard':
-                    self.write_text(self.pause_reason_dict[self.pause_reason],
-                                    background=(255,255,255),
-                                    location_y=650,#self.SCREEN_HEIGHT + 40,
-                                    location_x=1150)
-                    self.check_key_event()
-                elif self.pause_reason == 'demoGen':
-                    self.write_text(self.pause_reason_dict[self.pause_reason],
-                                    background=(255,255,255),
-                                    location_y=650,#self.SCREEN_HEIGHT + 40,
-                                    location_x=1150)
-                    self.check_key_event()
-                elif self.pause_reason == 'demoSkill':
-                    self.write_text(self.pause_reason_dict[self.pause_reason],
-                                    background=(255,255,255),
-                                    location_y=650,#self.SCREEN_HEIGHT + 40,
-                                    location_x=1150)
-                    self.check_key_event()
-                elif self.pause_reason == 'demoLuck':
-                    self.write_text(self.pause_reason_dict[self.pause_reason],
-                                    background=(255,255,255),
-                                    location_y=650,#self.SCREEN_HEIGHT + 40,
-                                    location_x=1150)
-                    self.check_key_event()
-            elif self.pause_reason == '2x2':
-                    self.write_text(self.pause_reason_dict[self.pause_reason],
-                                    background=(255,255,255),
-                                    location_y=800,#self.SCREEN_HEIGHT + 40,
-                                    location_x=1350)
-                    self.two_by_two_rate()
-                    self.show_big_score()
-
+        """
+        Holds the game on the pause screen until the pause_reason is resolved
+        (by key or 2x2 rating), drawing the screen once per pause_reason and
+        sleeping in pygame.event.wait between the events (rather than
+        redrawing and polling as fast as possible)
+        """
+        if self.headless:
+            self._resolve_pause()
+            return
+        if self.agent is not None:
+            self._draw_pause()
+            self._flip_display()
+            self._resolve_pause()
+            if not self.game_over:
+                self._draw_background()  # clears the pause text at once
+            if self.scheduler is not None:
+                self.scheduler.start()
+            return
+        pygame.event.set_blocked(pygame.MOUSEMOTION)  # no wake per movement
+        drawn = None
+        while self.pause_reason and pygame.display.get_init():
+            if self.pause_reason != drawn:
+                drawn = self.pause_reason
+                self._draw_pause()
+                self._flip_display()
+            events = self._wait_events()
+            if self.pause_reason == '2x2':
+                self.two_by_two_rate(events)
+            else:
+                for event in events:
+                    self.check_key_event(event)
+        if pygame.display.get_init():
+            self.event_pipeline.install()
+            self._draw_background()  # clears the pause text at once
+        if self.scheduler is not None:
+            self.scheduler.start()  # the pause screen time is not caught up
+
+    def _draw_pause(self):
+        """
+        Draws the pause screen of the current pause_reason
+        """
+        if self.pause_reason == '2x2':
+            self.write_text(self.pause_reason_dict[self.pause_reason],
+                            background=(255, 255, 255),
+                            location_y=800,  # self.SCREEN_HEIGHT + 40,
+                            location_x=1350)
+            self.show_big_score()
+        elif (self.pause_reason == 'stage' and
+                self.mole_count == self.stage_pts[-1]):
+            self.end()
+        elif self.pause_reason in ['standard', 'stage', 'demoGen',
+                                   'demoSkill', 'demoLuck']:
+            self.write_text(self.pause_reason_dict[self.pause_reason],
+                            background=(255, 255, 255),
+                            location_y=650,  # self.SCREEN_HEIGHT + 40,
+                            location_x=1150)
+
+    def _wait_events(self):
+        """
+        Sleeps until an event arrives (or IDLE_WAIT_MS passes), returning it
+        with any others queued, stamped as per _stamp_events
+        """
+        event = pygame.event.wait(self.IDLE_WAIT_MS)
+        events = self._stamp_events()
+        if event.type != pygame.NOEVENT:
+            event.t_ns = events[0].t_ns if events else self.time_ns()
+            events.insert(0, event)
+        return events
+
+    def _resolve_pause(self):
+        """
+        Resolves a pause immediately when running headless or with an agent
+        (there is nobody to press "c"), flagging the game as over at the
+        final stage, with the agent (if any) making the 2x2 rating
+        """
+        if self.pause_reason == '2x2' and hasattr(self.agent, 'rate'):
+            self.two_by_two_rate([pygame.event.Event(
+                                      pygame.MOUSEBUTTONDOWN,
+                                      button=self.LEFT_MOUSE_BUTTON,
+                                      pos=self.agent.rate(self))])
+        if (self.pause_reason == 'stage' and
+                self.mole_count == self.stage_pts[-1]):
+            self.game_over = True
+        self.pause_reason = False
 
     def show_big_score(self):
+        if self.headless:
+            return
         xy = 280,198
-        if self.score_t0 >= 9.5:
-            self.screen.blit(self.pts_10, xy)
-        elif self.score_t0 >= 8.5:
-            self.screen.blit(self.pts_9, xy)
-        elif self.score_t0 >= 7.5:
-            self.screen.blit(self.pts_8, xy)
-        elif self.score_t0 > 6.5:
-            self.screen.blit(self.pts_7, xy)
-        elif self.score_t0 >= 5.5:
-            self.screen.blit(self.pts_6, xy)
-        elif self.score_t0 >= 4.5:
-            self.screen.blit(self.pts_5, xy)
-        elif self.score_t0 >= 3.5:
-            self.screen.blit(self.pts_4, xy)
-        elif self.score_t0 >= 2.5:
-            self.screen.blit(self.pts_3, xy)            
-        elif self.score_t0 >= 1.5:
-            self.screen.blit(self.pts_2, xy)                
-        elif self.score_t0 >= 0.5:
-            self.screen.blit(self.pts_1, xy)                  
-        else :
-            self.screen.blit(self.pts_0, xy)                     
+        self.big_score_rect = self.renderer.blit(
+                                  self.score_atlas.get_frame(self.score_t0),
+                                  xy)
                 
     def set_player_stage(self):
         """
@@ -575,17 +786,11 @@ class GameManager:
             return 1.0
 
     def get_distance(self, xy, frame_num):
-        current_hole_x = self.hole_positions_centre[frame_num][0]
-        current_hole_y = self.hole_positions_centre[frame_num][1]
-        distance = ((xy[0] - current_hole_x)**2 +
-                    (xy[1] - current_hole_y)**2)**0.5
-        
+        distance, _ = self.hole_index.offset(xy, frame_num)
         return distance
 
     def get_relative_loc(self, xy, frame_num):
-        current_hole_x = self.hole_positions_centre[frame_num][0]
-        current_hole_y = self.hole_positions_centre[frame_num][1]
-        relative_loc = (xy[0] - current_hole_x, xy[1] - current_hole_y)
+        _, relative_loc = self.hole_index.offset(xy, frame_num)
         return relative_loc
 
     def check_feedback(self):
@@ -640,19 +845,22 @@ class GameManager:
                    location_x=self.last_rate[0], location_y=self.last_rate[1])
 
     def get_agent_mouse_pos(self, human=True):
-        if human:
-            pygame.mouse.get_pos()
-        else:
-            pass
+        """
+        Gets the cursor position, of the mouse or else of the agent
+        """
+        if human or self.agent is None:
+            return pygame.mouse.get_pos()
+        return self.agent.get_agent_mouse_pos()
 
     def mole_hit(self, ani_num, left, mole_is_down, interval, frame_num):
         ani_num = 3
         left = 14
         mole_is_down = False
         interval = 0
-        self.score_t0, true_score, skill_status = self.scorer.get_score(self.distance,
-                                              self.margin.drift_iter,
-                                              self.skill_luck_rat)
+        self.score_t0, skill_status, true_score = self.scorer.get_score(
+                                                      self.distance,
+                                                      self.margin.drift_iter,
+                                                      self.skill_luck_rat)
         self.sound_effect.stop_pop()
         self.score += self.score_t0
         self.wam_logger.log_score(self.score_t0, self.score, skill_status, true_score)
@@ -662,6 +870,9 @@ class GameManager:
         return ani_num, left, mole_is_down, interval, frame_num
     
     def _displace_mouse(self):
+        if self.headless or self.agent is not None:  # no mouse to move
+            return
+        import pyautogui  # needs a display, so only imported when used
         #xy_shift = [40,30,20,-20,-30,-40]
         #pyautogui.move(random.choice(xy_shift), random.choice(xy_shift))
         mouse_pos = pygame.mouse.get_pos()
@@ -679,10 +890,12 @@ class GameManager:
             event.type == pygame.MOUSEBUTTONDOWN and
             event.button == self.LEFT_MOUSE_BUTTON
         ):
-            self.distance = self.get_distance(pygame.mouse.get_pos(),
-                                              frame_num)
-            self.relative_loc = self.get_relative_loc(pygame.mouse.get_pos(),
-                                                      frame_num)
+            mouse_pos = self._get_click_pos(event)
+            click_ns = self._get_click_ns(event)
+            self.distance, self.relative_loc = self.hole_index.offset(
+                                                   mouse_pos, frame_num)
+            near_hole, near_distance, near_loc = self.hole_index.locate(
+                                                     mouse_pos)
             self.sound_effect.play_fire()
             self.result = self.hit_checker.check_mole_hit(
                                                     ani_num,
@@ -699,55 +912,234 @@ class GameManager:
                                             mole_is_down,
                                             interval,
                                             frame_num)
-                self._displace_mouse()                
-                self.feedback_count += 1
-                self.score_update_check()
-                self.check_feedback()
-                pygame.display.flip()
-                self.skill_flip_counter += 1
-                self.check_condition_change()
+                self._hit_followup()
             else:
                 self.misses += 1
                 #self.mole_count += 1
-                pygame.display.flip()
+                self._flip_display()
 
-            self.wam_logger.log_hit_result(self.result,
-                                           self.hole_positions[frame_num],
-                                           self.distance, self.relative_loc)
+            self._log_strike(frame_num, near_hole, near_distance, near_loc,
+                             self.get_strike_timing(click_ns, self.mole_up_ns,
+                                                    self.frame_ns[2]))
 
             #self.score_update_check()
             self.set_player_stage()
         return ani_num, left, mole_is_down, interval, frame_num
 
+    def _hit_followup(self):
+        """
+        Displaces the mouse, gives any feedback and checks for a condition
+        change following a hit
+        """
+        self._displace_mouse()
+        self.feedback_count += 1
+        self.score_update_check()
+        self.check_feedback()
+        self._flip_display()
+        self.skill_flip_counter += 1
+        self.check_condition_change()
+
+    def _log_strike(self, frame_num, near_hole, near_distance, near_loc,
+                    timing=None):
+        """
+        Logs the strike on the mole in hole frame_num (with its timing), and
+        a near miss should the strike have been nearer to a different hole
+        """
+        self.wam_logger.log_hit_result(self.result,
+                                       self.hole_positions[frame_num],
+                                       self.distance, self.relative_loc,
+                                       timing)
+        if near_hole != frame_num:
+            self.wam_logger.log_near_miss(self.hole_positions[near_hole],
+                                          near_distance, near_loc)
+
+    def check_pool_mouse_event(self, event):
+        """
+        Checks whether a mouse event has resulted in a hit on any of the
+        moles in the pool, striking the mole nearest to the click
+        """
+        if (
+            event.type == pygame.MOUSEBUTTONDOWN and
+            event.button == self.LEFT_MOUSE_BUTTON
+        ):
+            mouse_pos = self._get_click_pos(event)
+            click_ns = self._get_click_ns(event)
+            near_hole, near_distance, near_loc = self.hole_index.locate(
+                                                     mouse_pos)
+            rows = self.mole_pool.active_rows()
+            if len(rows) == 0:
+                return
+            holes = self.mole_pool.hole[rows]
+            gaps = self.hole_index.centres[holes] - np.asarray(mouse_pos)
+            nearest = int(np.argmin(np.hypot(gaps[:, 0], gaps[:, 1])))
+            row, frame_num = rows[nearest], int(holes[nearest])
+            self.distance, self.relative_loc = self.hole_index.offset(
+                                                   mouse_pos, frame_num)
+            self.sound_effect.play_fire()
+            self.result = self.hit_checker.check_mole_hit(
+                                              int(self.mole_pool.ani_num[row]),
+                                              int(self.mole_pool.left[row]),
+                                              self.distance,
+                                              self.margin.drift_iter)
+            if self.result[0]:
+                self.mole_hit(*self._pool_state(row))
+                self.mole_pool.whack(row)
+                self._hit_followup()
+            else:
+                self.misses += 1
+                self._flip_display()
+
+            self._log_strike(frame_num, near_hole, near_distance, near_loc,
+                             self.get_strike_timing(
+                                 click_ns, int(self.mole_pool.up_ns[row])))
+            self.set_player_stage()
+
+    def _pool_state(self, row):
+        """
+        The single mole state tuple (ani_num, left, mole_is_down, interval,
+        frame_num) for a row of the mole pool
+        """
+        return (int(self.mole_pool.ani_num[row]),
+                int(self.mole_pool.left[row]),
+                bool(self.mole_pool.is_down[row]),
+                float(self.mole_pool.interval[row]),
+                int(self.mole_pool.hole[row]))
+
+    def _get_click_pos(self, event):
+        """
+        Gets the xy position of a click, taken from the event itself (rather
+        than the mouse position by the time the event is processed)
+        """
+        return event.pos
+
+    def _log_trajectory(self):
+        """
+        Logs (and clears) the cursor trajectory since the last mole up
+        """
+        samples, n_motion = self.event_pipeline.take_trajectory()
+        self.wam_logger.log_trajectory(samples, n_motion, self.mole_up_ns)
+
+    def _start_trajectory(self, hole):
+        """
+        Starts the full resolution cursor trajectory of the next mole (in
+        the hole), writing out the last mole's epoch
+        """
+        if self.event_pipeline.recorder is not None:
+            self.event_pipeline.recorder.start(self.mole_index, hole,
+                                               self.mole_up_ns)
+        self.mole_index += 1
+
+    def _get_click_ns(self, event):
+        """
+        Gets the timestamp of a click, i.e. when its event was taken from the
+        queue (t_ns, see _stamp_events) or else now
+        """
+        return getattr(event, 't_ns', None) or self.time_ns()
+
+    def _stamp_events(self):
+        """
+        Gets the queued pygame events, stamping each with the (monotonic ns)
+        time they were taken from the queue as t_ns
+        """
+        events = pygame.event.get()
+        now_ns = self.time_ns()
+        for event in events:
+            event.t_ns = now_ns
+        return events
+
+    def get_strike_timing(self, click_ns, mole_up_ns, emerged_ns=None):
+        """
+        The timing of a strike, i.e. the reaction time from the mole up (and
+        from the mole being fully emerged) and the click latency (the time
+        from the click to the strike having been checked), in milliseconds
+        (None where the mole up/emergence was not timed)
+        """
+        def ms_since(start_ns):
+            if start_ns is None or start_ns < 0:
+                return None
+            return (click_ns - start_ns) / 10**6
+        return {'rt_ms': ms_since(mole_up_ns),
+                'emerged_rt_ms': ms_since(emerged_ns),
+                'latency_ms': (self.time_ns() - click_ns) / 10**6}
+
+    def _draw_background(self):
+        """
+        Blits the background to the screen (skipped when headless)
+        """
+        if not self.headless:
+            self.renderer.draw_background()
+            self.mole_rect = None
+            self.big_score_rect = None
+
+    def _flip_display(self):
+        """
+        Pushes the changed screen regions to the display (skipped when
+        headless)
+        """
+        if not self.headless:
+            self.renderer.update()
+
     def check_condition_change(self, demo=False):
-        print('check if conditions change', self.skill_flip_counter)
         if self.skill_flip_counter > self.skill_flip_floor:
             self.wam_logger.log_skill_change(self.skill_luck_rat)
-            if np.random.binomial(1,0.2, 1)[0] == 1:
+            if self.rng.binomial(1,0.2, 1)[0] == 1:
                 self.skill_flip_counter = 0
                 if self.skill_luck_rat == self.skill_ratio_master[0]:
                     #self.skill_luck_rat = 1-self.skill_ratio_master
                     self.skill_luck_rat = self.skill_ratio_master[1]
-                    print('luck!')
                 else:
                     self.skill_luck_rat = self.skill_ratio_master[0]
-                    print('skill!')
 
         if demo:
-            self.skill_luck_rat = random.choice(self.skill_ratio_master)
+            self.skill_luck_rat = float(self.rng.choice(
+                                          self.skill_ratio_master))
             self.wam_logger.log_skill_change(self.skill_luck_rat)
             self.skill_flip_counter = 0
 
     def pop_mole(self, ani_num, mole_is_down, interval, frame_num):
-        self.screen.blit(self.background, (0, 0))
+        self._draw_background()
         self.score_update_check()
         ani_num = 0
         mole_is_down = False
         interval = 0.5
-        frame_num = random.randint(0, 8)
+        frame_num = int(self.rng.choice(len(self.hole_positions)))
+        self._log_trajectory()
+        self.mole_up_ns = self.time_ns()
+        self._start_trajectory(frame_num)
+        self.frame_ns = [None] * 6
         self.wam_logger.log_mole_event(self.hole_positions[frame_num])
+        self.agent_strikes = []  # a strike on a mole gone is not made
+        self._plan_agent_strike(frame_num)
         return ani_num, mole_is_down, interval, frame_num
 
+    def _plan_agent_strike(self, hole):
+        """
+        Plans the agent's (if any) strike on the mole just popped in hole
+        """
+        if self.agent is None:
+            return
+        delay, xy = self.agent.plan_strike(self.hole_positions_centre[hole])
+        self.agent_strikes.append((self.mole_up_ns + round(delay * 10**9),
+                                   xy))
+        self.agent_strikes.sort(key=lambda strike: strike[0])
+
+    def _agent_events(self):
+        """
+        Takes the agent's strikes now due, as left mouse button down events
+        stamped (t_ns) as per _stamp_events
+        """
+        if not self.agent_strikes:
+            return []
+        now_ns = self.time_ns()
+        events = []
+        while self.agent_strikes and self.agent_strikes[0][0] <= now_ns:
+            event = pygame.event.Event(pygame.MOUSEBUTTONDOWN,
+                                       button=self.LEFT_MOUSE_BUTTON,
+                                       pos=self.agent_strikes.pop(0)[1])
+            event.t_ns = now_ns
+            events.append(event)
+        return events
+
     def show_mole_frame(self, ani_num, frame_num, left):
         '''
         Shows the specific mole animation frame at a given hole position
@@ -764,11 +1156,16 @@ class GameManager:
         -------
         tbd : to be reworked
         '''
+        if self.headless:
+            return
         pic = self.mole[ani_num]
-        self.screen.blit(self.background, (0, 0))
-        self.screen.blit(pic,
-                         (self.hole_positions[frame_num][0] - left,
-                          self.hole_positions[frame_num][1]))
+        self.renderer.restore(self.mole_rect)
+        self.renderer.restore(self.big_score_rect)
+        self.big_score_rect = None
+        self.mole_rect = self.renderer.blit(pic,
+                                            (self.hole_positions[frame_num][0]
+                                             - left,
+                                             self.hole_positions[frame_num][1]))
         
 
     def animate_mole(self, ani_num, left, mole_is_down, interval,
@@ -788,6 +1185,8 @@ class GameManager:
         -------
         tbd : to be reworked
         '''
+        if self.frame_ns[ani_num] is None:
+            self.frame_ns[ani_num] = self.time_ns()
         self.show_mole_frame(ani_num, frame_num, left)
         self.score_update_check()
         if mole_is_down is False:
@@ -808,6 +1207,128 @@ class GameManager:
                 interval, frame_num, initial_interval,
                 cycle_time, clock)
 
+    def step_mole(self, steps, ani_num, left, mole_is_down, interval,
+                  frame_num, initial_interval, cycle_steps, clock):
+        '''
+        Runs the scheduler's fixed steps due this frame, animating the mole
+        each time its interval has passed (as play_game and the
+        wam.simulator Simulator share)
+
+        Parameters
+        ----------
+        steps: int
+            the steps due (see Fixed_Step_Scheduler.advance)
+        cycle_steps: int
+            the steps since the mole's last animation step
+        others: as per animate_mole
+
+        Returns
+        -------
+        the updated animation state, as passed (bar steps)
+        '''
+        while steps > 0:
+            # the mole animates on the step taking it past its interval
+            due = max(self.scheduler.interval_steps(interval) + 1 -
+                      cycle_steps, 1)
+            if steps < due:
+                cycle_steps += steps
+                break
+            steps -= due
+            cycle_steps += due
+            cycle_time = cycle_steps * self.scheduler.step_secs
+            (ani_num,
+             left,
+             mole_is_down,
+             interval,
+             frame_num,
+             initial_interval,
+             cycle_time,
+             clock) = self.animate_mole(ani_num,
+                                        left,
+                                        mole_is_down,
+                                        interval,
+                                        frame_num,
+                                        initial_interval,
+                                        cycle_time,
+                                        clock)
+            cycle_steps = 0
+            if ani_num > 5 or ani_num == -1:
+                break  # the next mole pops on the next frame
+        return (ani_num, left, mole_is_down, interval, frame_num,
+                initial_interval, cycle_steps, clock)
+
+    def pop_pool_moles(self):
+        """
+        Pops moles in random empty holes until the pool is full
+        """
+        n_pops = self.mole_pool.capacity - self.mole_pool.n_active
+        if n_pops > 0:
+            holes = self.rng.choice(self.mole_pool.free_holes(), n_pops,
+                                    replace=False)
+            self._log_trajectory()
+            self.mole_up_ns = self.time_ns()
+            self._start_trajectory(holes[0])
+            for hole in holes:
+                self.mole_pool.spawn(hole, self.mole_up_ns)
+                self.wam_logger.log_mole_event(self.hole_positions[hole])
+                self._plan_agent_strike(hole)
+
+    def animate_pool(self, secs):
+        """
+        Steps the animation of all the moles in the pool by the time passed,
+        showing the moles' frames and erasing those that have left
+        """
+        shown, frames, popped, retired = self.mole_pool.step(secs)
+        if len(popped):
+            self.sound_effect.play_pop()
+        if self.headless:
+            return
+        for row, ani_num in zip(shown, frames):
+            if self.mole_pool.hole[row] < 0:
+                continue    # retired this step, so erased below
+            self.renderer.restore(self.pool_rects[row])
+            self.renderer.restore(self.big_score_rect)
+            self.big_score_rect = None
+            hole = self.hole_positions[self.mole_pool.hole[row]]
+            self.pool_rects[row] = self.renderer.blit(
+                                       self.mole[ani_num],
+                                       (hole[0] - self.mole_pool.left[row],
+                                        hole[1]))
+        for row in retired:
+            self.renderer.restore(self.pool_rects[row])
+            self.pool_rects[row] = None
+        if len(shown):
+            self.score_update_check()
+
+    def play_pool_game(self):
+        """
+        Play the whack a mole game with n_moles concurrent moles
+        """
+        loop = True
+        clock = pygame.time.Clock()
+        self.scheduler = Fixed_Step_Scheduler(self.FPS)
+        self.event_pipeline.install()
+        self.create_moles()
+        self._draw_background()
+        while loop and not self.game_over:
+            for event in (self.event_pipeline.filter(self._stamp_events()) +
+                          self._agent_events()):
+                self.wam_logger.log_pygame_event(event)
+                if self.intro_complete is False:
+                    self.intro()
+                    self._draw_background()
+                    self.scheduler.start()
+                if event.type == pygame.QUIT:
+                    loop = False
+                self.check_key_event(event)
+                self.check_pool_mouse_event(event)
+            self.pop_pool_moles()
+            clock.tick(self.FPS)
+            self.animate_pool(self.scheduler.advance() *
+                              self.scheduler.step_secs)
+            self._flip_display()
+        self._end_agent_game()
+
     def create_moles(self):
         """
         Creates a set of moles
@@ -820,8 +1341,11 @@ class GameManager:
         """
         Play the whack a mole game
         """
+        if self.n_moles > 1:
+            return self.play_pool_game()
+
         # Time control variables
-        cycle_time = 0
+        cycle_steps = 0
         ani_num = -1
         loop = True
         mole_is_down = False
@@ -830,15 +1354,20 @@ class GameManager:
         frame_num = 0
         left = 0
         clock = pygame.time.Clock()
+        self.scheduler = Fixed_Step_Scheduler(self.FPS)
+        self.event_pipeline.install()
         self.create_moles()
-        while loop:
+        while loop and not self.game_over:
 
             # log game events, and check whether key or mouse
             # events have occurred (and react appropriately)
-            for event in pygame.event.get():
+            for event in (self.event_pipeline.filter(self._stamp_events()) +
+                          self._agent_events()):
                 self.wam_logger.log_pygame_event(event)
                 if self.intro_complete is False:
                     self.intro()
+                    self._draw_background()
+                    self.scheduler.start()
                 if event.type == pygame.QUIT:
                     loop = False
                 self.check_key_event(event)
@@ -855,7 +1384,7 @@ class GameManager:
 
             # refreshes screen at the point of mole popping
             if ani_num > 5:       # 5
-                self.screen.blit(self.background, (0, 0))
+                self._draw_background()
                 self.score_update_check()
                 ani_num = -1
                 left = 0
@@ -870,25 +1399,34 @@ class GameManager:
                                             interval,
                                             frame_num)
 
-            # drops the mole, if it's time
-            mil = clock.tick(self.FPS)
-            sec = mil / 1000.0
-            cycle_time += sec
-            if cycle_time > interval:
-                (ani_num,
-                 left,
-                 mole_is_down,
-                 interval,
-                 frame_num,
-                 initial_interval,
-                 cycle_time,
-                 clock) = self.animate_mole(ani_num,
-                                            left,
-                                            mole_is_down,
-                                            interval,
-                                            frame_num,
-                                            initial_interval,
-                                            cycle_time,
-                                            clock)
-            # Update the display
-            pygame.display.flip()
+            # drops the mole, if it's time (stepping the animation in fixed
+            # steps, catching up any steps missed by a slow frame)
+            clock.tick(self.FPS)
+            (ani_num,
+             left,
+             mole_is_down,
+             interval,
+             frame_num,
+             initial_interval,
+             cycle_steps,
+             clock) = self.step_mole(self.scheduler.advance(),
+                                     ani_num,
+                                     left,
+                                     mole_is_down,
+                                     interval,
+                                     frame_num,
+                                     initial_interval,
+                                     cycle_steps,
+                                     clock)
+            # Update the (changed regions of the) display
+            self._flip_display()
+        self._end_agent_game()
+
+    def _end_agent_game(self):
+        """
+        Closes the log once an agent has played the final stage (the player
+        instead quits, see check_key_event)
+        """
+        if self.game_over:
+            self._log_frame_timing()
+            self.wam_logger.log_end()
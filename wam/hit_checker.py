@@ -19,8 +19,8 @@ Related projects:
 """
 
 import numpy as np
-from wam.distributions import trunc_norm_sample as _trunc_norm_sample
-import pyautogui
+from wam.distributions import cached_trunc_norm_sample as _trunc_norm_sample
+from wam.distributions import Trunc_Norm_Cache
 
 
 class Hit_Checker:
@@ -44,12 +44,18 @@ class Hit_Checker:
         the lower bound of the truncated luck noise
     luck_high_bnd: float
         the higher bound of the truncated luck noise
+    rng: np.random.Generator
+        the random stream for the luck and binomial draws (defaults to the
+        global numpy random state)
 
     Methods
     -------
     check_mole_hit
         checks whether the mole was hit, returning a 3 boolean tuple, with
         the True Hit, the Margin Hit, and the Binomial Hit results
+    check_mole_hits
+        vectorised check_mole_hit for arrays of strikes on emerged moles,
+        returning the True Hit, Margin Hit and Binomial Hit boolean arrays
     _get_true_hit_res
         checks whether a hit happened in actuality
     _get_marg_hit_res
@@ -60,7 +66,7 @@ class Hit_Checker:
 
     def __init__(self, MOLE_RADIUS, hit_type='Standard', luck_mean=0,
                  luck_sd=0.05, luck_low_bnd=-0.1, luck_high_bnd=0.1,
-                 diff_fact=1, config_dict=None):
+                 diff_fact=1, config_dict=None, rng=None):
         self.MOLE_RADIUS = MOLE_RADIUS
         if type(config_dict) == dict:
             self.hit_type = config_dict['hit_type']
@@ -76,7 +82,12 @@ class Hit_Checker:
             self.luck_low_bnd = luck_low_bnd
             self.luck_high_bnd = luck_high_bnd
             self.diff_fact = diff_fact
-        self._trunc_luck = _trunc_norm_sample
+        if rng is None:
+            self.rng = np.random
+            self._trunc_luck = _trunc_norm_sample
+        else:
+            self.rng = rng
+            self._trunc_luck = Trunc_Norm_Cache(rng)
 
     def check_mole_hit(self, num, left, distance, margin_drift_iter):
         '''
@@ -106,10 +117,10 @@ class Hit_Checker:
             Boolean in a len 1 list, for simpler addition to the results tuple,
             describing the final hit result communicated to the end user
         '''
+        true_hit, margin_hit, binom_hit = False, False, False
         try:
-            assert type(distance) in [float, int]
-            assert type(margin_drift_iter) in [float, int]
-            true_hit, margin_hit, binom_hit = False, False, False
+            assert isinstance(distance, (float, int))
+            assert isinstance(margin_drift_iter, (float, int))
             if (num > 0 and left == 0):
                 true_hit = self._get_true_hit_res(distance)
                 margin_hit = self._get_marg_hit_res(distance,
@@ -126,6 +137,49 @@ class Hit_Checker:
             print('Either distance or margin_drift_iter not a float or int')
         return [true_hit, margin_hit, binom_hit]
 
+    def check_mole_hits(self, distances, margin_drift_iters):
+        '''
+        Checks whether moles were hit for a batch of strikes in one
+        vectorised pass (i.e. for simulation/power analysis), presuming each
+        strike was on a fully emerged mole
+
+        Parameters
+        ----------
+        distances: np.array
+            the distance from the centre of the mole for each strike
+        margin_drift_iters: np.array/float
+            the additional (generous or penalising) margin around the mole
+            for each strike (or one margin for all the strikes)
+
+        Returns
+        -------
+        true_hits: np.array
+            boolean array of the true hit results
+        margin_hits: np.array
+            boolean array of the margin hit results
+        binom_hits: np.array
+            boolean array of the final hit results communicated to the user
+        '''
+        distances = np.asarray(distances, dtype=float)
+        radii = self.MOLE_RADIUS + np.broadcast_to(
+                    np.asarray(margin_drift_iters, dtype=float),
+                    distances.shape)
+        true_hits = distances <= self.MOLE_RADIUS
+        margin_hits = distances < radii
+        if self.hit_type == 'Binomial':
+            dist_ratios = distances / radii
+            hit_probs = 1 / (1 + dist_ratios*self.diff_fact)
+            hit_probs += self._trunc_luck(self.luck_mean, self.luck_sd,
+                                          self.luck_low_bnd,
+                                          self.luck_high_bnd,
+                                          size=distances.shape)
+            hit_probs = np.clip(hit_probs, 0, 1)
+            binom_hits = (margin_hits &
+                          (self.rng.binomial(1, hit_probs) > 0))
+        else:
+            binom_hits = margin_hits.copy()
+        return true_hits, margin_hits, binom_hits
+
     def _get_true_hit_res(self, distance):
         '''
         Assesses whether a mole hit happened based only on the mole radius and
@@ -205,7 +259,7 @@ class Hit_Checker:
                                          self.luck_low_bnd, self.luck_high_bnd)
             hit_prob = max(hit_prob, 0)
             hit_prob = min(hit_prob, 1)
-            if (np.random.binomial(1, hit_prob, 1)[0]) > 0:
+            if (self.rng.binomial(1, hit_prob, 1)[0]) > 0:
                 binom_hit = True
             else:
                 binom_hit = False
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+hole_index module
+============
+
+This module contains the Hole_Index class for the pygame Whack a Mole game,
+a precomputed spatial index of the hole centres which resolves a click to
+its nearest hole, distance and relative offset in one call (so clicks can be
+checked against any hole, not just the popped mole's)
+
+The screen is split into a uniform grid, and each cell stores the holes that
+can be nearest to some point in the cell, so a lookup only measures the
+distance to a handful of candidate holes (clicks off the grid measure them
+all)
+
+Attributes:
+    handled within the Hole_Index class
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import numpy as np
+
+
+class Hole_Index:
+    """
+    Spatial index of the hole centres
+
+    Attributes
+    ----------
+    centres: np.array
+        the (n, 2) hole centres
+    cell_size: float
+        the width/height of the grid cells
+    origin: np.array
+        the top left of the grid
+    grid_shape: tuple
+        the number of grid (columns, rows)
+    candidates: list
+        the candidate hole numbers (np.array) for each cell, indexed
+        column * rows + row
+
+    Methods
+    -------
+    locate(xy)
+        the nearest hole, distance and relative offset of a point
+    locate_many(xys)
+        the nearest holes, distances and relative offsets of many points
+    offset(xy, hole)
+        the distance and relative offset of a point from a given hole
+    """
+    def __init__(self, centres, cell_size=32.0, margin=None):
+        self.centres = np.asarray(centres, dtype=float).reshape(-1, 2)
+        self.cell_size = float(cell_size)
+        if margin is None:
+            margin = 2 * self.cell_size
+        lower = self.centres.min(axis=0) - margin
+        upper = self.centres.max(axis=0) + margin
+        self.origin = lower
+        self.grid_shape = tuple(np.ceil((upper - lower) /
+                                        self.cell_size).astype(int))
+        self.candidates = self._build_candidates()
+
+    def _build_candidates(self):
+        '''
+        Finds the holes that can be nearest to some point in each cell, i.e.
+        those whose closest possible distance to the cell is within the
+        smallest farthest possible distance of any hole
+        '''
+        cols, rows = self.grid_shape
+        col_idx, row_idx = np.meshgrid(np.arange(cols), np.arange(rows),
+                                       indexing='ij')
+        cell_min = (self.origin +
+                    np.stack([col_idx.ravel(), row_idx.ravel()], axis=1) *
+                    self.cell_size)
+        cell_max = cell_min + self.cell_size
+        centres = self.centres[np.newaxis, :, :]
+        nearest_gap = np.maximum(np.maximum(cell_min[:, np.newaxis, :] -
+                                            centres,
+                                            centres -
+                                            cell_max[:, np.newaxis, :]), 0)
+        farthest_gap = np.maximum(np.abs(cell_min[:, np.newaxis, :] -
+                                         centres),
+                                  np.abs(cell_max[:, np.newaxis, :] -
+                                         centres))
+        lower_bound = np.hypot(nearest_gap[..., 0], nearest_gap[..., 1])
+        upper_bound = np.hypot(farthest_gap[..., 0], farthest_gap[..., 1])
+        in_range = lower_bound <= upper_bound.min(axis=1)[:, np.newaxis]
+        return [np.flatnonzero(cell) for cell in in_range]
+
+    def _cell_candidates(self, xy):
+        col, row = ((np.asarray(xy, dtype=float) - self.origin) //
+                    self.cell_size).astype(int)
+        if 0 <= col < self.grid_shape[0] and 0 <= row < self.grid_shape[1]:
+            return self.candidates[col * self.grid_shape[1] + row]
+        return None
+
+    def locate(self, xy):
+        '''
+        Resolves a point to its nearest hole
+
+        Parameters
+        ----------
+        xy: tuple
+            the point (e.g. the click position)
+
+        Returns
+        -------
+        hole: int
+            the nearest hole number (the index of hole_positions)
+        distance: float
+            the distance from the hole centre
+        relative_loc: tuple
+            the (x, y) offset from the hole centre
+        '''
+        candidates = self._cell_candidates(xy)
+        if candidates is None:
+            candidates = np.arange(len(self.centres))
+        offsets = np.asarray(xy, dtype=float) - self.centres[candidates]
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        nearest = distances.argmin()
+        return (int(candidates[nearest]), float(distances[nearest]),
+                tuple(offsets[nearest].tolist()))
+
+    def locate_many(self, xys):
+        '''
+        Resolves many points to their nearest holes (vectorised over all the
+        holes)
+
+        Parameters
+        ----------
+        xys: np.array
+            the (m, 2) points
+
+        Returns
+        -------
+        holes: np.array
+            the nearest hole number of each point
+        distances: np.array
+            the distance of each point from its nearest hole centre
+        relative_locs: np.array
+            the (m, 2) offsets of each point from its nearest hole centre
+        '''
+        xys = np.asarray(xys, dtype=float).reshape(-1, 2)
+        offsets = xys[:, np.newaxis, :] - self.centres[np.newaxis, :, :]
+        distances = np.hypot(offsets[..., 0], offsets[..., 1])
+        holes = distances.argmin(axis=1)
+        rows = np.arange(len(xys))
+        return holes, distances[rows, holes], offsets[rows, holes]
+
+    def offset(self, xy, hole):
+        '''
+        Measures a point from a given hole centre
+
+        Parameters
+        ----------
+        xy: tuple
+            the point (e.g. the click position)
+        hole: int
+            the hole number
+
+        Returns
+        -------
+        distance: float
+            the distance from the hole centre
+        relative_loc: tuple
+            the (x, y) offset from the hole centre
+        '''
+        x_off = xy[0] - self.centres[hole, 0]
+        y_off = xy[1] - self.centres[hole, 1]
+        return float(np.hypot(x_off, y_off)), (float(x_off), float(y_off))
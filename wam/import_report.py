@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+import_report module
+============
+
+This module contains the start up import report for the pygame Whack a Mole
+game, which imports each target module in a fresh interpreter under
+python -X importtime, reporting its total import time, the slowest imports
+and whether any of the heavy dependencies (scipy, pygame, pyautogui) were
+pulled in, so the lazy imports of the Qt wizard and the headless/analysis
+paths stay lazy
+
+Usage (from the repository root):
+    python -m wam.import_report [module ...] [--top N] [--check]
+
+with --check exiting 1 should a target import a heavy dependency (or fail to
+import at all, as it then goes unchecked)
+
+Attributes:
+    HEAVY: tuple
+        the top level packages deferred until they are needed
+    DEFAULT_TARGETS: tuple
+        the modules expected to import without the HEAVY packages
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+HEAVY = ('scipy', 'pygame', 'pyautogui')
+
+DEFAULT_TARGETS = ('QT',
+                   'wam.distributions',
+                   'wam.scorer',
+                   'wam.hit_checker',
+                   'wam.drifter',
+                   'wam.logger',
+                   'wam.event_log',
+                   'wam.trajectory')
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(text):
+    '''
+    Parses the -X importtime output
+
+    Parameters
+    ----------
+    text: string
+        the stderr of python -X importtime
+
+    Returns
+    -------
+    imports: list
+        (module, self_us, cumulative_us) in the order reported (i.e. each
+        module after the modules it imported)
+    '''
+    imports = []
+    for line in text.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        imports.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return imports
+
+
+def heavy_imports(imports, heavy=HEAVY):
+    '''
+    The heavy top level packages among the imports
+
+    Parameters
+    ----------
+    imports: list
+        (module, self_us, cumulative_us), as per parse_importtime
+    heavy: tuple
+        the top level packages to look for
+
+    Returns
+    -------
+    found: list
+        the heavy packages imported (in the order of heavy)
+    '''
+    top_level = {module.split('.')[0] for module, _, _ in imports}
+    return [package for package in heavy if package in top_level]
+
+
+def import_times(module, python=sys.executable, cwd=REPO_ROOT):
+    '''
+    Imports a module in a fresh interpreter under -X importtime
+
+    Parameters
+    ----------
+    module: string
+        the module to import
+    python: string (file location)
+        the interpreter
+    cwd: string (folder location)
+        the folder to import from (the repository root)
+
+    Returns
+    -------
+    imports: list
+        (module, self_us, cumulative_us), as per parse_importtime
+    error: string/None
+        the last line of the error should the import fail
+    '''
+    result = subprocess.run([python, '-X', 'importtime', '-c',
+                             'import ' + module],
+                            cwd=cwd, capture_output=True, text=True)
+    error = None
+    if result.returncode != 0:
+        lines = [line for line in result.stderr.splitlines() if
+                 line and not line.startswith('import time:')]
+        error = lines[-1] if lines else 'exit code ' + str(result.returncode)
+    return parse_importtime(result.stderr), error
+
+
+def report(module, top=5, heavy=HEAVY):
+    '''
+    Reports the import of a module
+
+    Parameters
+    ----------
+    module: string
+        the module to import
+    top: int
+        the number of the slowest (self time) imports to list
+    heavy: tuple
+        the heavy top level packages to flag
+
+    Returns
+    -------
+    text: string
+        the report
+    found: list
+        the heavy packages imported
+    error: string/None
+        the last line of the error should the import fail
+    '''
+    imports, error = import_times(module)
+    total_us = max([cumulative for _, _, cumulative in imports], default=0)
+    found = heavy_imports(imports, heavy)
+    lines = [module + ': ' + format(total_us / 1000, '.1f') + ' ms, ' +
+             str(len(imports)) + ' modules, heavy: ' +
+             (', '.join(found) if found else 'none')]
+    if error is not None:
+        lines.append('    import failed: ' + error)
+    for name, self_us, _ in sorted(imports, key=lambda x: -x[1])[:top]:
+        lines.append('    ' + format(self_us / 1000, '8.1f') + ' ms  ' + name)
+    return '\n'.join(lines), found, error
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Start up import report')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_TARGETS)
+    parser.add_argument('--top', type=int, default=5,
+                        help='the number of the slowest imports to list')
+    parser.add_argument('--check', action='store_true',
+                        help='exit 1 should a module import a heavy package '
+                             '(or fail to import)')
+    args = parser.parse_args(argv)
+    failed = []
+    for module in args.modules:
+        text, found, error = report(module, args.top)
+        print(text)
+        if found or error is not None:
+            failed.append(module)
+    if args.check and failed:
+        print('Heavy or failed imports in: ' + ', '.join(failed))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,6 +11,23 @@ Attributes:
 Todo:
     * sort docstrings (e.g. class)
 
+NB with async_log the records are handed to a queue on the game (render)
+thread and written to file by a QueueListener thread, so disk stalls do not
+drop frames. Should the queue fill, the records are dropped (and counted,
+the count being logged by log_end) rather than stall the game. log_end stops
+the listener, which drains the queue first
+
+NB with event_sink the hit, score, mole, rating, pause and skill/luck events
+are also written as typed binary records (see the event_log module) to
+WAM_Events_<usr_timestamp>.bin, for bulk loading in analysis
+
+NB with trajectory_sink the full cursor path of each mole epoch is written as
+a binary block (see the trajectory module) to
+WAM_Trajectories_<usr_timestamp>.bin
+
+NB both sinks are off by default (so other callers, e.g. the tests, write
+only the .log files), the GameManager turning them on for the sessions
+
 Related projects:
     Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
     which is under MIT license
@@ -18,10 +35,15 @@ Related projects:
 @author: DZLR3
 """
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from time import time
-import pygame
 import csv
+import numpy as np
+from wam.event_log import Event_Sink, EVENT_CODES
+from wam.trajectory import Trajectory_Recorder
 
 
 class WamLogger:
@@ -30,7 +52,17 @@ class WamLogger:
 
     Attributes
     ----------
-    na
+    async_log: Bool
+        whether the file writes are handed off to a background thread
+    queue_size: int
+        the maximum number of records waiting to be written (async_log only),
+        beyond which the records are dropped rather than wait on the writer
+    dropped: int
+        the records dropped as the queue was full (async_log only)
+    event_sink: Event_Sink/None
+        the binary event record writer (None if not enabled)
+    trajectory_recorder: Trajectory_Recorder/None
+        the binary cursor trajectory writer (None if not enabled)
 
     Methods
     -------
@@ -45,7 +77,12 @@ class WamLogger:
         closes down the log
     """
     def __init__(self, usr_timestamp=False,
-                 log_file_root='../bdm-whack-a-mole/logs/'):
+                 log_file_root='../bdm-whack-a-mole/logs/',
+                 async_log=False, queue_size=10000, event_sink=False,
+                 trajectory_sink=False):
+        self.async_log = async_log
+        self.queue_size = queue_size
+        self.listener = None
         if usr_timestamp is False:
             self.usr_timestamp = str(time())
         else:
@@ -54,6 +91,18 @@ class WamLogger:
         self.log_file_root = log_file_root
         if not len(self.logger.handlers):
             self.create_log_instance()
+        if event_sink:
+            self.event_sink = Event_Sink(self.log_file_root + 'WAM_Events_' +
+                                         self.usr_timestamp + '.bin')
+        else:
+            self.event_sink = None
+        if trajectory_sink:
+            self.trajectory_recorder = Trajectory_Recorder(
+                                           self.log_file_root +
+                                           'WAM_Trajectories_' +
+                                           self.usr_timestamp + '.bin')
+        else:
+            self.trajectory_recorder = None
 
     def create_log_instance(self):
         '''
@@ -88,9 +137,42 @@ class WamLogger:
         self.fh.setFormatter(self.formatter)
         self.ch.setFormatter(self.formatter)
 
-        # add the handlers to the logger
-        self.logger.addHandler(self.fh)
-        self.logger.addHandler(self.ch)
+        # add the handlers to the logger (via the queue if async)
+        if self.async_log:
+            self.log_queue = queue.Queue(self.queue_size)
+            self.qh = _Dropping_Queue_Handler(self.log_queue)
+            self.listener = _Draining_Queue_Listener(
+                                self.log_queue, self.fh, self.ch,
+                                respect_handler_level=True)
+            self.listener.start()
+            atexit.register(self.stop_listener)
+            self.logger.addHandler(self.qh)
+        else:
+            self.logger.addHandler(self.fh)
+            self.logger.addHandler(self.ch)
+
+    def stop_listener(self):
+        '''
+        Stops the background writer (if async), once every queued record has
+        been written, any later records being written directly
+
+        Parameters
+        ----------
+        self : self
+        '''
+        if self.listener is not None:
+            atexit.unregister(self.stop_listener)
+            self.listener.stop()
+            self.listener = None
+            self.logger.removeHandler(self.qh)
+            self.logger.addHandler(self.fh)
+            self.logger.addHandler(self.ch)
+
+    @property
+    def dropped(self):
+        if self.async_log and hasattr(self, 'qh'):
+            return self.qh.dropped
+        return 0
 
     def log_class_dict(self, class_name, class_dict):
         '''
@@ -138,6 +220,7 @@ class WamLogger:
             except:
                 self.logger.info('Event Logging Failure')
         else:
+            import pygame  # only needed when pulling the events itself
             try:
                 self.logger.info(pygame.event.get())
             except:
@@ -177,6 +260,8 @@ class WamLogger:
         '''
         x = (mouse_pos[0] - TWO_X_TWO_LOC[0]) / TWO_X_TWO_LEN
         y = (mouse_pos[1] - TWO_X_TWO_LOC[1]) / TWO_X_TWO_LEN
+        if self.event_sink is not None:
+            self.event_sink.write(EVENT_CODES['rate'], rate_x=x, rate_y=y)
         self._log_it("<Event(7-Rate {'" +
                      x_dim + "': " + str(x) + ", '" +
                      y_dim + "': " + str(y) + "})>")
@@ -202,6 +287,10 @@ class WamLogger:
                      "'skill/luck':" + str(skill_status) + "," +
                      "'true_score':" + str(true_score) + "})>")
         self._log_it("<Event(11-Score {" + score_str)
+        if self.event_sink is not None:
+            self.event_sink.write(EVENT_CODES['score'], score_inc=score_inc,
+                                  score=score, skill=int(skill_status),
+                                  true_score=true_score)
 
     def log_skill_change(self, skill_luck_ratio):
         '''
@@ -220,6 +309,9 @@ class WamLogger:
             logs the event via _log_it
         '''
         self._log_it("<Event(12-Skill_Luck_Ratio {'New': " + str(skill_luck_ratio) + " })>")
+        if self.event_sink is not None:
+            self.event_sink.write(EVENT_CODES['skill_luck_ratio'],
+                                  skill_luck_rat=skill_luck_ratio)
 
 
     def log_pause(self, pause_reason):
@@ -237,6 +329,8 @@ class WamLogger:
             logs the event via _log_it
         '''
         self._log_it("<Event(8-Pause {'reason': " + str(pause_reason) + " })>")
+        if self.event_sink is not None:
+            self.event_sink.write(EVENT_CODES['pause'])
 
     def log_event_rate(self, action, event_act):
         '''
@@ -282,8 +376,12 @@ class WamLogger:
                       str(xy[0]) + "," + str(xy[1]) +
                       ")})>")
         self._log_it("<Event(10-MoleUp) " + log_string)
+        if self.event_sink is not None:
+            self.event_sink.write(EVENT_CODES['mole_up'],
+                                  mole_x=xy[0], mole_y=xy[1])
 
-    def log_hit_result(self, result, xy, distance, relative_loc):
+    def log_hit_result(self, result, xy, distance, relative_loc,
+                       timing=None):
         '''
         Logs the hit result for a given attempt
 
@@ -297,6 +395,9 @@ class WamLogger:
             The distance from the centre of the mole
         relative_loc: 2 int tuple
             The relative location from mole centre for the strike
+        timing: dict/None
+            The strike's rt_ms (from the mole up), emerged_rt_ms (from the
+            mole fully emerging) and latency_ms (click to hit check)
 
         Raises
         ------
@@ -317,8 +418,91 @@ class WamLogger:
                       str(xy[1]) + "), " +
                       "'distance': " + str(distance) + ", " +
                       "'relative_loc': " + str(relative_loc) + ", " +
-                      "'window': None})>")
-        self._log_it("<Event(9-Hit Attempt " + log_string)
+                      "'window': None")
+        if timing is None:
+            timing = {}
+        for key, value in timing.items():
+            log_string += ", '" + key + "': " + str(value)
+        self._log_it("<Event(9-Hit Attempt " + log_string + "})>")
+        if self.event_sink is not None:
+            self.event_sink.write(EVENT_CODES['hit_attempt'],
+                                  mole_x=xy[0], mole_y=xy[1],
+                                  distance=distance,
+                                  rel_x=relative_loc[0],
+                                  rel_y=relative_loc[1],
+                                  true_hit=result[0],
+                                  margin_hit=result[1],
+                                  hit=result[2],
+                                  **timing)
+
+    def log_near_miss(self, xy, distance, relative_loc):
+        '''
+        Logs a strike nearer to a different hole than the popped mole's
+
+        Parameters
+        ----------
+        xy: tuple
+            The x and y coordinates of the nearest hole
+        distance: float
+            The distance from the centre of the nearest hole
+        relative_loc: 2 float tuple
+            The relative location from the nearest hole centre for the strike
+
+        Returns
+        -------
+        na - logs the event via _log_it
+        '''
+        log_string = ("{'pos': (" +
+                      str(xy[0]) + ", " +
+                      str(xy[1]) + "), " +
+                      "'distance': " + str(distance) + ", " +
+                      "'relative_loc': " + str(relative_loc) + "})>")
+        self._log_it("<Event(13-Near Miss " + log_string)
+        if self.event_sink is not None:
+            self.event_sink.write(EVENT_CODES['near_miss'],
+                                  mole_x=xy[0], mole_y=xy[1],
+                                  distance=distance,
+                                  rel_x=relative_loc[0],
+                                  rel_y=relative_loc[1])
+
+    def log_trajectory(self, samples, n_motion, origin_ns=None):
+        '''
+        Logs the summarised cursor trajectory for a mole (rather than each
+        motion event)
+
+        Parameters
+        ----------
+        samples: np.array
+            the (n, 3) t_ns, x, y trajectory samples
+        n_motion: int
+            the number of motion events the samples were coalesced from
+        origin_ns: int/None
+            the time the sample times are relative to (e.g. the mole up),
+            else the first sample
+
+        Returns
+        -------
+        na - logs the event via _log_it
+        '''
+        if len(samples) == 0:
+            return
+        if origin_ns is None:
+            origin_ns = samples[0, 0]
+        t_ms = np.round((samples[:, 0] - origin_ns) / 10**6).astype(int)
+        steps = np.diff(samples[:, 1:], axis=0)
+        points = list(zip(t_ms.tolist(),
+                          samples[:, 1].astype(int).tolist(),
+                          samples[:, 2].astype(int).tolist()))
+        log_string = ("{'n_motion': " + str(n_motion) + ", " +
+                      "'n': " + str(len(samples)) + ", " +
+                      "'duration_ms': " + str(int(t_ms[-1] - t_ms[0])) +
+                      ", " +
+                      "'path_px': " +
+                      str(round(float(np.hypot(steps[:, 0],
+                                               steps[:, 1]).sum()), 1)) +
+                      ", " +
+                      "'points': " + str(points) + "})>")
+        self._log_it("<Event(14-Trajectory " + log_string)
 
     def log_end(self):
         '''
@@ -332,7 +516,113 @@ class WamLogger:
         -------
         na - ends log
         '''
+        self.stop_listener()
+        if self.dropped:
+            self.logger.warning('Log queue full, ' + str(self.dropped) +
+                                ' records dropped')
         self.logger.info('******* HAPPY ANALYSING...LOG COMPLETE!!! *******')
+        if self.event_sink is not None:
+            self.event_sink.close()
+        if self.trajectory_recorder is not None:
+            self.trajectory_recorder.close()
         logging.shutdown()
         self.fh.close()
         self.ch.close()
+
+
+class _Dropping_Queue_Handler(QueueHandler):
+    """
+    QueueHandler that hands the record over as is (formatting is left to the
+    writer thread) and drops (and counts) the record should the queue be
+    full, so the game thread never waits on the writer
+    """
+    def __init__(self, log_queue):
+        QueueHandler.__init__(self, log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Draining_Queue_Listener(QueueListener):
+    """
+    QueueListener whose stop waits for space for its sentinel (i.e. for the
+    writer to catch up) should the queue be full, rather than raise
+    """
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class SimLogger(WamLogger):
+    """
+    Drop-in replacement for the WamLogger used by headless simulation, which
+    keeps the hit, score and mole events in memory rather than writing the
+    .log files
+
+    Attributes
+    ----------
+    mole_ups: int
+        the number of moles that have emerged
+    hits: list
+        (result, distance, relative_loc) tuple for each strike
+    scores: list
+        (score_inc, score, skill_status, true_score) tuple for each hit
+    ratings: list
+        (x, y) tuple for each 2x2 rating
+    near_misses: list
+        (xy, distance, relative_loc) tuple for each strike nearer to another
+        hole
+    timings: list
+        the timing dict (rt_ms, emerged_rt_ms, latency_ms) for each strike
+
+    Methods
+    -------
+    log_***(event)
+        records the game events in memory (or ignores them)
+    """
+    def __init__(self, usr_timestamp='sim'):
+        self.usr_timestamp = usr_timestamp
+        self.event_sink = None
+        self.trajectory_recorder = None
+        self.mole_ups = 0
+        self.hits = []
+        self.scores = []
+        self.ratings = []
+        self.near_misses = []
+        self.timings = []
+
+    def _log_it(self, event=False):
+        pass
+
+    def log_class_dict(self, class_name, class_dict):
+        pass
+
+    def log_mole_event(self, xy):
+        self.mole_ups += 1
+
+    def log_hit_result(self, result, xy, distance, relative_loc,
+                       timing=None):
+        self.hits.append((result, distance, relative_loc))
+        self.timings.append(timing)
+
+    def log_near_miss(self, xy, distance, relative_loc):
+        self.near_misses.append((xy, distance, relative_loc))
+
+    def log_score(self, score_inc, score, skill_status, true_score):
+        self.scores.append((score_inc, score, skill_status, true_score))
+
+    def log_2x2_rate(self, mouse_pos, TWO_X_TWO_LOC, TWO_X_TWO_LEN,
+                     x_dim='skill_vs_luck_rating',
+                     y_dim='hit_confidence'):
+        x = (mouse_pos[0] - TWO_X_TWO_LOC[0]) / TWO_X_TWO_LEN
+        y = (mouse_pos[1] - TWO_X_TWO_LOC[1]) / TWO_X_TWO_LEN
+        self.ratings.append((x, y))
+
+    def log_end(self):
+        pass
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+mole_pool module
+============
+
+This module contains the Mole_Pool class for the pygame Whack a Mole game,
+which holds the state of several concurrent moles in arrays (one row per
+mole: hole, animation frame, direction, offset, interval and timer) and
+advances all of them in one vectorised step per tick, following the same
+pop/pause/drop/whack sequence as GameManager.animate_mole
+
+Attributes:
+    handled within the Mole_Pool class
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import numpy as np
+
+
+class Mole_Pool:
+    """
+    Array backed state of up to capacity concurrent moles
+
+    The ani_num of each row follows the single mole game loop, i.e. it is the
+    next animation frame to show, a whack sets it to 3 (the whacked frames are
+    3 to 5) and the mole leaves the pool once it is back below 0 (dropped) or
+    above 5 (whacked)
+
+    Attributes
+    ----------
+    n_holes: int
+        the number of holes
+    capacity: int
+        the maximum number of concurrent moles
+    hole: np.array
+        the hole of each row (-1 for a free row)
+    ani_num: np.array
+        the animation frame number of each row
+    is_down: np.array
+        whether each mole is dropping
+    left: np.array
+        the x offset of each row's sprite (14 once whacked)
+    interval: np.array
+        the seconds until each mole's next animation step
+    timer: np.array
+        the seconds since each mole's last animation step was due
+    up_ns: np.array
+        the (monotonic ns) time each mole popped up (-1 if untimed)
+    hole_rows: np.array
+        the row of the mole in each hole (-1 for an empty hole)
+
+    Methods
+    -------
+    spawn(holes, t_ns)
+        pops moles in the holes
+    whack(row)
+        starts the whacked animation of the mole
+    step(secs)
+        advances all the moles by the time passed
+    free_holes()
+        the holes without a mole
+    active_rows()
+        the rows with a mole
+    """
+    def __init__(self, n_holes, capacity=1, post_whack_interval=0.2,
+                 mole_pause_interval=0.25, animation_interval=0.1,
+                 pop_interval=0.5):
+        self.n_holes = n_holes
+        self.capacity = min(capacity, n_holes)
+        self.post_whack_interval = post_whack_interval
+        self.mole_pause_interval = mole_pause_interval
+        self.animation_interval = animation_interval
+        self.pop_interval = pop_interval
+        self.hole = np.full(self.capacity, -1, dtype=np.int16)
+        self.ani_num = np.full(self.capacity, -1, dtype=np.int8)
+        self.is_down = np.zeros(self.capacity, dtype=bool)
+        self.left = np.zeros(self.capacity, dtype=np.int16)
+        self.interval = np.zeros(self.capacity)
+        self.timer = np.zeros(self.capacity)
+        self.up_ns = np.full(self.capacity, -1, dtype=np.int64)
+        self.hole_rows = np.full(n_holes, -1, dtype=np.int16)
+
+    @property
+    def n_active(self):
+        return int(np.count_nonzero(self.hole >= 0))
+
+    def active_rows(self):
+        return np.flatnonzero(self.hole >= 0)
+
+    def free_holes(self):
+        return np.flatnonzero(self.hole_rows < 0)
+
+    def spawn(self, holes, t_ns=-1):
+        '''
+        Pops moles in the (empty, distinct) holes, up to the free capacity
+
+        Parameters
+        ----------
+        holes: int/array like
+            the hole numbers
+        t_ns: int
+            the (monotonic ns) time of the pop, for the reaction times
+
+        Returns
+        -------
+        rows: np.array
+            the rows of the new moles
+        '''
+        holes = np.atleast_1d(holes)
+        holes = holes[np.sort(np.unique(holes, return_index=True)[1])]
+        holes = holes[self.hole_rows[holes] < 0]
+        rows = np.flatnonzero(self.hole < 0)[:len(holes)]
+        holes = holes[:len(rows)]
+        self.hole[rows] = holes
+        self.ani_num[rows] = 0
+        self.is_down[rows] = False
+        self.left[rows] = 0
+        self.interval[rows] = self.pop_interval
+        self.timer[rows] = 0.0
+        self.up_ns[rows] = t_ns
+        self.hole_rows[holes] = rows
+        return rows
+
+    def whack(self, row):
+        '''
+        Starts the whacked animation of the mole (as per GameManager.mole_hit)
+
+        Parameters
+        ----------
+        row: int
+            the row of the mole
+        '''
+        self.ani_num[row] = 3
+        self.left[row] = 14
+        self.is_down[row] = False
+        self.interval[row] = 0.0
+
+    def step(self, secs):
+        '''
+        Advances all the moles by the time passed, stepping the animation of
+        each mole as many times as its intervals have elapsed (carrying the
+        time past each interval, so a long step shows the same frames as many
+        short ones)
+
+        Parameters
+        ----------
+        secs: float
+            the seconds since the last step
+
+        Returns
+        -------
+        shown: np.array
+            the rows whose animation stepped (once per step, in step order)
+        frames: np.array
+            the animation frame to show for each of the shown rows
+        popped: np.array
+            the rows that have just fully emerged (i.e. pausing at the top)
+        retired: np.array
+            the rows whose mole has left the pool (dropped or whacked)
+        '''
+        active = self.hole >= 0
+        self.timer[active] += secs
+        shown = [np.empty(0, dtype=np.intp)]
+        frames = [np.empty(0, dtype=self.ani_num.dtype)]
+        popped = [np.empty(0, dtype=np.intp)]
+        retired = [np.empty(0, dtype=np.intp)]
+        due = active & (self.timer > self.interval)
+        while due.any():
+            shown.append(np.flatnonzero(due))
+            frames.append(self.ani_num[due].copy())
+            self.timer[due] -= self.interval[due]
+
+            self.ani_num[due] += np.where(self.is_down[due], -1,
+                                          1).astype(np.int8)
+            top = due & (self.ani_num == 3)
+            self.ani_num[top] = 2
+            self.is_down[top] = True
+            self.interval[due] = self.animation_interval
+            self.interval[due & (self.ani_num == 4)] = self.post_whack_interval
+            self.interval[top] = self.mole_pause_interval
+            popped.append(np.flatnonzero(top))
+
+            gone = due & ((self.ani_num < 0) | (self.ani_num > 5))
+            retired.append(np.flatnonzero(gone))
+            self.hole_rows[self.hole[gone]] = -1
+            self.hole[gone] = -1
+            self.ani_num[gone] = -1
+            self.left[gone] = 0
+            due = (self.hole >= 0) & (self.timer > self.interval)
+        return (np.concatenate(shown), np.concatenate(frames),
+                np.concatenate(popped), np.concatenate(retired))
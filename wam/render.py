@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+render module
+============
+
+This module contains the Dirty_Rect_Renderer class for the pygame Whack a
+Mole game, which tracks the screen regions changed during a frame (the mole
+hole, the score/misses/moles left panel, the 2x2 marker etc.) and pushes
+them to the display with a single display.update(rects) per frame, rather
+than re-blitting the full background and flipping the whole display
+
+Attributes:
+    handled within the Dirty_Rect_Renderer class
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import pygame
+
+
+class Dirty_Rect_Renderer:
+    """
+    Blits to the screen, recording the changed (dirty) regions, and updates
+    only those regions of the display once per frame
+
+    Attributes
+    ----------
+    screen: pygame.Surface
+        the display surface
+    background: pygame.Surface
+        the background, used to restore regions
+    dirty: list
+        the pygame.Rect regions changed since the last update
+    full_update: Bool
+        whether the whole display needs updating (e.g. a full background
+        blit or splash screen)
+
+    Methods
+    -------
+    blit(surface, pos)
+        blits the surface to the screen, marking its region dirty
+    restore(rect)
+        blits the background over the region, marking it dirty
+    draw_background()
+        blits the whole background, marking the whole display dirty
+    mark(rect)
+        marks a region dirty
+    mark_all()
+        marks the whole display dirty
+    update()
+        updates the dirty regions of the display
+    """
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.dirty = []
+        self.full_update = False
+
+    def blit(self, surface, pos):
+        '''
+        Blits the surface to the screen, marking its region dirty
+
+        Parameters
+        ----------
+        surface: pygame.Surface
+            the image
+        pos: tuple/pygame.Rect
+            the top left position (or the destination rect)
+
+        Returns
+        -------
+        rect: pygame.Rect
+            the region blitted to
+        '''
+        rect = self.screen.blit(surface, pos)
+        self.mark(rect)
+        return rect
+
+    def restore(self, rect):
+        '''
+        Blits the background over the region, marking it dirty
+
+        Parameters
+        ----------
+        rect: pygame.Rect/None
+            the region (None is ignored)
+        '''
+        if rect is None:
+            return
+        rect = self.screen.blit(self.background, rect, area=rect)
+        self.mark(rect)
+
+    def draw_background(self):
+        '''
+        Blits the whole background, marking the whole display dirty
+        '''
+        self.screen.blit(self.background, (0, 0))
+        self.mark_all()
+
+    def mark(self, rect):
+        '''
+        Marks a region dirty (empty regions are ignored)
+
+        Parameters
+        ----------
+        rect: pygame.Rect
+            the region
+        '''
+        if rect.width and rect.height and not self.full_update:
+            self.dirty.append(pygame.Rect(rect))
+
+    def mark_all(self):
+        '''
+        Marks the whole display dirty
+        '''
+        self.full_update = True
+        self.dirty = []
+
+    def update(self):
+        '''
+        Updates the dirty regions of the display (in one call), doing nothing
+        if nothing has changed
+
+        Returns
+        -------
+        rects: list/None
+            the regions updated (None for the whole display)
+        '''
+        if self.full_update:
+            pygame.display.flip()
+            rects = None
+        else:
+            rects = self.dirty
+            if rects:
+                pygame.display.update(rects)
+        self.dirty = []
+        self.full_update = False
+        return rects
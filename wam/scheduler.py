@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+scheduler module
+============
+
+This module contains the Fixed_Step_Scheduler class for the pygame Whack a
+Mole game, which advances the game's animation timing in fixed (integer
+nanosecond) steps measured with time.perf_counter_ns, independently of the
+render frame rate, so a slow frame is caught up step by step (rather than
+silently stretching the mole exposure) and the frame overruns are recorded
+
+Attributes:
+    handled within the Fixed_Step_Scheduler class
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import time
+
+
+class Fixed_Step_Scheduler:
+    """
+    Converts the wall clock time between frames into whole fixed steps
+
+    Attributes
+    ----------
+    step_ns: int
+        the duration of a step
+    frame_ns: int
+        the target duration of a render frame (1 / FPS)
+    max_catch_up_ns: int
+        the most time caught up in one frame (any more is dropped, e.g.
+        after a pause screen)
+    overrun_ns_floor: int
+        the frame duration beyond which a frame counts as an overrun (the
+        target plus the tolerance, to ignore the usual frame jitter)
+    time_ns: function
+        the monotonic clock (nanoseconds)
+    frames: int
+        the frames measured
+    steps: int
+        the steps taken
+    total_ns: int
+        the total time of the frames measured
+    overruns: int
+        the frames that took longer than overrun_ns_floor
+    overrun_ns: int
+        the total time by which those frames overran frame_ns
+    max_frame_ns: int
+        the longest frame
+    dropped_ns: int
+        the time dropped beyond max_catch_up_ns
+
+    Methods
+    -------
+    start()
+        starts (or restarts) the timing from now
+    advance()
+        the number of steps due since the last call
+    interval_steps(secs)
+        the number of steps in an interval
+    stats()
+        the frame timing statistics
+    """
+    def __init__(self, fps=60, step_hz=1000, max_catch_up=0.25,
+                 tolerance=0.25, time_ns=time.perf_counter_ns):
+        self.step_ns = 10**9 // step_hz
+        self.frame_ns = 10**9 // fps
+        self.overrun_ns_floor = int(self.frame_ns * (1 + tolerance))
+        self.max_catch_up_ns = int(max_catch_up * 10**9)
+        self.time_ns = time_ns
+        self.frames = 0
+        self.steps = 0
+        self.total_ns = 0
+        self.overruns = 0
+        self.overrun_ns = 0
+        self.max_frame_ns = 0
+        self.dropped_ns = 0
+        self.start()
+
+    @property
+    def step_secs(self):
+        return self.step_ns / 10**9
+
+    def start(self):
+        '''
+        Starts (or restarts) the timing from now, discarding any unstepped
+        time
+        '''
+        self.last_ns = self.time_ns()
+        self.accumulator_ns = 0
+
+    def advance(self):
+        '''
+        Measures the frame since the last call, returning the number of whole
+        steps now due (the remainder carries over to the next frame)
+
+        Returns
+        -------
+        steps: int
+            the number of steps to run
+        '''
+        now_ns = self.time_ns()
+        elapsed_ns = now_ns - self.last_ns
+        self.last_ns = now_ns
+        self.frames += 1
+        self.total_ns += elapsed_ns
+        self.max_frame_ns = max(self.max_frame_ns, elapsed_ns)
+        if elapsed_ns > self.overrun_ns_floor:
+            self.overruns += 1
+            self.overrun_ns += elapsed_ns - self.frame_ns
+        if elapsed_ns > self.max_catch_up_ns:
+            self.dropped_ns += elapsed_ns - self.max_catch_up_ns
+            elapsed_ns = self.max_catch_up_ns
+        self.accumulator_ns += elapsed_ns
+        steps, self.accumulator_ns = divmod(self.accumulator_ns, self.step_ns)
+        self.steps += steps
+        return steps
+
+    def interval_steps(self, secs):
+        '''
+        The number of steps in an interval (rounded to the nearest step)
+
+        Parameters
+        ----------
+        secs: float
+            the interval
+
+        Returns
+        -------
+        steps: int
+            the steps
+        '''
+        return round(secs * 10**9 / self.step_ns)
+
+    def stats(self):
+        '''
+        The frame timing statistics (times in milliseconds)
+
+        Returns
+        -------
+        stats: dict
+            frames, steps, step/target frame/mean frame/max frame times, the
+            overrun count, total and mean overrun and the time dropped
+        '''
+        frames = max(self.frames, 1)
+        return {'frames': self.frames,
+                'steps': self.steps,
+                'step_ms': self.step_ns / 10**6,
+                'target_frame_ms': self.frame_ns / 10**6,
+                'mean_frame_ms': self.total_ns / frames / 10**6,
+                'max_frame_ms': self.max_frame_ns / 10**6,
+                'overruns': self.overruns,
+                'overrun_ms': self.overrun_ns / 10**6,
+                'mean_overrun_ms': (self.overrun_ns /
+                                    max(self.overruns, 1) / 10**6),
+                'dropped_ms': self.dropped_ns / 10**6}
@@ -20,9 +20,10 @@ Related projects:
 """
 
 import numpy as np
-import random
-from wam.distributions import trunc_norm_sample as _trunc_norm_sample
+from functools import partial
+from wam.distributions import cached_trunc_norm_sample as _trunc_norm_sample
 from wam.distributions import norm_sample as _norm_sample
+from wam.distributions import Trunc_Norm_Cache
 
 
 class Scorer:
@@ -50,6 +51,9 @@ class Scorer:
         The mean for the random adjustment (presuming it's gaussian)
     skill_luck_rat: float
         the skill to luck ratio
+    rng: np.random.Generator
+        the random stream for the skill/luck and score draws (defaults to
+        the global numpy random state)
 
     Raises
     ------
@@ -61,6 +65,8 @@ class Scorer:
     get_score(distance)
         gets the score for a given mole hit, moderated by the distance from the
         centre of the mole
+    get_scores(distances, margin_drift_iters, skill_luck_rats)
+        vectorised get_score for arrays of mole hits
     _skill_adjust(score, distance)
         adjusts the score based on the users skill
     _rand_adjust(score)
@@ -70,8 +76,8 @@ class Scorer:
                  adjust=False, skill_type='linear_dist',
                  rand_type='uniform',
                  rand_mean=5, rand_sd=1,
-                 #skill_luck_rat=0.5,
-                 config_dict=None):
+                 skill_luck_rat=0.5,
+                 config_dict=None, rng=None):
         self.MOLE_RADIUS = MOLE_RADIUS
         if type(config_dict) is dict:
             # Sets the Scorer instance parameters
@@ -92,7 +98,7 @@ class Scorer:
             self.rand_type = rand_type
             self.rand_mean = rand_mean
             self.rand_sd = rand_sd
-            #self.skill_luck_rat = skill_luck_rat            
+            self.skill_luck_rat = skill_luck_rat
 
         # Assertion for the skill_luck_rat, only input deemed at risk of misuse
         try:
@@ -106,8 +112,14 @@ class Scorer:
             self.skill_luck_rat = 0.0
 
         # Adds the distribution methods
-        self._norm_sample = _norm_sample
-        self._trunc_norm_sample = _trunc_norm_sample
+        if rng is None:
+            self.rng = np.random
+            self._norm_sample = _norm_sample
+            self._trunc_norm_sample = _trunc_norm_sample
+        else:
+            self.rng = rng
+            self._norm_sample = partial(_norm_sample, rng=rng)
+            self._trunc_norm_sample = Trunc_Norm_Cache(rng)
         
     def get_score(self, distance, margin_drift_iter, skill_luck_rat):
         '''
@@ -125,14 +137,14 @@ class Scorer:
         score: float
             the luck adjusted score (i.e. nearer to luckier = better score)
         '''
-        is_skill = np.random.binomial(1,skill_luck_rat, 1)[0]
+        is_skill = self.rng.binomial(1,skill_luck_rat, 1)[0]
         max_score = self.max_score
         true_score = self._skill_adj(max_score, distance, margin_drift_iter)
         if is_skill == 1:
             skill_status = '1'
             score = true_score
         else:
-            score = true_score + random.choice([-2,-1,0,1,2])
+            score = true_score + int(self.rng.choice([-2,-1,0,1,2]))
             if score > max_score:
                 score=max_score
             elif score <1:
@@ -141,6 +153,44 @@ class Scorer:
 
         return score, skill_status, true_score
 
+    def get_scores(self, distances, margin_drift_iters, skill_luck_rats):
+        '''
+        Gets the scores for a batch of mole hits in one vectorised pass (i.e.
+        for simulation/power analysis), matching get_score for each hit
+
+        Parameters
+        ----------
+        distances: np.array
+            the distance from the centre of the mole for each hit
+        margin_drift_iters: np.array/float
+            the margin around the mole for each hit (or one for all the hits)
+        skill_luck_rats: np.array/float
+            the skill to luck ratio for each hit (or one for all the hits)
+
+        Returns
+        -------
+        scores: np.array
+            the luck adjusted scores
+        skill_status: np.array
+            1 where the score was down to skill, 0 where down to luck
+        true_scores: np.array
+            the skill only scores
+        '''
+        distances = np.asarray(distances, dtype=float)
+        skill_luck_rats = np.broadcast_to(
+                              np.asarray(skill_luck_rats, dtype=float),
+                              distances.shape)
+        skill_status = self.rng.binomial(1, skill_luck_rats)
+        precision = 1 - distances / (self.MOLE_RADIUS +
+                                     np.asarray(margin_drift_iters,
+                                                dtype=float))
+        true_scores = np.round(precision*self.max_score + 0.5)
+        luck = self.rng.choice([-2, -1, 0, 1, 2], size=distances.shape)
+        scores = np.where(skill_status == 1,
+                          true_scores,
+                          np.clip(true_scores + luck, 1, self.max_score))
+        return scores, skill_status, true_scores
+
     def get_score_deprecated(self, distance, margin_drift_iter): # to be deprecated
         '''
         Gets the score for an attempted mole whack
@@ -200,7 +250,6 @@ class Scorer:
         score = precision*score
         score += 0.5
         score = round(score)
-        print('skill_adj score, distance, precision', score, distance, precision)
 
         return score
 
@@ -233,7 +282,8 @@ class Scorer:
         except AssertionError:
             print('rand type not recognised in _rand_adj')
         if self.rand_type == 'uniform':
-            score = np.random.randint(self.min_score, self.max_score)
+            score = self.rng.choice(np.arange(self.min_score,
+                                              self.max_score))
         elif self.rand_type == 'normal':
             x = self._trunc_norm_sample(self.rand_mean, self.rand_sd,
                                         self.min_score, self.max_score)
@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+"""
+simulator module
+============
+
+This module contains the Virtual_Clock, Reactive_Clicker and Simulator
+classes, which drive the GameManager state machine headless (i.e. without a
+pygame display, sounds or real time) so synthetic sessions can be run in
+bulk to validate condition sets
+
+The sessions step the animation on the game's own Fixed_Step_Scheduler
+(via GameManager.step_mole, or animate_pool for n_moles > 1), as a real
+session does, so the simulated mole exposure times match the game's
+
+Attributes:
+    handled within the individual classes
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import numpy as np
+from wam.game import GameManager
+from wam.logger import SimLogger
+from wam.scheduler import Fixed_Step_Scheduler
+from wam.distributions import Session_RNG
+
+
+class Virtual_Clock:
+    """
+    Stand-in for the pygame.time.Clock, advancing a virtual time by whole
+    frames (of 1 / framerate, in integer ns as per the Fixed_Step_Scheduler)
+    rather than waiting on the wall clock
+
+    Attributes
+    ----------
+    time_ns: int
+        the virtual time (in nanoseconds) since the clock was created
+    time: float
+        the virtual time (in seconds) since the clock was created
+    last_tick: float
+        the duration (in milliseconds) of the last tick
+
+    Methods
+    -------
+    tick(framerate, frames)
+        advances the clock by a number of frames, returning the milliseconds
+        passed (as per pygame.time.Clock.tick)
+    get_time()
+        returns the milliseconds passed in the last tick
+    """
+    def __init__(self):
+        self.time_ns = 0
+        self.time = 0.0
+        self.last_tick = 0.0
+
+    @staticmethod
+    def frame_ns(framerate):
+        return 10**9 // framerate
+
+    def tick(self, framerate=60, frames=1):
+        '''
+        Advances the clock by a number of frames
+
+        Parameters
+        ----------
+        framerate: int
+            the frames per second of the game
+        frames: int
+            the number of frames to advance by
+
+        Returns
+        -------
+        mil: float
+            the milliseconds that have passed
+        '''
+        tick_ns = frames * self.frame_ns(framerate)
+        self.time_ns += tick_ns
+        self.time = self.time_ns / 10**9
+        self.last_tick = tick_ns / 10**6
+        return self.last_tick
+
+    def get_time(self):
+        return self.last_tick
+
+
+class Reactive_Clicker:
+    """
+    Simple synthetic player, striking at the centre of each mole after a
+    fixed reaction time with gaussian aim error
+
+    Attributes
+    ----------
+    reaction_time: float
+        seconds from the mole popping to the strike
+    aim_sd: float
+        the standard deviation (pixels) of the strike about the hole centre
+    rng: np.random.Generator
+        the random stream for the aim error (set per session by the
+        Simulator, defaulting to the global numpy random state)
+
+    Methods
+    -------
+    plan_strike(hole_centre)
+        returns the (delay, xy) of the strike for a newly popped mole
+    """
+    def __init__(self, reaction_time=0.7, aim_sd=15.0, rng=None):
+        self.reaction_time = reaction_time
+        self.aim_sd = aim_sd
+        if rng is None:
+            rng = np.random
+        self.rng = rng
+
+    def plan_strike(self, hole_centre):
+        '''
+        Plans the strike for a newly popped mole
+
+        Parameters
+        ----------
+        hole_centre: 2 float tuple
+            the xy coordinates of the centre of the hole
+
+        Returns
+        -------
+        delay: float
+            seconds after the mole pops that the strike happens
+        xy: 2 float tuple
+            the xy coordinates of the strike
+        '''
+        x = float(hole_centre[0] + self.rng.normal(0, self.aim_sd))
+        y = float(hole_centre[1] + self.rng.normal(0, self.aim_sd))
+        return self.reaction_time, (x, y)
+
+
+class Simulator:
+    """
+    Runs headless sessions of the game, driving the GameManager's pop,
+    animate, hit, score and stage methods off a virtual clock and synthetic
+    mouse events
+
+    Attributes
+    ----------
+    file_config_loc: string (file location)
+        the condition set to simulate
+    clicker: object
+        the synthetic player, passed to the GameManager as its agent, so
+        providing plan_strike(hole_centre), e.g. a Reactive_Clicker or a
+        wam.agent Agent (which also makes the 2x2 ratings)
+    max_time: float
+        virtual seconds after which a session is abandoned
+    session_rng: Session_RNG
+        the root random streams, from which each session spawns its own
+        (so a seeded Simulator replays exactly)
+
+    Methods
+    -------
+    run_session(session_rng)
+        runs a single session to the end of the final stage, returning the
+        session summary
+    run_sessions(n_sessions)
+        runs several sessions, returning a list of session summaries
+    """
+    def __init__(self, file_config_loc=r"config/Default.json", clicker=None,
+                 max_time=3600.0, seed=None):
+        self.file_config_loc = file_config_loc
+        if clicker is None:
+            clicker = Reactive_Clicker()
+        self.clicker = clicker
+        self.max_time = max_time
+        self.session_rng = Session_RNG(seed)
+
+    def new_game(self, session_rng):
+        '''
+        Creates a fresh headless GameManager, logging to memory
+
+        Parameters
+        ----------
+        session_rng: Session_RNG
+            the random streams for the session
+
+        Returns
+        -------
+        game: GameManager
+            the headless game
+        '''
+        return GameManager(self.file_config_loc, usr_timestamp='sim',
+                           headless=True, wam_logger=SimLogger(),
+                           session_rng=session_rng, agent=self.clicker)
+
+    def run_session(self, session_rng=None):
+        '''
+        Runs one session, following the play_game (or, with n_moles > 1,
+        the play_pool_game) loop on the game's Fixed_Step_Scheduler, timed
+        by a Virtual_Clock that skips straight to the frame on which the
+        next animation step or strike is due
+
+        Parameters
+        ----------
+        session_rng: Session_RNG/None
+            the random streams for the session, spawned from the
+            Simulator's session_rng if None
+
+        Raises
+        ------
+        TypeError
+            if the game does not log to a SimLogger (which summarise reads)
+
+        Returns
+        -------
+        summary: dict
+            the session summary (see summarise)
+        '''
+        if session_rng is None:
+            session_rng = self.session_rng.spawn(1)[0]
+        if hasattr(self.clicker, 'reset'):
+            self.clicker.reset(session_rng.agent)
+        else:
+            self.clicker.rng = session_rng.agent
+        game = self.new_game(session_rng)
+        if not isinstance(game.wam_logger, SimLogger):
+            raise TypeError('The simulated game must log to a SimLogger')
+        clock = Virtual_Clock()
+        game.time_ns = lambda: clock.time_ns
+        # no cap on the time caught up, as the idle frames are skipped
+        game.scheduler = Fixed_Step_Scheduler(game.FPS,
+                                              max_catch_up=self.max_time,
+                                              time_ns=game.time_ns)
+        if game.n_moles > 1:
+            self._run_pool(game, clock)
+        else:
+            self._run_single(game, clock)
+        return self.summarise(game, clock)
+
+    def _frames_to(self, game, clock, step_ns):
+        '''
+        The frames to advance, i.e. those (at least 1) before the scheduler
+        reaches step_ns from now (so no animation step is skipped), or up
+        to the frame on which the next strike is due if sooner
+        '''
+        frame_ns = Virtual_Clock.frame_ns(game.FPS)
+        frames = max(1, (step_ns - game.scheduler.accumulator_ns) //
+                     frame_ns)
+        if game.agent_strikes:
+            frames = min(frames, max(1, -(-(game.agent_strikes[0][0] -
+                                            clock.time_ns) // frame_ns)))
+        return frames
+
+    def _run_single(self, game, clock):
+        '''
+        Runs the session per the play_game loop
+        '''
+        scheduler = game.scheduler
+        cycle_steps = 0
+        ani_num = -1
+        mole_is_down = False
+        interval = 0.1
+        initial_interval = 1
+        frame_num = 0
+        left = 0
+
+        while not game.game_over and clock.time < self.max_time:
+
+            # strikes, if it's time (the clicker's strikes are planned by
+            # the game as the moles pop)
+            for event in game._agent_events():
+                (ani_num,
+                 left,
+                 mole_is_down,
+                 interval,
+                 frame_num) = game.check_mouse_event(event,
+                                                     ani_num,
+                                                     left,
+                                                     mole_is_down,
+                                                     interval,
+                                                     frame_num)
+
+            # refreshes at the point of mole popping
+            if ani_num > 5:
+                game.score_update_check()
+                ani_num = -1
+                left = 0
+
+            # pops the mole, if it's time
+            if ani_num == -1:
+                (ani_num,
+                 mole_is_down,
+                 interval,
+                 frame_num) = game.pop_mole(ani_num,
+                                            mole_is_down,
+                                            interval,
+                                            frame_num)
+
+            # skips the idle frames up to the next animation step or strike
+            due_steps = scheduler.interval_steps(interval) + 1 - cycle_steps
+            clock.tick(game.FPS, self._frames_to(game, clock, due_steps *
+                                                 scheduler.step_ns))
+            (ani_num,
+             left,
+             mole_is_down,
+             interval,
+             frame_num,
+             initial_interval,
+             cycle_steps,
+             clock) = game.step_mole(scheduler.advance(),
+                                     ani_num,
+                                     left,
+                                     mole_is_down,
+                                     interval,
+                                     frame_num,
+                                     initial_interval,
+                                     cycle_steps,
+                                     clock)
+
+    def _run_pool(self, game, clock):
+        '''
+        Runs the session per the play_pool_game loop
+        '''
+        scheduler = game.scheduler
+        pool = game.mole_pool
+        while not game.game_over and clock.time < self.max_time:
+            for event in game._agent_events():
+                game.check_pool_mouse_event(event)
+            game.pop_pool_moles()
+
+            # skips the idle frames up to the next animation step or strike
+            rows = pool.active_rows()
+            due_ns = (int((pool.interval[rows] - pool.timer[rows]).min() *
+                          10**9) if len(rows) else 0)
+            clock.tick(game.FPS, self._frames_to(game, clock, due_ns))
+            game.animate_pool(scheduler.advance() * scheduler.step_secs)
+
+    def run_sessions(self, n_sessions):
+        '''
+        Runs several sessions
+
+        Parameters
+        ----------
+        n_sessions: int
+            the number of sessions to run
+
+        Returns
+        -------
+        summaries: list
+            the session summary dict for each session
+        '''
+        return [self.run_session() for _ in range(n_sessions)]
+
+    @staticmethod
+    def summarise(game, clock):
+        '''
+        Summarises a finished session from the game and its SimLogger
+
+        Parameters
+        ----------
+        game: GameManager
+            the (finished) headless game
+        clock: Virtual_Clock
+            the clock the session ran on
+
+        Returns
+        -------
+        summary: dict
+            moles, strikes, true/margin/reported hits, near misses, mean
+            reaction time, hit rate, scores, 2x2 ratings and the virtual
+            duration of the session
+        '''
+        hits = game.wam_logger.hits
+        rts = [timing['rt_ms'] for timing in game.wam_logger.timings if
+               timing and timing['rt_ms'] is not None]
+        scores = [score[0] for score in game.wam_logger.scores]
+        n_strikes = len(hits)
+        n_hits = sum(1 for hit in hits if hit[0][2])
+        return {'completed': game.game_over,
+                'moles': game.wam_logger.mole_ups,
+                'strikes': n_strikes,
+                'true_hits': sum(1 for hit in hits if hit[0][0]),
+                'margin_hits': sum(1 for hit in hits if hit[0][1]),
+                'hits': n_hits,
+                'near_misses': len(game.wam_logger.near_misses),
+                'mean_rt_ms': float(np.mean(rts)) if rts else 0.0,
+                'hit_rate': n_hits / n_strikes if n_strikes else 0.0,
+                'mean_score': float(np.mean(scores)) if scores else 0.0,
+                'total_score': float(np.sum(scores)),
+                'ratings': len(game.wam_logger.ratings),
+                'duration': clock.time}
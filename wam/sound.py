@@ -45,6 +45,12 @@ class SoundEffect:
         the sound effects volume
     music_volume: float
         the music volume for the game
+    mute: Bool
+        whether the sounds are silenced (i.e. not loaded via the mixer), for
+        headless running of the game
+    bundle: Warm_Start_Bundle/None
+        the warm start cache of the decoded sound samples (the music is
+        streamed so is not cached)
 
     Methods
     -------
@@ -60,7 +66,8 @@ class SoundEffect:
                  pop_sound_loc="sounds//pop.wav",
                  hurt_sound_loc="sounds//hurt.wav",
                  select_sound_loc="sounds//select.wav",
-                 level_sound_loc="sounds//point.wav"):
+                 level_sound_loc="sounds//point.wav",
+                 mute=False, bundle=None):
         self.main_track_loc = main_track_loc
         self.fire_sound_loc = fire_sound_loc
         self.pop_sound_loc = pop_sound_loc
@@ -72,9 +79,14 @@ class SoundEffect:
         self.hurt_vol = 0.3
         self.level_vol = 0.7
         self.music_vol = 0.15
-        self.import_sounds()
-        self.set_volume()
-        self.play_music()
+        self.mute = mute
+        self.bundle = bundle
+        if self.mute:
+            self._silence_sounds()
+        else:
+            self.import_sounds()
+            self.set_volume()
+            self.play_music()
 
     def import_sounds(self):
         '''
@@ -95,14 +107,46 @@ class SoundEffect:
         '''
         try:
             self.main_track = pygame.mixer.music.load(self.main_track_loc)
-            self.fire_sound = pygame.mixer.Sound(self.fire_sound_loc)
-            self.pop_sound = pygame.mixer.Sound(self.pop_sound_loc)
-            self.hurt_sound = pygame.mixer.Sound(self.hurt_sound_loc)
-            self.level_sound = pygame.mixer.Sound(self.level_sound_loc)
-            self.select_sound = pygame.mixer.Sound(self.select_sound_loc)
+            self.fire_sound = self._load_sound(self.fire_sound_loc)
+            self.pop_sound = self._load_sound(self.pop_sound_loc)
+            self.hurt_sound = self._load_sound(self.hurt_sound_loc)
+            self.level_sound = self._load_sound(self.level_sound_loc)
+            self.select_sound = self._load_sound(self.select_sound_loc)
         except OSError:
             print('At least one of the sound files failed to load')
 
+    def _load_sound(self, file_loc):
+        '''
+        Loads a sound, from the decoded samples in the bundle if present
+        (keyed by the mixer format, as the samples are in it)
+        '''
+        if self.bundle is None:
+            return pygame.mixer.Sound(file_loc)
+        raw = self.bundle.fetch('sound|' + file_loc + '|' +
+                                str(pygame.mixer.get_init()), [file_loc],
+                                lambda: pygame.mixer.Sound(file_loc).get_raw())
+        return pygame.mixer.Sound(buffer=raw)
+
+    def _silence_sounds(self):
+        '''
+        Sets every sound to a silent stand-in, so the game can run headless
+        without the pygame mixer being initialised
+
+        Parameters
+        ----------
+        self : self
+
+        Returns
+        -------
+        na
+        '''
+        self.main_track = None
+        self.fire_sound = _SilentSound()
+        self.pop_sound = _SilentSound()
+        self.hurt_sound = _SilentSound()
+        self.level_sound = _SilentSound()
+        self.select_sound = _SilentSound()
+
     def set_volume(self):
         '''
         Sets the volume for the game
@@ -140,7 +184,8 @@ class SoundEffect:
         na
             plays the music
         '''
-        pygame.mixer.music.play(-1)
+        if not self.mute:
+            pygame.mixer.music.play(-1)
 
     def stop_music(self):
         '''
@@ -291,3 +336,18 @@ class SoundEffect:
             Silence...
         '''
         self.level_sound.stop()
+
+
+class _SilentSound:
+    """
+    Silent stand-in for a pygame.mixer.Sound, used when the SoundEffect is
+    muted (e.g. headless simulation)
+    """
+    def play(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+startup module
+============
+
+This module contains the Startup_Profiler and Warm_Start_Bundle classes for
+the pygame Whack a Mole game, which time (and optionally trace the memory
+allocated by) each phase of the GameManager construction, and cache the
+decoded images/sounds and parsed configuration in a single binary bundle so
+a relaunch skips the decoding and parsing
+
+Each bundle entry records the size and modification time of its source
+files, and is rebuilt (and the bundle rewritten) should any of them change.
+The bundle as a whole records BUNDLE_VERSION and the stamps of the modules
+that build its entries (CODE_SOURCES), and is discarded should either
+change, so an entry whose layout changed with the code is never served
+
+Usage (from the repository root, with a display):
+    python -m wam.startup [--warm config/warm_start.bundle] [--trace-alloc]
+
+Attributes:
+    WARM_START_LOC: string (file location)
+        the default bundle location
+    BUNDLE_VERSION: int
+        the bundle layout version (bumped should the layout change)
+    CODE_SOURCES: tuple
+        the modules building the bundle entries
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import argparse
+from collections import OrderedDict
+from contextlib import contextmanager
+import os
+import pickle
+import time
+import tracemalloc
+
+WARM_START_LOC = 'config/warm_start.bundle'
+BUNDLE_VERSION = 1
+CODE_SOURCES = tuple(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  name) for name in ('assets.py',
+                                                     'condition_set.py',
+                                                     'game.py', 'sound.py',
+                                                     'startup.py'))
+
+
+class Startup_Profiler:
+    """
+    Times the named phases of a start up (wall time, and the memory
+    allocated with trace_alloc)
+
+    Attributes
+    ----------
+    trace_alloc: Bool
+        whether to trace the allocations (via tracemalloc, which slows the
+        phases it traces)
+    start_ns: int
+        the (monotonic ns) time the profiler was created
+    phases: OrderedDict
+        ms (and alloc_kb, peak_kb with trace_alloc) of each phase, in order
+
+    Methods
+    -------
+    lap(name)
+        records the time since the last lap as the named phase
+    phase(name)
+        context manager timing a phase
+    summary()
+        the flattened phase timings (for the logger)
+    report()
+        describes the phases
+    """
+    def __init__(self, trace_alloc=False):
+        self.trace_alloc = trace_alloc
+        self._own_trace = trace_alloc and not tracemalloc.is_tracing()
+        if self._own_trace:
+            tracemalloc.start()
+        self.start_ns = time.perf_counter_ns()
+        self.phases = OrderedDict()
+        self._lap = self._mark()
+
+    def _mark(self):
+        mem = 0
+        if self.trace_alloc:
+            if hasattr(tracemalloc, 'reset_peak'):  # python 3.9+
+                tracemalloc.reset_peak()
+            mem = tracemalloc.get_traced_memory()[0]
+        return time.perf_counter_ns(), mem
+
+    def _record(self, name, mark):
+        start_ns, start_mem = mark
+        stats = self.phases.setdefault(name, {'ms': 0.0})
+        stats['ms'] += (time.perf_counter_ns() - start_ns) / 10**6
+        if self.trace_alloc:
+            current, peak = tracemalloc.get_traced_memory()
+            stats['alloc_kb'] = (stats.get('alloc_kb', 0.0) +
+                                 (current - start_mem) / 1024)
+            stats['peak_kb'] = max(stats.get('peak_kb', 0.0),
+                                   (peak - start_mem) / 1024)
+
+    def lap(self, name):
+        '''
+        Records the time since the last lap (or the profiler's creation) as
+        the named phase (repeated names accumulate)
+
+        Parameters
+        ----------
+        name: string
+            the phase name
+        '''
+        self._record(name, self._lap)
+        self._lap = self._mark()
+
+    @contextmanager
+    def phase(self, name):
+        '''
+        Times the code within the context as the named phase (repeated names
+        accumulate)
+
+        Parameters
+        ----------
+        name: string
+            the phase name
+        '''
+        mark = self._mark()
+        try:
+            yield
+        finally:
+            self._record(name, mark)
+            self._lap = self._mark()
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter_ns() - self.start_ns) / 10**6
+
+    def stop(self):
+        '''
+        Stops the allocation tracing (if this profiler started it)
+        '''
+        if self._own_trace:
+            tracemalloc.stop()
+            self._own_trace = False
+
+    def summary(self):
+        '''
+        The flattened phase timings, i.e. <phase>_ms (and <phase>_alloc_kb,
+        <phase>_peak_kb) plus the total_ms so far
+
+        Returns
+        -------
+        summary: dict
+            the timings
+        '''
+        summary = {}
+        for name, stats in self.phases.items():
+            for key, value in stats.items():
+                summary[name + '_' + key] = round(value, 3)
+        summary['total_ms'] = round(self.total_ms, 3)
+        return summary
+
+    def report(self):
+        '''
+        Describes the phases, in order
+
+        Returns
+        -------
+        report: string
+            a line per phase and the total
+        '''
+        lines = []
+        for name, stats in self.phases.items():
+            line = format(name, '<16') + format(stats['ms'], '9.2f') + ' ms'
+            if 'alloc_kb' in stats:
+                line += (format(stats['alloc_kb'], '10.1f') + ' kB alloc' +
+                         format(stats['peak_kb'], '10.1f') + ' kB peak')
+            lines.append(line)
+        lines.append(format('total', '<16') + format(self.total_ms, '9.2f') +
+                     ' ms')
+        return '\n'.join(lines)
+
+
+def source_stamps(sources):
+    '''
+    The size and modification time of each source file (None if missing)
+
+    Parameters
+    ----------
+    sources: list
+        the file locations
+
+    Returns
+    -------
+    stamps: tuple
+        (file_loc, size, mtime_ns) per source
+    '''
+    stamps = []
+    for file_loc in sources:
+        try:
+            stat = os.stat(file_loc)
+            stamps.append((file_loc, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            stamps.append((file_loc, None, None))
+    return tuple(stamps)
+
+
+class Warm_Start_Bundle:
+    """
+    Single file cache of the decoded assets and parsed configuration, each
+    entry keyed by name and validated against its source files
+
+    Attributes
+    ----------
+    file_loc: string (file location)
+        the bundle file
+    version: tuple
+        BUNDLE_VERSION and the stamps of the code_sources, which the read
+        bundle must match
+    entries: dict
+        (stamps, value) keyed by entry name
+    dirty: Bool
+        whether entries were added since the bundle was read
+    hits: int
+        the entries served from the bundle
+    misses: int
+        the entries (re)built
+
+    Methods
+    -------
+    get(name, sources)
+        gets an entry, None if missing or stale
+    put(name, value, sources)
+        adds an entry
+    fetch(name, sources, build)
+        gets an entry, building (and adding) it on a miss
+    save()
+        writes the bundle (if changed)
+    """
+    def __init__(self, file_loc=WARM_START_LOC, code_sources=CODE_SOURCES):
+        self.file_loc = file_loc
+        self.version = (BUNDLE_VERSION, source_stamps(code_sources))
+        self.entries = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        if os.path.isfile(file_loc):
+            try:
+                with open(file_loc, 'rb') as f:
+                    data = pickle.load(f)
+            except Exception:
+                print('Warm start bundle ' + file_loc +
+                      ' could not be read, rebuilding it')
+                return
+            if isinstance(data, dict) and data.get('version') == self.version:
+                self.entries = data['entries']
+            else:
+                print('Warm start bundle ' + file_loc +
+                      ' is out of date, rebuilding it')
+
+    def get(self, name, sources=()):
+        '''
+        Gets an entry, should its source files be unchanged
+
+        Parameters
+        ----------
+        name: string
+            the entry name
+        sources: list
+            the source file locations
+
+        Returns
+        -------
+        value: object/None
+            the entry, None if missing or stale
+        '''
+        entry = self.entries.get(name)
+        if entry is None or entry[0] != source_stamps(sources):
+            return None
+        return entry[1]
+
+    def put(self, name, value, sources=()):
+        '''
+        Adds an entry (written on the next save)
+
+        Parameters
+        ----------
+        name: string
+            the entry name
+        value: object
+            the (picklable) entry
+        sources: list
+            the source file locations
+        '''
+        self.entries[name] = (source_stamps(sources), value)
+        self.dirty = True
+
+    def fetch(self, name, sources, build):
+        '''
+        Gets an entry, building and adding it when missing or stale
+
+        Parameters
+        ----------
+        name: string
+            the entry name
+        sources: list
+            the source file locations
+        build: function
+            builds the entry (no arguments)
+
+        Returns
+        -------
+        value: object
+            the entry
+        '''
+        value = self.get(name, sources)
+        if value is None:
+            self.misses += 1
+            value = build()
+            self.put(name, value, sources)
+        else:
+            self.hits += 1
+        return value
+
+    def save(self):
+        '''
+        Writes the bundle, should entries have been added (via a temporary
+        file, so an interrupted write leaves the old bundle)
+        '''
+        if not self.dirty:
+            return
+        temp_loc = self.file_loc + '.tmp'
+        try:
+            with open(temp_loc, 'wb') as f:
+                pickle.dump({'version': self.version,
+                             'entries': self.entries},
+                            f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_loc, self.file_loc)
+            self.dirty = False
+        except OSError:
+            print('Warm start bundle ' + self.file_loc + ' could not be saved')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='GameManager start up '
+                                                 'profile')
+    parser.add_argument('--warm', default=None,
+                        help='the warm start bundle (default none, i.e. cold)')
+    parser.add_argument('--trace-alloc', action='store_true',
+                        help='trace the memory allocated per phase')
+    args = parser.parse_args(argv)
+    import pygame
+    from wam.game import GameManager
+    from wam.logger import SimLogger
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    pygame.init()
+    game = GameManager(wam_logger=SimLogger(), warm_start=args.warm,
+                       trace_alloc=args.trace_alloc)
+    print(game.startup.report())
+    if game.bundle is not None:
+        print('bundle hits: ' + str(game.bundle.hits) + ', misses: ' +
+              str(game.bundle.misses))
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+sweep module
+============
+
+This module contains the condition set sweep runner for the pygame Whack a
+Mole game, which expands a parameter grid over a base condition set (e.g.
+diff_fact, luck_sd, MOLE_RADIUS, MARGIN_START, drift_type, skill_luck_rat)
+into validated condition sets, simulates headless sessions of each in a
+process pool (see the simulator module) and writes a summary table of the
+expected hit rates and score distributions
+
+Each condition set is saved (see the condition_set module) alongside the
+summary, so a calibrated set can be used for participant sessions as is.
+Every condition is simulated from the same seed (i.e. common random
+numbers), so the differences between conditions are not swamped by the
+session to session noise
+
+Usage (from the repository root):
+    python -m wam.sweep --param diff_fact=0.5,1,2 --param drift_type=static,sin
+        [--grid grid.json] [--base config/Default.json] [--sessions 20]
+        [--workers N] [--seed 0] [--out sweeps/sweep]
+
+where grid.json holds {"setting": [values], ...}
+
+Attributes:
+    SUMMARY_COLUMNS: list
+        the summary columns following the swept settings
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import itertools
+import json
+import os
+import sys
+import numpy as np
+from wam.condition_set import (SCHEMA, Condition_Set_Error,
+                               load_condition_set, save_condition_set,
+                               validate)
+
+SUMMARY_COLUMNS = ['condition', 'file_loc', 'sessions', 'completed',
+                   'moles', 'strikes', 'hit_rate', 'hit_rate_sd',
+                   'true_hit_rate', 'margin_hit_rate', 'mean_score',
+                   'mean_score_sd', 'total_score', 'total_score_sd',
+                   'total_score_p05', 'total_score_p50', 'total_score_p95',
+                   'mean_rt_ms', 'duration']
+
+
+def resolve_setting(name):
+    '''
+    Resolves a setting name to its (section, setting), a bare name being
+    looked up across the SCHEMA sections
+
+    Parameters
+    ----------
+    name: string
+        'section.setting' or just 'setting'
+
+    Raises
+    ------
+    KeyError
+        if the setting is unknown (or a bare name is in several sections)
+
+    Returns
+    -------
+    section, setting: string
+        the resolved setting
+    '''
+    if '.' in name:
+        section, setting = name.split('.', 1)
+        if setting not in SCHEMA.get(section, {}):
+            raise KeyError('Unknown setting ' + name)
+        return section, setting
+    sections = [section for section, fields in SCHEMA.items() if
+                name in fields]
+    if len(sections) != 1:
+        raise KeyError(('Unknown' if not sections else 'Ambiguous') +
+                       ' setting ' + name)
+    return sections[0], name
+
+
+def expand_grid(base_dict, grid):
+    '''
+    Expands a parameter grid into condition sets (every combination of the
+    values, in grid order)
+
+    Parameters
+    ----------
+    base_dict: dict
+        the base condition set (master dictionary)
+    grid: dict
+        the values of each swept setting, keyed by setting name
+
+    Raises
+    ------
+    Condition_Set_Error
+        if any combination is not a valid condition set
+
+    Returns
+    -------
+    conditions: list
+        (params, master_dict) per combination, params being the swept
+        setting values
+    '''
+    names = list(grid)
+    targets = [resolve_setting(name) for name in names]
+    base_name = base_dict['conditions_meta']['cond_set_name']
+    conditions = []
+    for i, values in enumerate(itertools.product(*(grid[name] for
+                                                   name in names))):
+        master_dict = json.loads(json.dumps(base_dict))  # deep copy
+        master_dict['main_game']['TWO_X_TWO_LOC'] = tuple(
+            master_dict['main_game']['TWO_X_TWO_LOC'])
+        for (section, setting), value in zip(targets, values):
+            master_dict[section][setting] = value
+        params = dict(zip(names, values))
+        master_dict['conditions_meta']['cond_set_name'] = (base_name +
+                                                           '_sweep' + str(i))
+        master_dict['conditions_meta']['cond_set_notes'] = json.dumps(params)
+        errors = validate(master_dict)
+        if errors:
+            raise Condition_Set_Error('sweep condition ' + json.dumps(params),
+                                      errors)
+        conditions.append((params, master_dict))
+    return conditions
+
+
+def summarise_sessions(summaries):
+    '''
+    Summarises the simulated sessions of a condition
+
+    Parameters
+    ----------
+    summaries: list
+        the session summaries (see Simulator.summarise)
+
+    Returns
+    -------
+    row: dict
+        the SUMMARY_COLUMNS statistics (bar condition and file_loc)
+    '''
+    def column(key):
+        return np.array([summary[key] for summary in summaries], dtype=float)
+
+    strikes = np.maximum(column('strikes'), 1)
+    total_scores = column('total_score')
+    p05, p50, p95 = np.percentile(total_scores, [5, 50, 95])
+    return {'sessions': len(summaries),
+            'completed': float(column('completed').mean()),
+            'moles': float(column('moles').mean()),
+            'strikes': float(column('strikes').mean()),
+            'hit_rate': float(column('hit_rate').mean()),
+            'hit_rate_sd': float(column('hit_rate').std()),
+            'true_hit_rate': float((column('true_hits') / strikes).mean()),
+            'margin_hit_rate': float((column('margin_hits') /
+                                      strikes).mean()),
+            'mean_score': float(column('mean_score').mean()),
+            'mean_score_sd': float(column('mean_score').std()),
+            'total_score': float(total_scores.mean()),
+            'total_score_sd': float(total_scores.std()),
+            'total_score_p05': float(p05),
+            'total_score_p50': float(p50),
+            'total_score_p95': float(p95),
+            'mean_rt_ms': float(column('mean_rt_ms').mean()),
+            'duration': float(column('duration').mean())}
+
+
+def run_condition(file_loc, n_sessions, seed=None, clicker_factory=None,
+                  clicker_kwargs=None, max_time=3600.0):
+    '''
+    Simulates the sessions of one condition set (the process pool task)
+
+    Parameters
+    ----------
+    file_loc: string (file location)
+        the condition set
+    n_sessions: int
+        the number of sessions
+    seed: int/None
+        the Simulator seed
+    clicker_factory: function/None
+        builds the synthetic player (None for a Reactive_Clicker)
+    clicker_kwargs: dict/None
+        the arguments of the clicker_factory
+    max_time: float
+        virtual seconds after which a session is abandoned
+
+    Returns
+    -------
+    row: dict
+        the session statistics, as per summarise_sessions
+    '''
+    from wam.simulator import Reactive_Clicker, Simulator
+    if clicker_factory is None:
+        clicker_factory = Reactive_Clicker
+    clicker = clicker_factory(**(clicker_kwargs or {}))
+    sim = Simulator(file_loc, clicker=clicker, max_time=max_time, seed=seed)
+    return summarise_sessions(sim.run_sessions(n_sessions))
+
+
+def run_sweep(grid, base_loc=r"config/Default.json", n_sessions=20,
+              out_dir='sweeps/sweep', seed=0, max_workers=None,
+              clicker_factory=None, clicker_kwargs=None, max_time=3600.0):
+    '''
+    Runs the sweep, i.e. expands the grid, saves each condition set, then
+    simulates them in a process pool and writes the summary table
+
+    Parameters
+    ----------
+    grid: dict
+        the values of each swept setting, keyed by setting name
+    base_loc: string (file location)
+        the base condition set
+    n_sessions: int
+        the sessions simulated per condition
+    out_dir: string (folder location)
+        where the condition sets and summary.csv are written
+    seed: int/None
+        the seed of every condition's Simulator
+    max_workers: int/None
+        the number of processes (None for one per core, 1 to run in
+        process)
+    clicker_factory: function/None
+        builds the synthetic player (None for a Reactive_Clicker), it must
+        be picklable (e.g. a class) for the process pool
+    clicker_kwargs: dict/None
+        the arguments of the clicker_factory
+    max_time: float
+        virtual seconds after which a session is abandoned
+
+    Returns
+    -------
+    rows: list
+        the summary row of each condition (the swept settings then the
+        SUMMARY_COLUMNS)
+    '''
+    conditions = expand_grid(load_condition_set(base_loc), grid)
+    os.makedirs(out_dir, exist_ok=True)
+    file_locs = []
+    for i, (_, master_dict) in enumerate(conditions):
+        file_locs.append(os.path.join(out_dir, 'condition_' + str(i) +
+                                      '.json'))
+        save_condition_set(master_dict, file_locs[-1])
+    tasks = [(file_loc, n_sessions, seed, clicker_factory, clicker_kwargs,
+              max_time) for file_loc in file_locs]
+    if max_workers == 1 or len(tasks) < 2:
+        stats = [run_condition(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            stats = list(executor.map(run_condition, *zip(*tasks)))
+    rows = []
+    for i, ((params, _), file_loc, row) in enumerate(zip(conditions,
+                                                         file_locs, stats)):
+        row.update(params)
+        row['condition'] = i
+        row['file_loc'] = file_loc
+        rows.append(row)
+    write_summary(rows, list(grid), os.path.join(out_dir, 'summary.csv'))
+    return rows
+
+
+def write_summary(rows, param_names, file_loc):
+    '''
+    Writes the summary table, a row per condition
+
+    Parameters
+    ----------
+    rows: list
+        the summary rows
+    param_names: list
+        the swept setting names (the leading columns)
+    file_loc: string (file location)
+        the csv file
+    '''
+    with open(file_loc, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=(param_names +
+                                               SUMMARY_COLUMNS))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _parse_param(text):
+    name, _, values = text.partition('=')
+    parsed = []
+    for value in values.split(','):
+        try:
+            parsed.append(json.loads(value))
+        except ValueError:
+            parsed.append(value)
+    return name, parsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Condition set sweep')
+    parser.add_argument('--param', action='append', default=[],
+                        help='setting=value1,value2,... (repeatable)')
+    parser.add_argument('--grid', default=None,
+                        help='a JSON file of {"setting": [values]}')
+    parser.add_argument('--base', default=r"config/Default.json")
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='sweeps/sweep')
+    args = parser.parse_args(argv)
+    grid = {}
+    if args.grid is not None:
+        with open(args.grid, 'r') as f:
+            grid.update(json.load(f))
+    grid.update(_parse_param(param) for param in args.param)
+    if not grid:
+        parser.error('no settings to sweep (use --param or --grid)')
+    rows = run_sweep(grid, args.base, args.sessions, args.out, args.seed,
+                     args.workers)
+    for row in rows:
+        print(', '.join(name + '=' + str(row[name]) for name in grid) +
+              ': hit_rate ' + format(row['hit_rate'], '.3f') +
+              ', total_score ' + format(row['total_score'], '.1f') +
+              ' (p05 ' + format(row['total_score_p05'], '.1f') +
+              ', p95 ' + format(row['total_score_p95'], '.1f') + ')')
+    print('Summary written to ' + os.path.join(args.out, 'summary.csv'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+test_agent module
+============
+
+This module contains the pytest functions for the Agent and Synthetic_Agent
+classes from the agent module for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import numpy as np
+import pytest
+from .. import agent
+from .. import game
+from .. import logger
+from .. import simulator
+
+test_game = game.GameManager(headless=True, wam_logger=logger.SimLogger())
+
+
+def test_agent_strikes_centre():
+    test_agent = agent.Agent(reaction_time=0.5)
+    assert test_agent.plan_strike((10, 20)) == (0.5, (10.0, 20.0))
+    assert test_agent.get_agent_mouse_pos() == (10.0, 20.0)
+    assert test_agent.n_strikes == 1
+
+
+@pytest.mark.parametrize('rt_dist', agent.RT_DISTS)
+def test_reaction_times(rt_dist):
+    test_agent = agent.Synthetic_Agent(rt_dist=rt_dist, rt_mean=0.6,
+                                       rt_sd=0.1, rt_tau=0.0001,
+                                       rng=np.random.default_rng(0))
+    rts = np.array([test_agent.sample_rt() for _ in range(2000)])
+    assert abs(rts.mean() - 0.6) < 0.01
+    assert rts.min() >= test_agent.rt_min
+
+
+def test_fatigue_drift():
+    test_agent = agent.Synthetic_Agent(aim_sd=5.0, rt_dist='fixed',
+                                       fatigue_aim=1.0, fatigue_rt=0.1,
+                                       rng=np.random.default_rng(0))
+    fresh = [test_agent.plan_strike((0, 0)) for _ in range(100)]
+    tired = [test_agent.plan_strike((0, 0)) for _ in range(100)]
+    assert fresh[0][0] == 0.7
+    assert tired[-1][0] > 0.8
+    assert (np.std([xy for _, xy in tired]) >
+            np.std([xy for _, xy in fresh]))
+
+
+@pytest.mark.parametrize('policy', agent.RATING_POLICIES)
+def test_ratings_in_grid(policy):
+    test_agent = agent.Synthetic_Agent(rating_policy=policy,
+                                       rng=np.random.default_rng(0))
+    test_game.result = (False,)
+    test_game.distance = 500.0
+    for _ in range(20):
+        assert test_game.check_rate_in_grid(test_agent.rate(test_game))
+    with pytest.raises(ValueError):
+        agent.Synthetic_Agent(rating_policy='none')
+
+
+def test_agent_mouse_pos():
+    test_game.agent = agent.Agent()
+    test_game.agent.plan_strike((3, 4))
+    assert test_game.get_agent_mouse_pos(human=False) == (3.0, 4.0)
+    test_game.agent = None
+
+
+def test_simulated_agent_rates():
+    sim = simulator.Simulator(clicker=agent.Synthetic_Agent(), seed=4)
+    summary = sim.run_session()
+    assert summary['completed'] is True
+    assert summary['ratings'] > 0
+    replay = simulator.Simulator(clicker=agent.Synthetic_Agent(), seed=4)
+    assert replay.run_session() == summary
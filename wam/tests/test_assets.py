@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+test_assets module
+============
+
+This module contains the pytest functions for the Asset_Manager class from
+the assets module for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import os
+import pygame
+from .. import assets
+from .. import startup
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+pygame.display.init()
+test_screen = pygame.display.set_mode((200, 100))
+
+
+def make_image(tmp_path):
+    file_loc = str(tmp_path / 'test.png')
+    image = pygame.Surface((40, 20), pygame.SRCALPHA)
+    image.fill((255, 0, 0, 128))
+    pygame.image.save(image, file_loc)
+    return file_loc
+
+
+def test_load_registers(tmp_path):
+    asset_manager = assets.Asset_Manager()
+    surface = asset_manager.load('test', make_image(tmp_path))
+    assert asset_manager['test'] is surface
+    assert 'test' in asset_manager
+    assert surface.get_flags() & pygame.SRCALPHA
+    assert asset_manager.load_times['test'] >= 0
+
+
+def test_load_opaque_scaled(tmp_path):
+    asset_manager = assets.Asset_Manager()
+    surface = asset_manager.load('test', make_image(tmp_path), alpha=False,
+                                 scale=0.5)
+    assert surface.get_size() == (20, 10)
+    assert not surface.get_flags() & pygame.SRCALPHA
+    assert surface.get_bitsize() == test_screen.get_bitsize()
+
+
+def test_timing_report(tmp_path):
+    asset_manager = assets.Asset_Manager()
+    asset_manager.load('test', make_image(tmp_path))
+    report = asset_manager.timing_report().split('\n')
+    assert report[0].startswith('test: ')
+    assert report[-1].startswith('total: ')
+
+
+def make_score_images(tmp_path, scores):
+    for score in scores:
+        image = pygame.Surface((30, 20), pygame.SRCALPHA)
+        image.fill((score * 20, 0, 0, 255))
+        pygame.image.save(image, str(tmp_path / (str(score) + 'pts.png')))
+    return str(tmp_path / '{}pts.png')
+
+
+def test_score_atlas_lookup(tmp_path):
+    atlas = assets.Score_Atlas(5, make_score_images(tmp_path, range(6)))
+    assert atlas.sheet.get_size() == (180, 20)
+    assert len(atlas.frames) == 6
+    assert atlas.get_frame(2.4).get_at((0, 0))[0] == 40
+    assert atlas.get_frame(2.5).get_at((0, 0))[0] == 60
+    assert atlas.get_frame(-1).get_at((0, 0))[0] == 0
+    assert atlas.get_frame(12).get_at((0, 0))[0] == 100
+    assert atlas.get_frame(3).get_parent() is atlas.sheet
+
+
+def test_score_atlas_missing_images(tmp_path):
+    atlas = assets.Score_Atlas(12, make_score_images(tmp_path, range(3)))
+    assert len(atlas.frames) == 13
+    assert atlas.get_frame(12).get_size() == (30, 20)
+
+
+def test_load_warm_start(tmp_path):
+    bundle = startup.Warm_Start_Bundle(str(tmp_path / 'warm.bundle'))
+    file_loc = make_image(tmp_path)
+    cold = assets.Asset_Manager(bundle).load('test', file_loc, scale=0.5)
+    warm = assets.Asset_Manager(bundle).load('test', file_loc, scale=0.5)
+    assert (bundle.hits, bundle.misses) == (1, 1)
+    assert warm.get_size() == (20, 10)
+    assert warm.get_at((5, 5)) == cold.get_at((5, 5))
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+test_condition_set module
+============
+
+This module contains the pytest functions for the condition_set module for
+the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import json
+import os
+import pickle
+import pytest
+from .. import condition_set
+
+
+def test_default_matches_legacy():
+    master_dict = condition_set.load_condition_set('config/Default.json')
+    legacy = condition_set.load_condition_set('config/Default.pkl')
+    assert master_dict == legacy
+    assert master_dict == pickle.load(open('config/Default.pkl', 'rb'))
+    assert master_dict['main_game']['TWO_X_TWO_LOC'] == (108, 609)
+
+
+def test_round_trip_and_memo(tmp_path):
+    file_loc = str(tmp_path / 'set.json')
+    master_dict = condition_set.load_condition_set('config/Default.json')
+    master_dict['scorer']['max_score'] = 7
+    condition_set.save_condition_set(master_dict, file_loc)
+    loaded = condition_set.load_condition_set(file_loc)
+    assert loaded == master_dict
+    loaded['scorer']['max_score'] = 0  # copies, the memo is unaltered
+    assert condition_set.load_condition_set(file_loc)['scorer'][
+        'max_score'] == 7
+    master_dict['scorer']['max_score'] = 8
+    condition_set.save_condition_set(master_dict, file_loc)
+    os.utime(file_loc, ns=(1, 10**18))
+    assert condition_set.load_condition_set(file_loc)['scorer'][
+        'max_score'] == 8
+
+
+def test_rejects_malformed(tmp_path):
+    master_dict = condition_set.load_condition_set('config/Default.json')
+    master_dict['main_game']['FPS'] = '60'
+    master_dict['scorer']['skill_type'] = 'bad'
+    master_dict['scorer']['min_score'] = 20
+    del master_dict['hit_checker']['luck_sd']
+    master_dict['margin_drifter']['typo'] = 1
+    errors = condition_set.validate(master_dict)
+    assert len(errors) == 4
+    with pytest.raises(condition_set.Condition_Set_Error):
+        condition_set.save_condition_set(master_dict,
+                                         str(tmp_path / 'bad.json'))
+    assert not os.path.exists(str(tmp_path / 'bad.json'))
+    master_dict = condition_set.load_condition_set('config/Default.json')
+    master_dict['scorer']['min_score'] = 20
+    assert condition_set.validate(master_dict) == [
+        'scorer.min_score is above scorer.max_score']
+
+
+def test_rejects_other_versions(tmp_path):
+    file_loc = tmp_path / 'set.json'
+    data = json.load(open('config/Default.json'))
+    data['version'] = 99
+    file_loc.write_text(json.dumps(data))
+    with pytest.raises(condition_set.Condition_Set_Error) as error:
+        condition_set.load_condition_set(str(file_loc))
+    assert 'unsupported version 99' in str(error.value)
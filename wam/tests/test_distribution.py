@@ -36,3 +36,41 @@ def test_trunc_norm_sample():
                                                  2,
                                                  3,
                                                  4), 4) == 3.3465
+
+
+def test_trunc_norm_sampler_matches_trunc_norm_sample():
+    sampler = distributions.Trunc_Norm_Sampler(1, 2, 3, 4, buffer_size=16)
+    np.random.seed(1)
+    assert round(sampler.sample(), 4) == 3.3465
+
+
+def test_trunc_norm_sampler_refill():
+    sampler = distributions.Trunc_Norm_Sampler(0, 1, -1, 1, buffer_size=4)
+    draws = [sampler.sample() for _ in range(6)]
+    assert sampler.buffer_pos == 2
+    assert all(-1 <= x <= 1 for x in draws)
+    bulk = sampler.sample(10)
+    assert bulk.shape == (10,)
+    assert ((bulk >= -1) & (bulk <= 1)).all()
+
+
+def test_get_trunc_norm_sampler_cached():
+    distributions.clear_trunc_norm_samplers()
+    sampler = distributions.get_trunc_norm_sampler(0, 1, -1, 1)
+    assert distributions.get_trunc_norm_sampler(0, 1, -1, 1) is sampler
+    assert distributions.get_trunc_norm_sampler(0, 2, -1, 1) is not sampler
+
+
+def test_session_rng_streams():
+    session_rng = distributions.Session_RNG(1)
+    replay = distributions.Session_RNG(1)
+    assert session_rng.game.random() == replay.game.random()
+    assert session_rng.scorer.random() != session_rng.margin.random()
+    child_a, child_b = session_rng.spawn(2)
+    assert child_a.game.random() != child_b.game.random()
+
+
+def test_trunc_norm_cache_rng():
+    cache = distributions.Trunc_Norm_Cache(np.random.default_rng(1))
+    replay = distributions.Trunc_Norm_Cache(np.random.default_rng(1))
+    assert cache(0, 1, -1, 1) == replay(0, 1, -1, 1)
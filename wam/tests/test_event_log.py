@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+test_event_log module
+============
+
+This module contains the pytest functions for the Event_Sink class and
+load_events function from the event_log module for the pygame Whack a Mole
+game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import numpy as np
+import pytest
+
+from .. import event_log
+
+
+def test_sink_round_trip(tmp_path):
+    file_loc = str(tmp_path / 'events.bin')
+    sink = event_log.Event_Sink(file_loc, batch_size=4)
+    for i in range(10):
+        sink.write(event_log.EVENT_CODES['hit_attempt'], mole_x=i,
+                   distance=2.5, hit=1)
+    sink.write(event_log.EVENT_CODES['score'], score=7, skill=1)
+    sink.close()
+    header, events = event_log.load_events(file_loc)
+    assert header['magic'] == event_log.EVENT_MAGIC
+    assert len(events) == 11
+    assert events['mole_x'][:10].tolist() == list(range(10))
+    assert (np.diff(events['t_ns']) >= 0).all()
+    assert events[-1]['code'] == 11
+    assert events[-1]['mole_x'] == -1
+    assert np.isnan(events[-1]['distance'])
+
+
+def test_load_events_rejects_other_files(tmp_path):
+    file_loc = tmp_path / 'not_events.bin'
+    file_loc.write_bytes(b'<Event(9-Hit Attempt')
+    with pytest.raises(ValueError):
+        event_log.load_events(str(file_loc))
+
+
+def test_load_events_v1(tmp_path):
+    file_loc = tmp_path / 'events_v1.bin'
+    header = np.array([(b'WAMEVT01', 0, 0)], dtype=event_log.HEADER_DTYPE)
+    events = np.zeros(2, dtype=event_log.EVENT_DTYPE_V1)
+    events['code'] = 9
+    file_loc.write_bytes(header.tobytes() + events.tobytes())
+    _, loaded = event_log.load_events(str(file_loc))
+    assert loaded.dtype == event_log.EVENT_DTYPE_V1
+    assert loaded['code'].tolist() == [9, 9]
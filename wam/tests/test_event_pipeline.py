@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+test_event_pipeline module
+============
+
+This module contains the pytest functions for the Event_Pipeline class from
+the event_pipeline module for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import os
+import pygame
+from .. import event_pipeline
+
+
+def motion(t_ns, pos):
+    event = pygame.event.Event(pygame.MOUSEMOTION, pos=pos)
+    event.t_ns = t_ns
+    return event
+
+
+def test_filter_coalesces_motion():
+    pipeline = event_pipeline.Event_Pipeline(sample_hz=100)
+    click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(1, 1))
+    events = [motion(0, (0, 0)), motion(4_000_000, (1, 2)), click,
+              motion(10_000_000, (5, 5)), motion(25_000_000, (9, 9))]
+    assert pipeline.filter(events) == [click]
+    samples, n_motion = pipeline.take_trajectory()
+    assert n_motion == 4
+    assert samples.tolist() == [[0, 1, 2], [10_000_000, 5, 5],
+                                [25_000_000, 9, 9]]
+    assert pipeline.take_trajectory()[0].shape == (0, 3)
+
+
+def test_buffer_grows():
+    pipeline = event_pipeline.Event_Pipeline(sample_hz=1000, capacity=2)
+    pipeline.filter([motion(i * 10**6, (i, i)) for i in range(5)])
+    samples, _ = pipeline.take_trajectory()
+    assert samples[:, 1].tolist() == [0, 1, 2, 3, 4]
+
+
+def test_motion_blocked():
+    pipeline = event_pipeline.Event_Pipeline(sample_hz=0)
+    assert pygame.MOUSEMOTION not in pipeline.allowed
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    pipeline.install()
+    assert pygame.event.get_blocked(pygame.MOUSEMOTION)
+    assert not pygame.event.get_blocked(pygame.MOUSEBUTTONDOWN)
+    pygame.event.set_allowed(None)
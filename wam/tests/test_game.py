@@ -21,10 +21,90 @@ Related projects:
 
 import numpy as np
 
+from .. import agent
+from .. import event_log
 from .. import game
+from .. import logger
 
-#test_drifter = game.GameManager()
-#
-#
-#def test_init():
-#    assert True
\ No newline at end of file
+test_game = game.GameManager(headless=True, wam_logger=logger.SimLogger())
+
+
+def test_headless_init():
+    assert test_game.screen is None
+    assert test_game.mole == []
+    assert test_game.intro_complete is True
+    assert test_game.game_over is False
+    assert len(test_game.hole_positions_centre) == 9
+
+
+def test_headless_pause():
+    test_game.pause_reason = '2x2'
+    test_game.pause()
+    assert test_game.pause_reason is False
+    assert test_game.game_over is False
+
+
+def test_headless_pool_strike():
+    pool_game = game.GameManager(headless=True,
+                                 wam_logger=logger.SimLogger())
+    pool_game.mole_pool = game.Mole_Pool(9, capacity=3)
+    pool_game.pop_pool_moles()
+    assert pool_game.mole_pool.n_active == 3
+    pool_game.animate_pool(0.6)
+    pool_game.animate_pool(0.2)
+    hole = int(pool_game.mole_pool.hole[1])
+    event = game.pygame.event.Event(game.pygame.MOUSEBUTTONDOWN, button=1,
+                                    pos=pool_game.hole_positions_centre[hole])
+    pool_game.check_pool_mouse_event(event)
+    assert pool_game.wam_logger.hits[-1][1] == 0.0
+    assert pool_game.mole_pool.ani_num[1] == 3
+    assert pool_game.wam_logger.mole_ups == 3
+
+
+def test_hit_logs_skill_flag(tmp_path):
+    wam_logger = logger.WamLogger(usr_timestamp='test_skill_flag',
+                                  log_file_root=str(tmp_path) + '/',
+                                  event_sink=True)
+    skill_game = game.GameManager(headless=True, wam_logger=wam_logger)
+    skill_game.skill_luck_rat = 0.5
+    for hole in range(6):
+        event = game.pygame.event.Event(
+                    game.pygame.MOUSEBUTTONDOWN, button=1,
+                    pos=skill_game.hole_positions_centre[hole])
+        skill_game.check_mouse_event(event, 3, 0, False, 0, hole)
+    wam_logger.log_end()
+    _, events = event_log.load_events(str(tmp_path /
+                                          'WAM_Events_test_skill_flag.bin'))
+    scores = events[events['code'] == event_log.EVENT_CODES['score']]
+    assert len(scores) == 6
+    assert set(scores['skill'].tolist()) <= {0, 1}
+    assert (scores['true_score'] >= 1).all()
+
+
+def test_agent_strikes_injected():
+    agent_game = game.GameManager(headless=True,
+                                  wam_logger=logger.SimLogger(),
+                                  agent=agent.Agent(reaction_time=0.5))
+    now_ns = [0]
+    agent_game.time_ns = lambda: now_ns[0]
+    _, _, _, hole = agent_game.pop_mole(-1, False, 0.1, 0)
+    assert agent_game.agent_strikes == [
+        (5 * 10**8, agent_game.hole_positions_centre[hole])]
+    now_ns[0] = 4 * 10**8
+    assert agent_game._agent_events() == []
+    now_ns[0] = 6 * 10**8
+    event = agent_game._agent_events()[0]
+    assert event.pos == agent_game.hole_positions_centre[hole]
+    assert event.t_ns == 6 * 10**8 and agent_game.agent_strikes == []
+    agent_game.check_mouse_event(event, 3, 0, False, 0, hole)
+    assert agent_game.wam_logger.hits[-1][1] == 0.0
+    assert agent_game.wam_logger.timings[-1]['rt_ms'] == 600.0
+
+
+def test_agent_pool_strikes():
+    pool_game = game.GameManager(headless=True,
+                                 wam_logger=logger.SimLogger(),
+                                 agent=agent.Agent())
+    pool_game.mole_pool = game.Mole_Pool(9, capacity=3)
+    pool_game.pop_pool_moles()
+    assert len(pool_game.agent_strikes) == 3
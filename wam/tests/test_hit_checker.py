@@ -57,6 +57,27 @@ def test_check_mole_hit_margin_hit():
 
 
 def test_check_mole_hit_binom_miss():
-    test_hit_checker.hit_type = 'Binomial'
+    binom_checker = hit_checker.Hit_Checker(10, 'Binomial', luck_mean=0,
+                                            luck_sd=0.05, luck_low_bnd=-0.1,
+                                            luck_high_bnd=0.1, diff_fact=1,
+                                            rng=np.random.default_rng(1))
+    assert binom_checker.check_mole_hit(2, 0, 10, 10) == [True, True, False]
+
+
+def test_check_mole_hits_standard():
+    batch_checker = hit_checker.Hit_Checker(10, 'Standard')
+    true_hits, margin_hits, binom_hits = batch_checker.check_mole_hits(
+                                             np.array([25, 10, 12]), 10)
+    assert true_hits.tolist() == [False, True, False]
+    assert margin_hits.tolist() == [False, True, True]
+    assert binom_hits.tolist() == [False, True, True]
+
+
+def test_check_mole_hits_binom():
+    batch_checker = hit_checker.Hit_Checker(10, 'Binomial')
     np.random.seed(1)
-    assert test_hit_checker.check_mole_hit(2, 0, 10, 10) == [True, True, False]
+    distances = np.full(10000, 10.0)
+    true_hits, margin_hits, binom_hits = batch_checker.check_mole_hits(
+                                             distances, np.full(10000, 10))
+    assert true_hits.all() and margin_hits.all()
+    assert abs(binom_hits.mean() - 2 / 3) < 0.02
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+test_hole_index module
+============
+
+This module contains the pytest functions for the Hole_Index class from the
+hole_index module for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import numpy as np
+from .. import hole_index
+
+test_centres = [(100.0, 100.0), (300.0, 100.0), (100.0, 250.0),
+                (300.0, 250.0), (200.0, 175.0)]
+test_index = hole_index.Hole_Index(test_centres, cell_size=16)
+
+
+def test_locate():
+    hole, distance, relative_loc = test_index.locate((303, 96))
+    assert hole == 1
+    assert distance == 5.0
+    assert relative_loc == (3.0, -4.0)
+
+
+def test_locate_off_grid():
+    hole, distance, _ = test_index.locate((-500, 1000))
+    assert hole == 2
+    assert np.isclose(distance, np.hypot(600, 750))
+
+
+def test_locate_matches_brute_force():
+    points = np.random.RandomState(0).uniform(0, 400, size=(500, 2))
+    holes, distances, relative_locs = test_index.locate_many(points)
+    brute = np.hypot(*(points[:, np.newaxis, :] -
+                       np.array(test_centres)[np.newaxis, :, :]).T).T
+    assert np.array_equal(holes, brute.argmin(axis=1))
+    for point, hole, distance in zip(points, holes, distances):
+        assert test_index.locate(point)[:2] == (hole, distance)
+    assert np.allclose(relative_locs, points - test_index.centres[holes])
+
+
+def test_offset():
+    distance, relative_loc = test_index.offset((103, 104), 0)
+    assert distance == 5.0
+    assert relative_loc == (3.0, 4.0)
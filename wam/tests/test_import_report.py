@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+test_import_report module
+============
+
+This module contains the pytest functions for the import_report module for
+the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+from .. import import_report
+
+IMPORTTIME = '''import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   scipy._lib
+import time:      5000 |       5120 | scipy.stats
+import time:        80 |       5200 | wam.distributions
+'''
+
+
+def test_parse_importtime():
+    imports = import_report.parse_importtime(IMPORTTIME)
+    assert imports[0] == ('scipy._lib', 120, 120)
+    assert imports[-1] == ('wam.distributions', 80, 5200)
+    assert import_report.heavy_imports(imports) == ['scipy']
+
+
+def test_distributions_import_is_light():
+    imports, error = import_report.import_times('wam.distributions')
+    assert error is None
+    assert import_report.heavy_imports(imports) == []
+
+
+def test_check_fails_on_import_error(capsys):
+    text, found, error = import_report.report('wam.no_such_module')
+    assert found == [] and 'ModuleNotFoundError' in error
+    assert 'import failed' in text
+    assert import_report.main(['wam.no_such_module', '--check']) == 1
+    assert import_report.main(['wam.distributions', '--check']) == 0
+    assert 'wam.no_such_module' in capsys.readouterr().out
@@ -20,14 +20,18 @@ Related projects:
 @author: miketaylor
 """
 
+import atexit
 import logging
+import threading
 from time import time
 import pygame
 import csv
 from pathlib import Path
 import os
+import numpy as np
 
 from .. import logger
+from .. import event_log
 
 test_logger = logger.WamLogger(usr_timestamp='test',
                                log_file_root='tests\\')
@@ -130,3 +134,101 @@ def test_log_shutdown():
     except:
         test = False
     assert test
+
+
+def test_async_log_drained_on_end(tmp_path):
+    async_logger = logger.WamLogger(usr_timestamp='test_async',
+                                    log_file_root=str(tmp_path) + '/',
+                                    async_log=True)
+    for i in range(1000):
+        async_logger.log_pygame_event('<test_event_' + str(i) + '>')
+    async_logger.log_pause('test')
+    async_logger.log_end()
+    text_lines = open(tmp_path / 'WAM_Events_test_async.log').readlines()
+    assert len(text_lines) == 1002
+    assert text_lines[0].endswith('<test_event_0>\n')
+    assert text_lines[-2].endswith("8-Pause {'reason': test })>\n")
+    assert async_logger.listener is None
+
+
+def test_event_sink_records(tmp_path):
+    sink_logger = logger.WamLogger(usr_timestamp='test_sink',
+                                   log_file_root=str(tmp_path) + '/',
+                                   event_sink=True)
+    sink_logger.log_mole_event((95, 43))
+    sink_logger.log_hit_result([True, True, False], (95, 43), 12.5,
+                               (5.0, -11.4))
+    sink_logger.log_score(4, 10, '1', 4)
+    sink_logger.log_2x2_rate((5, 5), (0, 0), 10)
+    sink_logger.log_end()
+    header, events = event_log.load_events(str(tmp_path /
+                                               'WAM_Events_test_sink.bin'))
+    assert events['code'].tolist() == [10, 9, 11, 7]
+    assert events[1]['distance'] == 12.5
+    assert events[1]['hit'] == 0 and events[1]['true_hit'] == 1
+    assert events[2]['skill'] == 1 and events[2]['score'] == 10
+    assert events[3]['rate_x'] == 0.5
+
+
+def test_hit_result_timing(tmp_path):
+    timing_logger = logger.WamLogger(usr_timestamp='test_timing',
+                                     log_file_root=str(tmp_path) + '/',
+                                     event_sink=True)
+    timing_logger.log_hit_result([True, True, True], (95, 43), 3.0,
+                                 (3.0, 0.0), {'rt_ms': 512.25,
+                                              'emerged_rt_ms': None,
+                                              'latency_ms': 0.5})
+    timing_logger.log_end()
+    text = open(tmp_path / 'WAM_Events_test_timing.log').readlines()[-2]
+    assert text.endswith("'window': None, 'rt_ms': 512.25, " +
+                         "'emerged_rt_ms': None, 'latency_ms': 0.5})>\n")
+    _, events = event_log.load_events(str(tmp_path /
+                                          'WAM_Events_test_timing.bin'))
+    assert events[0]['rt_ms'] == 512.25
+    assert np.isnan(events[0]['emerged_rt_ms'])
+    assert events[0]['latency_ms'] == 0.5
+
+
+def test_log_trajectory(tmp_path):
+    trajectory_logger = logger.WamLogger(usr_timestamp='test_trajectory',
+                                         log_file_root=str(tmp_path) + '/',
+                                         event_sink=False)
+    samples = np.array([[1e6, 0, 0], [21e6, 3, 4], [41e6, 3, 10]])
+    trajectory_logger.log_trajectory(samples, 7, origin_ns=0)
+    trajectory_logger.log_end()
+    text = open(tmp_path /
+                'WAM_Events_test_trajectory.log').readlines()[-2]
+    assert text.endswith("14-Trajectory {'n_motion': 7, 'n': 3, " +
+                         "'duration_ms': 40, 'path_px': 11.0, " +
+                         "'points': [(1, 0, 0), (21, 3, 4), (41, 3, 10)]})>\n")
+
+
+def test_async_log_drops_when_full(tmp_path, monkeypatch):
+    exit_hooks = []
+    monkeypatch.setattr(atexit, 'register', exit_hooks.append)
+    monkeypatch.setattr(atexit, 'unregister', exit_hooks.remove)
+    async_logger = logger.WamLogger(usr_timestamp='test_full',
+                                    log_file_root=str(tmp_path) + '/',
+                                    async_log=True, queue_size=5)
+    assert exit_hooks == [async_logger.stop_listener]
+    writing = threading.Event()
+    emit = async_logger.fh.emit
+
+    def stalled_emit(record):  # a disk stall
+        writing.wait()
+        emit(record)
+
+    async_logger.fh.emit = stalled_emit
+    start = time()
+    for i in range(100):
+        async_logger.log_pygame_event('<test_event_' + str(i) + '>')
+    assert time() - start < 1.0
+    writing.set()
+    async_logger.log_end()
+    assert async_logger.dropped >= 94
+    assert exit_hooks == []
+    text_lines = open(tmp_path / 'WAM_Events_test_full.log').readlines()
+    assert len(text_lines) == 100 - async_logger.dropped + 2
+    assert text_lines[-2].endswith('Log queue full, ' +
+                                   str(async_logger.dropped) +
+                                   ' records dropped\n')
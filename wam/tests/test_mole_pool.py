@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+test_mole_pool module
+============
+
+This module contains the pytest functions for the Mole_Pool class from the
+mole_pool module for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import numpy as np
+from .. import mole_pool
+
+
+def run_frames(pool, steps, secs=0.033):
+    row_frames = {}
+    for _ in range(steps):
+        shown, frames, _, retired = pool.step(secs)
+        for row, frame in zip(shown.tolist(), frames.tolist()):
+            row_frames.setdefault(row, []).append(frame)
+    return row_frames
+
+
+def test_spawn():
+    pool = mole_pool.Mole_Pool(9, capacity=3)
+    assert pool.spawn([4, 4, 2]).tolist() == [0, 1]
+    assert pool.spawn(2).tolist() == []
+    assert pool.n_active == 2
+    assert 4 not in pool.free_holes()
+    assert pool.spawn([5, 6]).tolist() == [2]
+    assert pool.n_active == 3
+
+
+def test_pop_drop_sequence():
+    pool = mole_pool.Mole_Pool(9, capacity=2)
+    pool.spawn([1, 7])
+    assert run_frames(pool, 40) == {0: [0, 1, 2, 2, 1, 0],
+                                    1: [0, 1, 2, 2, 1, 0]}
+    assert pool.n_active == 0
+    assert pool.free_holes().tolist() == list(range(9))
+
+
+def test_whack_sequence():
+    pool = mole_pool.Mole_Pool(9, capacity=2)
+    pool.spawn([1, 7])
+    assert run_frames(pool, 20) == {0: [0, 1], 1: [0, 1]}
+    pool.whack(0)
+    assert run_frames(pool, 1) == {0: [3]}
+    assert pool.left[0] == 14
+    assert run_frames(pool, 20) == {0: [4, 5], 1: [2, 2, 1, 0]}
+    assert pool.n_active == 0
+
+
+def test_vectorised_timers():
+    pool = mole_pool.Mole_Pool(9, capacity=2)
+    pool.spawn(1)
+    pool.step(0.3)
+    pool.spawn(2)
+    shown, frames, popped, retired = pool.step(0.3)
+    assert shown.tolist() == [0]
+    assert np.allclose(pool.timer, [0.1, 0.3])
+
+
+def test_long_step_matches_short_steps():
+    short_pool = mole_pool.Mole_Pool(9, capacity=2)
+    short_pool.spawn(1)
+    short_frames = run_frames(short_pool, 5)
+    short_pool.spawn(7)
+    for row, frames in run_frames(short_pool, 40).items():
+        short_frames.setdefault(row, []).extend(frames)
+
+    long_pool = mole_pool.Mole_Pool(9, capacity=2)
+    long_pool.spawn(1)
+    long_pool.step(0.165)
+    long_pool.spawn(7)
+    shown, frames, popped, retired = long_pool.step(1.32)
+    long_frames = {}
+    for row, frame in zip(shown.tolist(), frames.tolist()):
+        long_frames.setdefault(row, []).append(frame)
+    assert long_frames == short_frames == {0: [0, 1, 2, 2, 1, 0],
+                                           1: [0, 1, 2, 2, 1, 0]}
+    assert popped.tolist() == [0, 1]
+    assert retired.tolist() == [0, 1]
+    assert long_pool.n_active == short_pool.n_active == 0
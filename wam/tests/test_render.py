@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+test_render module
+============
+
+This module contains the pytest functions for the Dirty_Rect_Renderer class
+from the render module for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import os
+import pygame
+from .. import render
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+pygame.display.init()
+test_screen = pygame.display.set_mode((200, 100))
+test_background = pygame.Surface((200, 100))
+test_background.fill((0, 255, 0))
+test_sprite = pygame.Surface((10, 10))
+test_sprite.fill((255, 0, 0))
+
+
+def test_blit_marks_region():
+    renderer = render.Dirty_Rect_Renderer(test_screen, test_background)
+    rect = renderer.blit(test_sprite, (20, 30))
+    assert rect == pygame.Rect(20, 30, 10, 10)
+    assert renderer.update() == [rect]
+    assert renderer.update() == []
+
+
+def test_restore_background():
+    renderer = render.Dirty_Rect_Renderer(test_screen, test_background)
+    rect = renderer.blit(test_sprite, (20, 30))
+    renderer.update()
+    renderer.restore(rect)
+    assert test_screen.get_at((25, 35))[:3] == (0, 255, 0)
+    assert renderer.update() == [rect]
+
+
+def test_full_update():
+    renderer = render.Dirty_Rect_Renderer(test_screen, test_background)
+    renderer.blit(test_sprite, (20, 30))
+    renderer.draw_background()
+    renderer.blit(test_sprite, (50, 30))
+    assert renderer.dirty == []
+    assert renderer.update() is None
+    assert renderer.full_update is False
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+test_scheduler module
+============
+
+This module contains the pytest functions for the Fixed_Step_Scheduler class
+from the scheduler module for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+from .. import scheduler
+
+
+class Fake_Clock:
+    def __init__(self):
+        self.now_ns = 0
+
+    def __call__(self):
+        return self.now_ns
+
+
+def make_scheduler(**kwargs):
+    clock = Fake_Clock()
+    return scheduler.Fixed_Step_Scheduler(time_ns=clock, **kwargs), clock
+
+
+def test_steps_carry_remainder():
+    test_scheduler, clock = make_scheduler(fps=60, step_hz=1000)
+    steps = []
+    for _ in range(3):
+        clock.now_ns += 16_666_667
+        steps.append(test_scheduler.advance())
+    assert steps == [16, 17, 17]
+    assert test_scheduler.overruns == 0
+
+
+def test_overrun_caught_up():
+    test_scheduler, clock = make_scheduler(fps=60, step_hz=1000)
+    clock.now_ns += 100_000_000
+    assert test_scheduler.advance() == 100
+    stats = test_scheduler.stats()
+    assert stats['overruns'] == 1
+    assert stats['max_frame_ms'] == 100.0
+    assert round(stats['overrun_ms'], 3) == 83.333
+
+
+def test_catch_up_capped():
+    test_scheduler, clock = make_scheduler(max_catch_up=0.25)
+    clock.now_ns += 2 * 10**9
+    assert test_scheduler.advance() == 250
+    assert test_scheduler.stats()['dropped_ms'] == 1750.0
+
+
+def test_start_discards_time():
+    test_scheduler, clock = make_scheduler()
+    clock.now_ns += 5_500_000
+    test_scheduler.advance()
+    clock.now_ns += 10**9
+    test_scheduler.start()
+    clock.now_ns += 1_000_000
+    assert test_scheduler.advance() == 1
+    assert test_scheduler.interval_steps(0.25) == 250
@@ -69,4 +69,23 @@ def test_get_score_adj_luck_norm():
     test_scorer.adjust = True
     test_scorer.rand_type='normal'
     np.random.seed(1)
-    assert test_scorer.get_score(10, 10) == 4.79
\ No newline at end of file
+    assert test_scorer.get_score(10, 10) == 4.79
+
+
+def test_get_scores_skill():
+    batch_scorer = scorer.Scorer(10, max_score=10)
+    scores, skill_status, true_scores = batch_scorer.get_scores(
+                                            np.array([0, 10, 15]), 10, 1.0)
+    assert skill_status.tolist() == [1, 1, 1]
+    assert true_scores.tolist() == [10.0, 6.0, 3.0]
+    assert scores.tolist() == [10.0, 6.0, 3.0]
+
+
+def test_get_scores_luck():
+    batch_scorer = scorer.Scorer(10, max_score=10)
+    np.random.seed(1)
+    scores, skill_status, true_scores = batch_scorer.get_scores(
+                                            np.full(1000, 10.0), 10, 0.0)
+    assert (skill_status == 0).all()
+    assert (abs(scores - true_scores) <= 2).all()
+    assert scores.min() >= 1 and scores.max() <= 10
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+test_simulator module
+============
+
+This module contains the pytest functions for the Virtual_Clock and
+Simulator classes from the simulator module for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import pytest
+from .. import condition_set
+from .. import distributions
+from .. import logger
+from .. import simulator
+
+
+def test_virtual_clock_tick():
+    clock = simulator.Virtual_Clock()
+    assert clock.tick(50) == 20.0
+    assert clock.tick(50, frames=4) == 80.0
+    assert round(clock.time, 4) == 0.1
+
+
+def test_run_session_completes():
+    summary = simulator.Simulator(max_time=1000, seed=1).run_session()
+    assert summary['completed'] is True
+    assert summary['strikes'] == summary['moles']
+    assert summary['hits'] <= summary['strikes']
+    assert 0 < summary['hit_rate'] <= 1
+
+
+def test_run_session_perfect_aim():
+    clicker = simulator.Reactive_Clicker(reaction_time=0.7, aim_sd=0.0)
+    summary = simulator.Simulator(clicker=clicker).run_session()
+    assert summary['hit_rate'] == 1.0
+
+
+def test_run_session_replay():
+    summaries = simulator.Simulator(seed=7).run_sessions(2)
+    replay = simulator.Simulator(seed=7).run_sessions(2)
+    assert summaries == replay
+    assert summaries[0] != summaries[1]
+
+
+def test_run_session_replay_from_seed_dict():
+    session_rng = distributions.Session_RNG(3).spawn(1)[0]
+    replay_rng = distributions.Session_RNG(**session_rng.seed_dict)
+    sim = simulator.Simulator()
+    assert sim.run_session(session_rng) == sim.run_session(replay_rng)
+
+
+def test_run_session_reaction_times():
+    clicker = simulator.Reactive_Clicker(reaction_time=0.7, aim_sd=0.0)
+    game_sim = simulator.Simulator(clicker=clicker, seed=2)
+    summary = game_sim.run_session()
+    assert 600 < summary['mean_rt_ms'] < 800
+
+
+def test_virtual_clock_ns():
+    clock = simulator.Virtual_Clock()
+    clock.tick(60, frames=3)
+    assert clock.time_ns == 3 * simulator.Virtual_Clock.frame_ns(60)
+
+
+def test_run_session_matches_frame_by_frame(monkeypatch):
+    summary = simulator.Simulator(seed=5).run_session()
+    monkeypatch.setattr(simulator.Simulator, '_frames_to',
+                        lambda self, game, clock, step_ns: 1)
+    assert simulator.Simulator(seed=5).run_session() == summary
+
+
+def test_run_session_pool(tmp_path):
+    master_dict = condition_set.load_condition_set('config/Default.json')
+    master_dict['main_game']['n_moles'] = 3
+    file_loc = str(tmp_path / 'pool.json')
+    condition_set.save_condition_set(master_dict, file_loc)
+    summary = simulator.Simulator(file_loc, max_time=1000,
+                                  seed=1).run_session()
+    assert summary['completed'] is True
+    assert summary['moles'] >= summary['strikes'] > 0
+    assert 0 < summary['hit_rate'] <= 1
+
+
+def test_run_session_needs_sim_logger(monkeypatch, tmp_path):
+    sim = simulator.Simulator()
+    new_game = sim.new_game
+
+    def logging_game(session_rng):
+        game = new_game(session_rng)
+        game.wam_logger = logger.WamLogger(usr_timestamp='sim_test',
+                                           log_file_root=str(tmp_path) + '/')
+        return game
+
+    monkeypatch.setattr(sim, 'new_game', logging_game)
+    with pytest.raises(TypeError):
+        sim.run_session()
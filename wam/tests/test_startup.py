@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+test_startup module
+============
+
+This module contains the pytest functions for the Startup_Profiler and
+Warm_Start_Bundle classes from the startup module for the pygame Whack a Mole
+game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import os
+from .. import startup
+
+
+def test_profiler_laps():
+    profiler = startup.Startup_Profiler()
+    profiler.lap('first')
+    with profiler.phase('second'):
+        pass
+    profiler.lap('first')
+    assert list(profiler.phases) == ['first', 'second']
+    summary = profiler.summary()
+    assert set(summary) == {'first_ms', 'second_ms', 'total_ms'}
+    assert summary['total_ms'] >= summary['first_ms']
+    assert profiler.report().split('\n')[-1].startswith('total')
+
+
+def test_profiler_trace_alloc():
+    profiler = startup.Startup_Profiler(trace_alloc=True)
+    data = [0] * 100000
+    profiler.lap('alloc')
+    profiler.stop()
+    assert profiler.phases['alloc']['alloc_kb'] > 500
+    assert len(data) == 100000
+
+
+def test_bundle_fetch(tmp_path):
+    source = tmp_path / 'source.txt'
+    source.write_text('a')
+    bundle_loc = str(tmp_path / 'warm.bundle')
+    bundle = startup.Warm_Start_Bundle(bundle_loc)
+    assert bundle.fetch('entry', [str(source)], lambda: 'built') == 'built'
+    bundle.save()
+    bundle = startup.Warm_Start_Bundle(bundle_loc)
+    assert bundle.fetch('entry', [str(source)], lambda: 'rebuilt') == 'built'
+    assert (bundle.hits, bundle.misses) == (1, 0)
+    source.write_text('ab')
+    assert bundle.get('entry', [str(source)]) is None
+    assert bundle.fetch('entry', [str(source)], lambda: 'rebuilt') == \
+        'rebuilt'
+
+
+def test_bundle_unreadable(tmp_path):
+    bundle_loc = tmp_path / 'warm.bundle'
+    bundle_loc.write_bytes(b'not a bundle')
+    bundle = startup.Warm_Start_Bundle(str(bundle_loc))
+    assert bundle.entries == {}
+    bundle.put('entry', 1)
+    bundle.save()
+    assert startup.Warm_Start_Bundle(str(bundle_loc)).get('entry') == 1
+    assert not os.path.exists(str(bundle_loc) + '.tmp')
+
+
+def test_bundle_code_version(tmp_path):
+    code = tmp_path / 'code.py'
+    code.write_text('a')
+    bundle_loc = str(tmp_path / 'warm.bundle')
+    bundle = startup.Warm_Start_Bundle(bundle_loc, code_sources=[str(code)])
+    bundle.put('entry', 1)
+    bundle.save()
+    assert startup.Warm_Start_Bundle(bundle_loc, code_sources=[
+        str(code)]).get('entry') == 1
+    startup.BUNDLE_VERSION += 1
+    try:
+        assert startup.Warm_Start_Bundle(bundle_loc, code_sources=[
+            str(code)]).entries == {}
+    finally:
+        startup.BUNDLE_VERSION -= 1
+    code.write_text('ab')
+    assert startup.Warm_Start_Bundle(bundle_loc, code_sources=[
+        str(code)]).entries == {}
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+test_sweep module
+============
+
+This module contains the pytest functions for the sweep module for the
+pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import csv
+import pytest
+from .. import condition_set
+from .. import sweep
+
+base_dict = condition_set.load_condition_set('config/Default.json')
+
+
+def test_resolve_setting():
+    assert sweep.resolve_setting('diff_fact') == ('hit_checker', 'diff_fact')
+    assert sweep.resolve_setting('scorer.rand_sd') == ('scorer', 'rand_sd')
+    with pytest.raises(KeyError):
+        sweep.resolve_setting('not_a_setting')
+
+
+def test_expand_grid():
+    conditions = sweep.expand_grid(base_dict, {'MOLE_RADIUS': [20, 40],
+                                               'drift_type': ['static',
+                                                              'sin']})
+    assert len(conditions) == 4
+    params, master_dict = conditions[3]
+    assert params == {'MOLE_RADIUS': 40, 'drift_type': 'sin'}
+    assert master_dict['main_game']['MOLE_RADIUS'] == 40
+    assert master_dict['margin_drifter']['drift_type'] == 'sin'
+    assert base_dict['main_game']['MOLE_RADIUS'] == 35
+    with pytest.raises(sweep.Condition_Set_Error):
+        sweep.expand_grid(base_dict, {'skill_luck_rat': [0.5, 2.0]})
+
+
+def test_run_sweep(tmp_path):
+    rows = sweep.run_sweep({'MOLE_RADIUS': [10, 60]}, n_sessions=2,
+                           out_dir=str(tmp_path), seed=1, max_workers=2)
+    assert [row['MOLE_RADIUS'] for row in rows] == [10, 60]
+    assert rows[0]['hit_rate'] < rows[1]['hit_rate']
+    assert rows[0]['sessions'] == 2
+    table = list(csv.DictReader(open(str(tmp_path / 'summary.csv'))))
+    assert len(table) == 2
+    assert condition_set.load_condition_set(table[1]['file_loc'])[
+        'main_game']['MOLE_RADIUS'] == 60
+
+
+def test_run_sweep_drift_types(tmp_path):
+    rows = sweep.run_sweep({'drift_type': ['static', 'sin', 'linear+sin']},
+                           n_sessions=1, out_dir=str(tmp_path), seed=1,
+                           max_workers=1)
+    assert [row['drift_type'] for row in rows] == ['static', 'sin',
+                                                   'linear+sin']
+    assert all(row['strikes'] > 0 for row in rows)
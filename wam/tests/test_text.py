@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+test_text module
+============
+
+This module contains the pytest functions for the Text_Renderer class from
+the text module for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+from .. import text
+
+test_renderer = text.Text_Renderer(sizes=(22,), max_surfaces=2)
+
+
+def test_fonts_preloaded():
+    assert list(test_renderer.fonts) == [(None, 22)]
+    assert test_renderer.get_font(22) is test_renderer.fonts[(None, 22)]
+
+
+def test_render_cached():
+    surface = test_renderer.render('SCORE: 1', background=(255, 255, 255))
+    assert test_renderer.render('SCORE: 1',
+                                background=(255, 255, 255)) is surface
+    assert test_renderer.render('SCORE: 1') is not surface
+
+
+def test_render_lru_eviction():
+    test_renderer.render('a')
+    test_renderer.render('b')
+    test_renderer.render('a')
+    test_renderer.render('c')
+    keys = [key[0] for key in test_renderer.surfaces]
+    assert keys == ['a', 'c']
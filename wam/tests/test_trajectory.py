@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+test_trajectory module
+============
+
+This module contains the pytest functions for the Trajectory_Recorder class
+and the loaders from the trajectory module for the pygame Whack a Mole game
+
+Attributes:
+    handled within the functions
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: miketaylor
+"""
+
+import numpy as np
+import pytest
+from .. import trajectory
+
+
+def test_record_epochs(tmp_path):
+    file_loc = str(tmp_path / 'traj.bin')
+    recorder = trajectory.Trajectory_Recorder(file_loc)
+    recorder.record(0, (1, 1))
+    recorder.start(0, 3, 10**9)
+    for i in range(4):
+        recorder.record(10**9 + i * 10**7, (10 * i, 0))
+    recorder.start(1, 5, 2 * 10**9)
+    recorder.close()
+    epochs = trajectory.load_trajectories(file_loc)
+    assert sorted(epochs) == [0, 1]
+    block, samples = epochs[0]
+    assert block['hole'] == 3 and block['n'] == 4 and block['dropped'] == 0
+    assert list(samples['t_ms']) == [0.0, 10.0, 20.0, 30.0]
+    assert list(samples['x']) == [0, 10, 20, 30]
+    assert epochs[1][0]['n'] == 0
+
+
+def test_ring_buffer_overflow(tmp_path):
+    file_loc = str(tmp_path / 'traj.bin')
+    recorder = trajectory.Trajectory_Recorder(file_loc, capacity=3)
+    recorder.start(0, 0, 0)
+    for i in range(5):
+        recorder.record(i * 10**6, (i, i))
+    recorder.close()
+    block, samples = trajectory.load_trajectories(file_loc)[0]
+    assert block['n'] == 3 and block['dropped'] == 2
+    assert list(samples['x']) == [2, 3, 4]
+
+
+def test_kinematic_features():
+    samples = np.zeros(3, dtype=trajectory.SAMPLE_DTYPE)
+    samples['t_ms'] = [0.0, 10.0, 20.0]
+    samples['x'] = [0, 0, 30]
+    samples['y'] = [0, 0, 40]
+    features = trajectory.kinematic_features(samples)
+    assert features['path_px'] == 50.0
+    assert features['straightness'] == 1.0
+    assert features['onset_ms'] == 20.0
+    assert features['peak_speed'] == 5.0
+
+
+def test_load_rejects_other_files(tmp_path):
+    file_loc = tmp_path / 'other.bin'
+    file_loc.write_bytes(b'not a trajectory')
+    with pytest.raises(ValueError):
+        trajectory.load_trajectories(str(file_loc))
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+text module
+============
+
+This module contains the Text_Renderer class for the pygame Whack a Mole
+game, which caches the font objects (rather than loading the font file on
+every write) and the rendered text surfaces for repeated strings
+
+Attributes:
+    handled within the Text_Renderer class
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+from collections import OrderedDict
+import pygame
+
+
+class Text_Renderer:
+    """
+    Renders text via cached fonts, keeping the most recently rendered text
+    surfaces in a least recently used (LRU) cache
+
+    Attributes
+    ----------
+    face: string/None
+        the font file location, or system font name if sys_font (None for
+        the pygame default font)
+    sys_font: Bool
+        whether the face is a system font
+    max_surfaces: int
+        the maximum number of rendered text surfaces to keep
+    fonts: dict
+        the font objects, keyed by (face, size)
+    surfaces: OrderedDict
+        the rendered text surfaces, keyed by (string, colour, background,
+        size), in least to most recently used order
+
+    Methods
+    -------
+    get_font(size)
+        gets the font for the size, loading it on first use
+    render(string, colour, background, size)
+        gets the rendered text surface, rendering it on first use
+    """
+    def __init__(self, face=None, sys_font=False, sizes=(),
+                 max_surfaces=64):
+        self.face = face
+        self.sys_font = sys_font
+        self.max_surfaces = max_surfaces
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        if not pygame.font.get_init():
+            pygame.font.init()
+        for size in sizes:
+            self.get_font(size)
+
+    def get_font(self, size):
+        '''
+        Gets the font for the size, loading it on first use
+
+        Parameters
+        ----------
+        size: int
+            the font size
+
+        Returns
+        -------
+        font_obj: pygame.font.Font
+            the font
+        '''
+        key = (self.face, size)
+        font_obj = self.fonts.get(key)
+        if font_obj is None:
+            if self.sys_font:
+                font_obj = pygame.font.SysFont(self.face, size)
+            else:
+                font_obj = pygame.font.Font(self.face, size)
+            self.fonts[key] = font_obj
+        return font_obj
+
+    def render(self, string, colour=(0, 0, 0), background=None, size=22):
+        '''
+        Gets the rendered (antialiased) text surface, rendering it on first
+        use and evicting the least recently used surface when full
+
+        Parameters
+        ----------
+        string: string
+            the text
+        colour: tuple
+            the RGB text colour
+        background: tuple/None
+            the RGB background colour (None for transparent)
+        size: int
+            the font size
+
+        Returns
+        -------
+        text: pygame.Surface
+            the rendered text
+        '''
+        key = (string, tuple(colour),
+               None if background is None else tuple(background), size)
+        text = self.surfaces.get(key)
+        if text is None:
+            text = self.get_font(size).render(string, True, colour,
+                                              background)
+            self.surfaces[key] = text
+            if len(self.surfaces) > self.max_surfaces:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return text
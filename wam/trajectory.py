@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+trajectory module
+============
+
+This module contains the Trajectory_Recorder class for the pygame Whack a
+Mole game, which records the full resolution cursor path of each mole epoch
+(from the mole up to the next mole up, so including the strike) into a
+preallocated ring buffer and writes each epoch as a single binary block
+keyed by the mole index
+
+File layout: TRAJ_MAGIC, then per mole epoch a BLOCK_DTYPE header followed
+by its n SAMPLE_DTYPE samples (in time order), which load_trajectories
+memory maps (so only the epochs analysed are read) and kinematic_features
+summarises per epoch
+
+Attributes:
+    TRAJ_MAGIC: bytes
+        the file magic
+    BLOCK_DTYPE: np.dtype
+        the mole epoch header (mole index, hole, mole up time, the number of
+        samples and the number dropped by the ring buffer)
+    SAMPLE_DTYPE: np.dtype
+        the sample (ms since the mole up, x, y)
+
+Todo:
+    * na
+
+Related projects:
+    Adapted from initial toy project https://github.com/sonlexqt/whack-a-mole
+    which is under MIT license
+
+@author: DZLR3
+"""
+
+import numpy as np
+
+TRAJ_MAGIC = b'WAMTRJ01'
+
+BLOCK_DTYPE = np.dtype([('mole_index', '<i4'),
+                        ('hole', '<i4'),
+                        ('up_ns', '<i8'),
+                        ('n', '<i4'),
+                        ('dropped', '<i4')])
+
+SAMPLE_DTYPE = np.dtype([('t_ms', '<f8'),
+                         ('x', '<i4'),
+                         ('y', '<i4')])
+
+
+class Trajectory_Recorder:
+    """
+    Ring buffered recorder of the cursor path per mole epoch
+
+    Attributes
+    ----------
+    file_loc: string (file location)
+        the binary trajectory file
+    capacity: int
+        the samples kept per epoch (the oldest are overwritten beyond it)
+    t_ms: np.array
+        the ring buffer of sample times (ms since the mole up)
+    xy: np.array
+        the ring buffer of sample (x, y) positions
+    count: int
+        the samples recorded in the current epoch (including overwritten)
+    block: np.void/None
+        the header of the current epoch (None before the first mole)
+
+    Methods
+    -------
+    start(mole_index, hole, up_ns)
+        writes the current epoch and starts a new one
+    record(t_ns, pos)
+        records a cursor position
+    flush()
+        writes the current epoch (if any)
+    close()
+        writes the current epoch and closes the file
+    """
+    def __init__(self, file_loc, capacity=4096):
+        self.file_loc = file_loc
+        self.capacity = capacity
+        self.t_ms = np.empty(capacity, dtype=np.float64)
+        self.xy = np.empty((capacity, 2), dtype=np.int32)
+        self.count = 0
+        self.block = None
+        self.file = open(file_loc, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(TRAJ_MAGIC)
+
+    def start(self, mole_index, hole, up_ns):
+        '''
+        Writes the current epoch and starts a new one
+
+        Parameters
+        ----------
+        mole_index: int
+            the number of the mole (the order it popped up)
+        hole: int
+            the hole number of the mole
+        up_ns: int
+            the (monotonic ns) time of the mole up
+        '''
+        self.flush()
+        self.block = np.zeros(1, dtype=BLOCK_DTYPE)[0]
+        self.block['mole_index'] = mole_index
+        self.block['hole'] = hole
+        self.block['up_ns'] = up_ns
+        self.count = 0
+
+    def record(self, t_ns, pos):
+        '''
+        Records a cursor position (ignored before the first mole)
+
+        Parameters
+        ----------
+        t_ns: int
+            the (monotonic ns) time of the position
+        pos: tuple
+            the x, y position
+        '''
+        if self.block is None:
+            return
+        i = self.count % self.capacity
+        self.t_ms[i] = (t_ns - int(self.block['up_ns'])) / 10**6
+        self.xy[i] = pos
+        self.count += 1
+
+    def flush(self):
+        '''
+        Writes the current epoch as one block (the samples in time order)
+        '''
+        if self.block is None or self.file.closed:
+            return
+        n = min(self.count, self.capacity)
+        order = np.arange(self.count - n, self.count) % self.capacity
+        samples = np.empty(n, dtype=SAMPLE_DTYPE)
+        samples['t_ms'] = self.t_ms[order]
+        samples['x'] = self.xy[order, 0]
+        samples['y'] = self.xy[order, 1]
+        self.block['n'] = n
+        self.block['dropped'] = self.count - n
+        self.file.write(self.block.tobytes() + samples.tobytes())
+        self.file.flush()
+        self.block = None
+        self.count = 0
+
+    def close(self):
+        '''
+        Writes the current epoch and closes the file
+        '''
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+def load_trajectories(file_loc):
+    '''
+    Memory maps a binary trajectory file, indexing its mole epochs
+
+    Parameters
+    ----------
+    file_loc: string (file location)
+        the binary trajectory file
+
+    Raises
+    ------
+    ValueError
+        if the file is not a binary trajectory file
+
+    Returns
+    -------
+    epochs: dict
+        (block header, samples) keyed by the mole index, the samples being
+        a read only SAMPLE_DTYPE view of the file (a later epoch of the
+        same mole index, e.g. from an appended session, replaces it)
+    '''
+    data = np.memmap(file_loc, dtype=np.uint8, mode='r')
+    if bytes(data[:len(TRAJ_MAGIC)]) != TRAJ_MAGIC:
+        raise ValueError(file_loc + ' is not a WAM binary trajectory file')
+    epochs = {}
+    offset = len(TRAJ_MAGIC)
+    while offset + BLOCK_DTYPE.itemsize <= len(data):
+        block = data[offset:offset + BLOCK_DTYPE.itemsize].view(BLOCK_DTYPE)[0]
+        offset += BLOCK_DTYPE.itemsize
+        end = offset + int(block['n']) * SAMPLE_DTYPE.itemsize
+        if end > len(data):
+            print('Truncated trajectory block in ' + file_loc)
+            break
+        epochs[int(block['mole_index'])] = (block,
+                                            data[offset:end].view(
+                                                SAMPLE_DTYPE))
+        offset = end
+    return epochs
+
+
+def kinematic_features(samples):
+    '''
+    Summarises the kinematics of a mole epoch's cursor path
+
+    Parameters
+    ----------
+    samples: np.array
+        the SAMPLE_DTYPE samples of the epoch
+
+    Returns
+    -------
+    features: dict
+        n (samples), movement_ms (first to last sample), path_px (length),
+        straightness (start to end distance / path length, 1 for a straight
+        path), mean_speed and peak_speed (px/ms) and the (non zero speed)
+        onset_ms of the movement
+    '''
+    features = {'n': len(samples), 'movement_ms': 0.0, 'path_px': 0.0,
+                'straightness': np.nan, 'mean_speed': np.nan,
+                'peak_speed': np.nan, 'onset_ms': np.nan}
+    if len(samples) < 2:
+        return features
+    t_ms = samples['t_ms']
+    xy = np.stack([samples['x'], samples['y']], axis=1).astype(np.float64)
+    steps = np.hypot(*np.diff(xy, axis=0).T)
+    dt = np.diff(t_ms)
+    speeds = steps[dt > 0] / dt[dt > 0]
+    path = steps.sum()
+    features['movement_ms'] = float(t_ms[-1] - t_ms[0])
+    features['path_px'] = float(path)
+    if path > 0:
+        features['straightness'] = float(np.hypot(*(xy[-1] - xy[0])) / path)
+        features['onset_ms'] = float(t_ms[1:][steps > 0][0])
+    if features['movement_ms'] > 0:
+        features['mean_speed'] = path / features['movement_ms']
+    if len(speeds):
+        features['peak_speed'] = float(speeds.max())
+    return features
+
+
+def trajectory_features(file_loc):
+    '''
+    The kinematic features of every mole epoch in a trajectory file
+
+    Parameters
+    ----------
+    file_loc: string (file location)
+        the binary trajectory file
+
+    Returns
+    -------
+    rows: list
+        a dict per epoch (mole_index, hole, dropped and the
+        kinematic_features), ready for pd.DataFrame
+    '''
+    rows = []
+    for mole_index, (block, samples) in sorted(
+            load_trajectories(file_loc).items()):
+        row = {'mole_index': mole_index, 'hole': int(block['hole']),
+               'dropped': int(block['dropped'])}
+        row.update(kinematic_features(samples))
+        rows.append(row)
+    return rows